@@ -0,0 +1,58 @@
+"""
+Time import full_fred.fred in fresh interpreters, as a short-lived CLI job
+or serverless worker pays it on every start, and list the slowest modules.
+
+    python benchmarks/bench_import.py [n_runs]
+
+pandas and NumPy are imported only by the methods that build DataFrames,
+and full_fred.__version__ is computed on first access, so metadata-only
+work never loads them.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def time_import(statement: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True, cwd=REPO_ROOT)
+    return time.perf_counter() - start
+
+
+def slowest_modules(statement: str, n: int = 8) -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = list()
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main(n_runs: int = 5):
+    baseline = min(time_import("pass") for _ in range(n_runs))
+    for statement in (
+        "import full_fred.fred",
+        "import full_fred.fred; import pandas",
+    ):
+        best = min(time_import(statement) for _ in range(n_runs))
+        print(
+            "%-40s %7.1f ms over a bare interpreter"
+            % (statement, (best - baseline) * 1e3)
+        )
+    print("\nslowest modules of import full_fred.fred (cumulative us):")
+    for cumulative, name in slowest_modules("import full_fred.fred"):
+        print("%10d  %s" % (cumulative, name))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
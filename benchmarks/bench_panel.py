@@ -0,0 +1,61 @@
+"""
+Compare assembling a wide date-indexed panel from many typed series by
+repeated pd.merge with get_series_panel's single-allocation alignment.
+
+    python benchmarks/bench_panel.py [n_series] [n_observations]
+
+Series have staggered start dates so the outer join grows as they are added.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from full_fred.observations import wide_panel
+
+
+def make_frames(n_series: int, n_observations: int) -> dict:
+    frames = dict()
+    all_dates = np.arange(
+        np.datetime64("1950-01-01"), np.datetime64("1950-01-01") + 2 * n_observations
+    ).astype("datetime64[s]")
+    for k in range(n_series):
+        start = k * n_observations // n_series
+        dates = all_dates[start : start + n_observations]
+        frames["S%d" % k] = pd.DataFrame(
+            {"date": dates, "value": np.arange(len(dates), dtype=float)}
+        )
+    return frames
+
+
+def repeated_merge(frames: dict) -> pd.DataFrame:
+    panel = None
+    for series_id, df in frames.items():
+        df = df.rename(columns={"value": series_id})
+        panel = df if panel is None else panel.merge(df, on="date", how="outer")
+    return panel.sort_values("date").set_index("date")
+
+
+def best_of(f, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_series: int = 200, n_observations: int = 5_000):
+    frames = make_frames(n_series, n_observations)
+    assert repeated_merge(frames).equals(wide_panel(frames))
+    print("series: %d, observations each: %d" % (n_series, n_observations))
+    print("repeated pd.merge  %.3fs" % best_of(repeated_merge, frames))
+    print("wide_panel         %.3fs" % best_of(wide_panel, frames))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""
+Time building a SearchIndex over a synthetic catalog and answering
+autocomplete-style queries from it.
+
+    python benchmarks/bench_search.py [n_series]
+
+Each query is answered locally; fred.search_for_series would instead send
+a request and count against the api key's rate limit on every keystroke.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from full_fred.catalog import CATALOG_FIELDS
+from full_fred.search_index import SearchIndex
+
+WORDS = (
+    "unemployment rate employment industrial production index consumer price "
+    "manufacturing exports imports gross domestic product personal income "
+    "housing starts interest treasury yield exchange dollar california texas "
+    "retail sales inventories wages hours labor force participation"
+).split()
+FREQUENCIES = ("Daily", "Weekly", "Monthly", "Quarterly", "Annual")
+
+
+def make_catalog(n_series: int) -> dict:
+    rng = random.Random(0)
+    columns = {field: [None] * n_series for field in CATALOG_FIELDS}
+    for row in range(n_series):
+        columns["id"][row] = "S%07d" % row
+        columns["title"][row] = " ".join(rng.sample(WORDS, 6)).title()
+        columns["units"][row] = rng.choice(("Percent", "Index 2017=100", "Dollars"))
+        columns["frequency"][row] = rng.choice(FREQUENCIES)
+        columns["popularity"][row] = rng.randrange(100)
+    return columns
+
+
+def main(n_series: int = 200_000):
+    catalog = make_catalog(n_series)
+    start = time.perf_counter()
+    index = SearchIndex(catalog)
+    print("build %d series: %.2f s" % (n_series, time.perf_counter() - start))
+    queries = [
+        ("unemployment rate", {}),
+        ("consumer pri", {"prefix": True}),
+        ("exports", {"filter_variable": "frequency", "filter_value": "Monthly"}),
+        ("S00012*", {"search_type": "series_id"}),
+        ("*99", {"search_type": "series_id", "order_by": "popularity"}),
+    ]
+    for text, kwargs in queries:
+        index.search_for_series(text, limit=10, **kwargs)  # first sorts are cached
+        start = time.perf_counter()
+        for _ in range(20):
+            response = index.search_for_series(text, limit=10, **kwargs)
+        elapsed = (time.perf_counter() - start) / 20
+        print(
+            "%-20s %-45s %7d matches %8.2f ms"
+            % (text, kwargs, response["count"], elapsed * 1e3)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
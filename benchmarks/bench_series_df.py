@@ -0,0 +1,68 @@
+"""
+Compare get_series_df's default DataFrame construction (object columns of
+str) with its typed path (datetime64 and float64 columns built directly)
+on a synthetic vintage pull.
+
+    python benchmarks/bench_series_df.py [n_observations]
+
+"default + convert" is the default path followed by the conversions
+callers otherwise make themselves to get usable dtypes.
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from full_fred.fred import Fred
+
+
+def make_observations(n: int) -> list:
+    observations = list()
+    for i in range(n):
+        observations.append(
+            {
+                "realtime_start": "20%02d-%02d-28" % (i % 20, i % 12 + 1),
+                "realtime_end": "9999-12-31",
+                "date": "%04d-%02d-01" % (1000 + i // 12, i % 12 + 1),
+                "value": "." if i % 50 == 0 else str(i * 1.37),
+            }
+        )
+    return observations
+
+
+def default_and_convert(observations: list) -> pd.DataFrame:
+    df = pd.DataFrame(observations)
+    for column in ("realtime_start", "realtime_end", "date"):
+        df[column] = pd.to_datetime(df[column], format="%Y-%m-%d", errors="coerce")
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return df
+
+
+def best_of(f, *args, repeat: int = 5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = f(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result.memory_usage(deep=True).sum() / 2**20
+
+
+def main(n_observations: int = 100_000):
+    fred = Fred()
+    observations = make_observations(n_observations)
+    paths = {
+        "default (str columns)": pd.DataFrame,
+        "default + convert": default_and_convert,
+        "typed": fred._typed_observations_df,
+    }
+    print("observations: %d" % n_observations)
+    for name, f in paths.items():
+        seconds, mib = best_of(f, observations)
+        print("%-22s %.3fs  %6.1f MiB" % (name, seconds, mib))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
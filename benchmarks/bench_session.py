@@ -0,0 +1,54 @@
+"""
+Compare a fresh connection per request (the old bare requests.get path)
+with Fred's pooled keep-alive session against a local stub of FRED web
+service.
+
+    python benchmarks/bench_session.py [n_requests]
+
+The stub speaks plain HTTP on localhost, so the numbers show only the TCP
+setup saved per request; against api.stlouisfed.org each avoided
+connection also skips a TLS handshake and a network round trip or two.
+"""
+
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from full_fred.fred import Fred
+from full_fred.tests.fred_test_utils import StubFredServer, use_stub_server
+
+
+def main(n_requests: int = 500):
+    os.environ.setdefault("FRED_API_KEY", "abcdefghijklmnopqrstuvwxyz123456")
+    with StubFredServer() as server:
+        fred = Fred(requests_per_minute=None)
+        use_stub_server(fred, server)
+        url = fred._make_request_url("category?category_id=0")
+
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            requests.get(url).json()
+        unpooled = time.perf_counter() - start
+        unpooled_connections = server.connections
+
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            fred.get_a_category(0)
+        pooled = time.perf_counter() - start
+        pooled_connections = server.connections - unpooled_connections
+        fred.close()
+
+    print("requests:              %d" % n_requests)
+    print(
+        "requests.get per call: %.3fs, %d connections"
+        % (unpooled, unpooled_connections)
+    )
+    print("pooled Fred session:   %.3fs, %d connections" % (pooled, pooled_connections))
+    print("speedup:               %.2fx" % (unpooled / pooled))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
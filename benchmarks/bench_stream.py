@@ -0,0 +1,54 @@
+"""
+Compare peak memory of get_series_df's buffered typed path, which decodes
+the whole JSON response before building columns, with its streaming path,
+which parses observations into typed columns as the body downloads.
+
+    python benchmarks/bench_stream.py [n_observations]
+
+Responses come from a local stub of FRED web service. Peak memory is
+measured with tracemalloc and excludes the stub's copy of the body.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from full_fred.fred import Fred
+from full_fred.tests.fred_test_utils import StubFredServer, use_stub_server
+from bench_series_df import make_observations
+
+
+def measure(fred: Fred, **kwargs) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fred.get_series_df("GNPCA", **kwargs)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20, len(df)
+
+
+def main(n_observations: int = 300_000):
+    os.environ.setdefault("FRED_API_KEY", "abcdefghijklmnopqrstuvwxyz123456")
+    body = json.dumps(
+        {"count": n_observations, "observations": make_observations(n_observations)}
+    ).encode()
+    with StubFredServer(lambda path: (200, {}, body)) as server:
+        fred = Fred(requests_per_minute=None)
+        use_stub_server(fred, server)
+        print(
+            "response: %.1f MiB, %d observations" % (len(body) / 2**20, n_observations)
+        )
+        for name, kwargs in (
+            ("buffered typed", {"typed": True}),
+            ("streamed", {"stream": True}),
+        ):
+            seconds, peak, rows = measure(fred, **kwargs)
+            print("%-15s %.2fs  peak %6.1f MiB" % (name, seconds, peak))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
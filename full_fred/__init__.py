@@ -1,3 +1,10 @@
-from . import _version
+def __getattr__(name: str):
+    # computed on first access: in a source checkout versioneer asks git for
+    # the version in a subprocess, which import full_fred shouldn't pay for
+    if name == "__version__":
+        from . import _version
 
-__version__ = _version.get_versions()["version"]
+        global __version__
+        __version__ = _version.get_versions()["version"]
+        return __version__
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,197 @@
+from .rate_limiter import TokenBucket
+import functools
+import threading
+import time
+import os
+
+
+class ApiKeyFile:
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = 60.0,
+    ):
+        """
+        Holds the FRED api key read from the first line of the file at path,
+        so that building a request URL doesn't open and read the file each
+        time. Every check_interval seconds at most, the file's modification
+        time and size are checked and the key is read again if they changed,
+        so a rotated key is picked up without restarting.
+
+        The key is kept in a private attribute and never shown by repr or
+        str; like any value in process memory it is readable by code running
+        in the same process.
+
+        Parameters
+        ----------
+        path: str
+            The file holding the key on its first line.
+        check_interval: float, default 60.0
+            The most seconds between checks of the file for changes. 0 checks
+            before every request; None never checks again after the first read.
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._key = None
+        self._signature = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return "ApiKeyFile(%r, check_interval=%r)" % (self.path, self.check_interval)
+
+    def get(self) -> str:
+        """
+        Return the key, reading the file if it is due for a check and has
+        changed. Return None if the file has never been readable.
+        """
+        now = time.monotonic()
+        if self._key is not None and not self._due(now):
+            return self._key
+        with self._lock:
+            if self._key is None or self._due(now):
+                self._refresh(now)
+            return self._key
+
+    def invalidate(self):
+        """
+        Forget the key so that the next get reads the file again.
+        """
+        with self._lock:
+            self._key = None
+            self._signature = None
+
+    def _due(self, now: float) -> bool:
+        if self.check_interval is None:
+            return False
+        return now - self._checked >= self.check_interval
+
+    def _refresh(self, now: float):
+        self._checked = now
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._key is not None and signature == self._signature:
+                return
+            with open(self.path, "r") as key_file:
+                self._key = key_file.readline().strip()
+            self._signature = signature
+        except FileNotFoundError as e:
+            # keep serving the last key while the file is being replaced
+            print(e)
+
+
+class ApiKeyPool:
+    def __init__(
+        self,
+        api_key_files: list = (),
+        env_vars: list = (),
+        requests_per_minute: float = 120,
+        burst: int = 10,
+        check_interval: float = 60.0,
+    ):
+        """
+        Several FRED api keys, each with its own rate limit, that requests
+        are spread across: every request goes out with the key whose token
+        bucket has a token soonest, so n keys sustain n times the request
+        rate of one. Only use keys you are authorized to use together.
+
+        Parameters
+        ----------
+        api_key_files: list, default ()
+            Files holding a key on their first line; see ApiKeyFile.
+        env_vars: list, default ()
+            Names of environment variables holding a key, e.g.
+            ["FRED_API_KEY_1", "FRED_API_KEY_2"], looked up per request.
+        requests_per_minute: float, default 120
+            The sustained request rate allowed per key. If None, keys are
+            used in turn without rate limiting.
+        burst: int, default 10
+            The number of requests each key can send back to back after a pause.
+        check_interval: float, default 60.0
+            See ApiKeyFile.
+
+        Examples
+        --------
+        >>> pool = ApiKeyPool(env_vars=["FRED_KEY_A", "FRED_KEY_B", "FRED_KEY_C"])
+        >>> fred = Fred(key_pool=pool)  # up to 360 requests per minute
+        """
+        self.sources = list()
+        self._getters = list()
+        for path in api_key_files:
+            if not os.path.isfile(path):
+                raise FileNotFoundError("Can't find %s on path" % path)
+            self.sources.append(path)
+            self._getters.append(ApiKeyFile(path, check_interval).get)
+        for name in env_vars:
+            if name not in os.environ:
+                raise AttributeError("Cannot locate a FRED API key in %s" % name)
+            self.sources.append("$" + name)
+            self._getters.append(functools.partial(os.environ.get, name))
+        if not self.sources:
+            raise ValueError("ApiKeyPool needs at least one key file or env var")
+        self.buckets = None
+        if requests_per_minute is not None:
+            self.buckets = [
+                TokenBucket(requests_per_minute / 60, burst) for _ in self.sources
+            ]
+        self.requests = [0] * len(self.sources)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __repr__(self) -> str:
+        return "ApiKeyPool(%r)" % self.sources
+
+    def _reserve(self) -> tuple:
+        """
+        Pick the key available soonest and take a token from its bucket.
+        Return (key index, seconds to wait before sending).
+        """
+        with self._lock:
+            if self.buckets is None:
+                index = self.requests.index(min(self.requests))
+                delay = 0.0
+            else:
+                waits = [bucket.available_in() for bucket in self.buckets]
+                index = waits.index(min(waits))
+                delay = self.buckets[index]._reserve()
+            self.requests[index] += 1
+        return index, delay
+
+    def _key(self, index: int) -> str:
+        key = self._getters[index]()
+        if key is None:
+            raise AttributeError(
+                "Cannot locate a FRED API key in %s" % self.sources[index]
+            )
+        return key
+
+    def acquire(self) -> str:
+        """
+        Block until some key may send a request and return that key.
+        """
+        index, delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return self._key(index)
+
+    async def acquire_async(self) -> str:
+        """
+        Wait, without blocking the event loop, until some key may send a
+        request and return that key.
+        """
+        import asyncio
+
+        index, delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._key(index)
+
+    def stats(self) -> dict:
+        """
+        Return the number of requests sent with each key, by source.
+        """
+        with self._lock:
+            return dict(zip(self.sources, self.requests))
@@ -0,0 +1,306 @@
+import asyncio
+import functools
+import inspect
+from .fred import Fred
+from .fred_base import _RETRY_AFTER_TOO_LONG, _RequestPrepared, _report_failure
+from .stacks import Result
+
+_ASYNC_ENDPOINTS = {
+    "category_stack": (
+        "get_a_category",
+        "get_child_categories",
+        "get_related_categories",
+        "get_series_in_a_category",
+        "get_tags_for_a_category",
+        "get_related_tags_for_a_category",
+    ),
+    "release_stack": (
+        "get_all_releases",
+        "get_release_dates_all_releases",
+        "get_a_release",
+        "get_release_dates",
+        "get_series_on_a_release",
+        "get_sources_for_a_release",
+        "get_tags_for_a_release",
+        "get_related_tags_for_release",
+        "get_release_tables",
+    ),
+    "series_stack": (
+        "get_a_series",
+        "get_categories_of_series",
+        "get_release_for_a_series",
+        "search_for_series",
+        "get_tags_for_series_search",
+        "get_related_tags_for_series_search",
+        "get_tags_for_a_series",
+        "get_series_updates",
+        "get_series_vintagedates",
+    ),
+    "source_stack": (
+        "get_all_sources",
+        "get_a_source",
+        "get_releases_for_a_source",
+    ),
+    "tag_stack": (
+        "get_all_tags",
+        "get_related_tags_for_a_tag",
+        "get_series_matching_tags",
+    ),
+    "maps_stack": (
+        "get_geo_series_group",
+        "get_geo_series",
+        "get_regional_data",
+        "get_shape_files",
+    ),
+}
+
+# Fred methods that page, crawl or fetch many series through thread pools
+# of their own; AsyncFred runs them in a worker thread
+_THREADED_METHODS = (
+    "get_all_pages",
+    "get_many_series_df",
+    "get_series_panel",
+    "refresh_series_df",
+    "get_vintage_cube",
+    "get_category_tree",
+)
+_THREADED_ITERATORS = (
+    "iter_pages",
+    "iter_series_df",
+)
+_EXHAUSTED = object()
+
+
+def _async_endpoint(
+    method_name: str,
+    stack_name: str,
+):
+    """
+    Return a coroutine function mirroring Fred.method_name: the request URL is
+    built by the synchronous method, the request itself is awaited.
+    """
+    method = getattr(Fred, method_name)
+
+    @functools.wraps(method)
+    async def endpoint(self, *args, **kwargs):
+        prepared = self._prepare_request(method, *args, **kwargs)
+        data = await self._fetch_data_async(prepared)
+        getattr(self, stack_name)[method_name] = data
+        return data
+
+    return endpoint
+
+
+def _threaded_method(method_name: str):
+    """
+    Return a coroutine function mirroring Fred.method_name by running it in
+    the event loop's default executor, so the loop isn't blocked.
+    """
+    method = getattr(Fred, method_name)
+
+    @functools.wraps(method)
+    async def threaded(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(method, self, *args, **kwargs)
+        return await loop.run_in_executor(None, call)
+
+    return threaded
+
+
+def _threaded_iterator(method_name: str):
+    """
+    Return an async generator function mirroring the generator
+    Fred.method_name: each item is produced in the event loop's default
+    executor, so the loop isn't blocked while a page downloads.
+    """
+    method = getattr(Fred, method_name)
+
+    @functools.wraps(method)
+    async def threaded(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        items = method(self, *args, **kwargs)
+        try:
+            while True:
+                item = await loop.run_in_executor(None, next, items, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    return
+                yield item
+        finally:
+            items.close()
+
+    return threaded
+
+
+class AsyncFred(Fred):
+    def __init__(
+        self,
+        *args,
+        max_connections: int = 100,
+        **kwargs,
+    ):
+        """
+        asyncio client for FRED web service. Every Fred method that queries FRED
+        has an awaitable counterpart of the same name and signature, so one
+        event loop can keep many requests in flight:
+
+            async with AsyncFred() as fred:
+                gdp, cpi = await asyncio.gather(
+                    fred.get_series_df("GDP"),
+                    fred.get_series_df("CPIAUCSL"),
+                )
+
+        Single requests are sent with aiohttp. Methods that page, crawl or
+        fetch many series (get_all_pages, get_many_series_df,
+        get_series_panel, refresh_series_df, get_vintage_cube and
+        get_category_tree) are coroutines running Fred's implementation in a
+        worker thread, and iter_pages and iter_series_df are async
+        generators:
+
+            async for chunk in fred.iter_series_df("GDPC1", typed=True):
+                ...
+
+        get_series_df with stream=True parses the whole response into typed
+        columns, as with typed=True, rather than as it downloads.
+
+        AsyncFred accepts every Fred argument. Results are stored in the same
+        stacks as Fred's. aiohttp must be installed:
+            pip install full_fred[async]
+
+        Parameters
+        ----------
+        max_connections: int, default 100
+            The maximum number of simultaneous connections to FRED. Requests
+            beyond this wait for a free connection.
+        """
+        super().__init__(*args, **kwargs)
+        self.max_connections = max_connections
+        self._async_session = None
+
+    def _get_async_session(self):
+        """
+        Return the aiohttp session shared by all coroutines, creating it on
+        first use inside the running event loop.
+        """
+        if self._async_session is None or self._async_session.closed:
+            try:
+                import aiohttp
+            except ImportError as e:
+                message = "AsyncFred requires aiohttp: pip install full_fred[async]"
+                raise ImportError(message) from e
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                force_close=not self.keep_alive,
+            )
+            self._async_session = aiohttp.ClientSession(connector=connector)
+        return self._async_session
+
+    async def aclose(self):
+        """
+        Close the aiohttp session and release its connections.
+        """
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+        self.close()
+
+    async def _fetch_data_async(
+        self,
+        prepared: _RequestPrepared,
+    ) -> dict:
+        """
+        Make request URL for prepared, await FRED's response, return JSON upshot
+        """
+        cached = self._read_cache(prepared.url_prefix, prepared.geo)
+        if cached is not None:
+            return Result(cached)
+        if prepared.geo:
+            url = self._make_geo_request_url(prepared.url_prefix)
+        else:
+            url = self._make_request_url(prepared.url_prefix)
+        json_data = await self._get_response_async(url)
+        if json_data is None:
+            # never print api key in message for security
+            message = "Data could not be retrieved, returning None"
+            _report_failure(message)
+            return
+        self._write_cache(prepared.url_prefix, json_data, prepared.geo)
+        return Result(json_data)
+
+    async def _get_response_async(self, a_url: str) -> dict:
+        """
+        Return a JSON dictionary response with data retrieved from a_url,
+        waiting for the rate limiter, or a key_pool key, before each attempt
+        and retrying per fred.retry_policy. Connection errors, timeouts and
+        responses cut short are retried; any other error is not.
+        """
+        import aiohttp
+
+        if a_url is None:
+            # no api key to build the url with, already reported
+            return
+        session = self._get_async_session()
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=self.timeout, sock_read=self.timeout
+        )
+        attempt = 0
+        while True:
+            attempt += 1
+            url = a_url
+            if self.key_pool is not None:
+                url = a_url + await self.key_pool.acquire_async()
+            elif self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            try:
+                async with session.get(url, timeout=timeout) as response:
+                    if not self._should_retry(attempt, response.status):
+                        return await response.json(content_type=None)
+                    retry_after = response.headers.get("Retry-After")
+                    delay = self.retry_policy.delay(attempt, retry_after)
+                    if delay is None:
+                        _report_failure(_RETRY_AFTER_TOO_LONG)
+                        return await response.json(content_type=None)
+            except (
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                asyncio.TimeoutError,
+            ):
+                if not self._should_retry(attempt):
+                    return
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                continue
+            except (aiohttp.ClientError, ValueError) as e:
+                # never print the url, it holds the api key
+                _report_failure("Request could not be sent: %s" % type(e).__name__)
+                return
+            await asyncio.sleep(delay)
+
+    @functools.wraps(Fred.get_series_df)
+    async def get_series_df(self, series_id: str, *args, **kwargs):
+        arguments = (
+            inspect.signature(Fred.get_series_df)
+            .bind(self, series_id, *args, **kwargs)
+            .arguments
+        )
+        prepared = self._prepare_request(Fred.get_series_df, series_id, *args, **kwargs)
+        df_and_metadata = await self._fetch_data_async(prepared)
+        return self._series_df_from_response(
+            series_id,
+            df_and_metadata,
+            typed=arguments.get("typed", False) or arguments.get("stream", False),
+            date_index=arguments.get("date_index", False),
+        )
+
+
+for _stack_name, _method_names in _ASYNC_ENDPOINTS.items():
+    for _method_name in _method_names:
+        setattr(AsyncFred, _method_name, _async_endpoint(_method_name, _stack_name))
+for _method_name in _THREADED_METHODS:
+    setattr(AsyncFred, _method_name, _threaded_method(_method_name))
+for _method_name in _THREADED_ITERATORS:
+    setattr(AsyncFred, _method_name, _threaded_iterator(_method_name))
@@ -0,0 +1,391 @@
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+import threading
+import sqlite3
+import json
+import time
+import zlib
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return url, a FRED request URL or URL prefix such as
+    "fred/series?series_id=GDP&realtime_start=2020-01-01", in a canonical
+    form usable as a cache key: any scheme and host are dropped, the api_key
+    and file_type parameters are removed and the remaining parameters are
+    sorted. Requests that FRED answers identically get the same key, and no
+    key ever contains an api key.
+    """
+    if "://" in url:
+        url = url.split("://", 1)[1].split("/", 1)[-1]
+    path, _, query = url.partition("?")
+    params = parse_qsl(query, keep_blank_values=True)
+    params = sorted((k, v) for k, v in params if k not in ("api_key", "file_type"))
+    return path + "?" + "&".join("%s=%s" % kv for kv in params)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        default_ttl: float = 600,
+        ttls: dict = None,
+    ):
+        """
+        Base class of FRED response caches. Responses are stored as JSON keyed
+        by canonical_url, each expiring after the TTL of its endpoint.
+        Subclasses implement _get, _set, _delete and clear.
+
+        Parameters
+        ----------
+        default_ttl: float, default 600
+            Seconds a response stays fresh if its endpoint has no entry in ttls.
+        ttls: dict, default None
+            Endpoint path -> seconds, for example
+            {"fred/series/observations": 300, "fred/series": 86400}.
+            A TTL of 0 keeps that endpoint's responses out of the cache.
+        """
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls) if ttls is not None else dict()
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def ttl_for(self, key: str) -> float:
+        """
+        Return the TTL in seconds of the endpoint key belongs to.
+        """
+        return self.ttls.get(key.split("?", 1)[0], self.default_ttl)
+
+    def get(self, key: str) -> dict:
+        """
+        Return a fresh copy of the response cached under key, or None.
+        """
+        data = self._get(key, time.time())
+        with self._stats_lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if data is None:
+            return
+        return json.loads(data)
+
+    def set(
+        self,
+        key: str,
+        response: dict,
+        ttl: float = None,
+    ) -> bool:
+        """
+        Cache response under key for ttl seconds, by default the TTL of its
+        endpoint. Return whether it was stored.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        if ttl <= 0:
+            return False
+        data = json.dumps(response, separators=(",", ":")).encode()
+        return self._set(key, data, time.time() + ttl)
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove the response cached under key. Return whether there was one.
+        """
+        return self._delete(key)
+
+    def stats(self) -> dict:
+        """
+        Return hit and miss counts and the hit ratio.
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _get(
+        self,
+        key: str,
+        now: float,
+    ) -> bytes:
+        raise NotImplementedError
+
+    def _set(
+        self,
+        key: str,
+        data: bytes,
+        expires: float,
+    ) -> bool:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    def __init__(
+        self,
+        max_bytes: int = 64 * 2**20,
+        default_ttl: float = 600,
+        ttls: dict = None,
+    ):
+        """
+        Thread-safe in-memory response cache holding at most max_bytes of JSON,
+        evicting the least recently used responses first.
+
+        Parameters
+        ----------
+        max_bytes: int, default 64 MiB
+            The most bytes of serialized responses kept. A response larger
+            than max_bytes is not cached.
+        default_ttl, ttls:
+            See ResponseCache.
+        """
+        super().__init__(default_ttl=default_ttl, ttls=ttls)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(
+        self,
+        key: str,
+        now: float,
+    ) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            expires, data = entry
+            if expires <= now:
+                self._discard(key)
+                return
+            self._entries.move_to_end(key)
+            return data
+
+    def _set(
+        self,
+        key: str,
+        data: bytes,
+        expires: float,
+    ) -> bool:
+        if len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (expires, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _discard(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+        return entry is not None
+
+    def _delete(self, key: str) -> bool:
+        with self._lock:
+            return self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update(
+            {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "evictions": self.evictions,
+            }
+        )
+        return stats
+
+
+class SQLiteCache(ResponseCache):
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1024 * 2**20,
+        default_ttl: float = 86400,
+        ttls: dict = None,
+        access_resolution: float = 60.0,
+    ):
+        """
+        Persistent response cache in an SQLite database file, shared by every
+        thread and process that opens the same path. Responses are stored as
+        zlib-compressed JSON; the database runs in WAL mode so readers never
+        wait on a writer, and the running byte total is kept in the database
+        so writes don't sum every response.
+
+        Parameters
+        ----------
+        path: str
+            The database file, created if missing.
+        max_bytes: int, default 1 GiB
+            The most bytes of compressed responses kept. Past it, expired
+            responses and then the least recently used ones are deleted.
+        default_ttl: float, default 86400
+            See ResponseCache.
+        ttls: dict, default None
+            See ResponseCache.
+        access_resolution: float, default 60.0
+            Seconds within which a response's last use is kept to. A hit
+            records its time only if the one recorded is older, so most
+            hits are reads alone and least recently used is approximate to
+            this many seconds.
+        """
+        super().__init__(default_ttl=default_ttl, ttls=ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.access_resolution = access_resolution
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL, accessed REAL, "
+                "size INTEGER, data BLOB)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+            # one row holding SUM(size), kept current by the triggers below
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS total_size ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO total_size "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM responses"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_insert "
+                "AFTER INSERT ON responses BEGIN "
+                "UPDATE total_size SET size = size + NEW.size; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_delete "
+                "AFTER DELETE ON responses BEGIN "
+                "UPDATE total_size SET size = size - OLD.size; END"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection to the database.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # so rows removed by INSERT OR REPLACE fire the delete trigger
+            connection.execute("PRAGMA recursive_triggers=ON")
+            self._local.connection = connection
+        return connection
+
+    def __len__(self) -> int:
+        row = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return row[0]
+
+    def _get(
+        self,
+        key: str,
+        now: float,
+    ) -> bytes:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT expires, accessed, data FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] <= now:
+            return
+        if now - row[1] >= self.access_resolution:
+            with connection:
+                connection.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+        return zlib.decompress(row[2])
+
+    def _set(
+        self,
+        key: str,
+        data: bytes,
+        expires: float,
+    ) -> bool:
+        compressed = zlib.compress(data)
+        if len(compressed) > self.max_bytes:
+            return False
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, expires, time.time(), len(compressed), compressed),
+            )
+            self._shrink(connection)
+        return True
+
+    def _shrink(self, connection: sqlite3.Connection):
+        """
+        Delete expired and then least recently used responses until the
+        cache holds at most max_bytes.
+        """
+        total = self.size
+        if total <= self.max_bytes:
+            return
+        connection.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        rows = connection.execute("SELECT key, size FROM responses ORDER BY accessed")
+        total = self.size
+        doomed = list()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes of compressed responses in the cache.
+        """
+        row = self._connect().execute("SELECT size FROM total_size").fetchone()
+        return row[0]
+
+    def _delete(self, key: str) -> bool:
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """
+        Close this thread's connection to the database.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({"entries": len(self), "bytes": self.size})
+        return stats
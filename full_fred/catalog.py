@@ -0,0 +1,343 @@
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import threading
+import json
+import gzip
+import time
+import os
+
+# the series metadata fields kept as columns of the catalog
+CATALOG_FIELDS = (
+    "id",
+    "title",
+    "observation_start",
+    "observation_end",
+    "frequency",
+    "frequency_short",
+    "units",
+    "units_short",
+    "seasonal_adjustment",
+    "seasonal_adjustment_short",
+    "last_updated",
+    "popularity",
+    "group_popularity",
+    "notes",
+)
+
+SERIES_FILE = "series.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+PARQUET_FILE = "catalog.parquet"
+COLUMNS_FILE = "catalog.json.gz"
+
+
+def parquet_available() -> bool:
+    """
+    Indicate whether pandas can write parquet files here.
+    """
+    return any(
+        importlib.util.find_spec(engine) is not None
+        for engine in ("pyarrow", "fastparquet")
+    )
+
+
+class CatalogMirror:
+    def __init__(
+        self,
+        fred,
+        directory: str,
+        releases: bool = True,
+        category_ids: list = None,
+        max_workers: int = 4,
+        page_size: int = 1_000,
+        checkpoint_interval: float = 5.0,
+    ):
+        """
+        A local mirror of the metadata of every FRED series: title,
+        frequency, units, seasonal adjustment, last_updated, popularity and
+        notes. run enumerates the series of every release (and of any
+        categories given) with up to max_workers releases or categories
+        fetched at once, keeps each series id once, and writes a columnar
+        catalog. Progress is kept in directory as it goes, so a run that
+        crashes or is stopped picks up where it left off when run again.
+
+        Parameters
+        ----------
+        fred: Fred
+            The Fred instance used to send requests; its rate limiter, key
+            pool, retries and cache all apply.
+        directory: str
+            Where progress and the catalog are kept; created if missing.
+            series.jsonl holds every series found, one JSON object per
+            line; checkpoint.json records how far each release or category
+            has been read.
+        releases: bool, default True
+            If True, enumerate the series of every release.
+        category_ids: list, default None
+            IDs of categories whose series are also enumerated, e.g. every
+            ID of a CategoryTree from fred.get_category_tree(). Series on no
+            release are only found this way.
+        max_workers: int, default 4
+            The most releases or categories read at once.
+        page_size: int, default 1_000
+            Series requested per page, at most 1_000.
+        checkpoint_interval: float, default 5.0
+            The most seconds between writes of checkpoint.json. Series are
+            written as each page arrives; at worst the pages read since the
+            last checkpoint are requested again, and their series, already
+            in series.jsonl, are skipped.
+
+        Examples
+        --------
+        >>> mirror = CatalogMirror(fred, "fred_catalog", max_workers=8)
+        >>> catalog = mirror.run()  # run again after a crash to resume
+        >>> mirror.errors
+        >>> catalog = load_catalog("fred_catalog")
+        """
+        if not 1 <= page_size <= 1_000:
+            raise ValueError("page_size must be in range(1, 1_001)")
+        self.fred = fred
+        self.directory = directory
+        self.releases = releases
+        self.category_ids = list(category_ids) if category_ids is not None else list()
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.checkpoint_interval = checkpoint_interval
+        self.errors = dict()
+        self._lock = threading.Lock()
+        self._series_ids = set()
+        self._units = dict()
+        self._listed = list()
+        self._saved = None
+        self._series_file = None
+
+    def __repr__(self) -> str:
+        return "CatalogMirror(%r: %d series, %d of %d units done)" % (
+            self.directory,
+            len(self._series_ids),
+            sum(unit["done"] for unit in self._units.values()),
+            len(self._units),
+        )
+
+    def run(self):
+        """
+        Read every release and category not read yet, resuming those left
+        part way, then write the catalog and return it as a pd.DataFrame
+        with a column per CATALOG_FIELDS. Releases and categories that
+        failed are reported, unit -> error message, in errors, and are read
+        again by the next run.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.errors = dict()
+        self._load()
+        if self.releases and "releases" not in self._listed:
+            try:
+                self._list_releases()
+            except RuntimeError as e:
+                self.errors["releases"] = str(e)
+        for category_id in self.category_ids:
+            self._units.setdefault(
+                "category:%d" % category_id, {"offset": 0, "done": False}
+            )
+        self._save_checkpoint()
+        remaining = [unit for unit, state in self._units.items() if not state["done"]]
+        with open(self._path(SERIES_FILE), "a", encoding="utf-8") as series_file:
+            self._series_file = series_file
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    list(pool.map(self._read_unit, remaining))
+            finally:
+                # while the series file is still set, so it is synced first
+                self._save_checkpoint()
+                self._series_file = None
+        return self.write_catalog()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        """
+        Read the series ids already mirrored and the checkpoint, if any.
+        """
+        _drop_incomplete_line(self._path(SERIES_FILE))
+        self._series_ids = set()
+        for record in _read_series(self._path(SERIES_FILE)):
+            self._series_ids.add(record["id"])
+        self._units = dict()
+        self._listed = list()
+        if os.path.isfile(self._path(CHECKPOINT_FILE)):
+            with open(self._path(CHECKPOINT_FILE), "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            self._units = checkpoint["units"]
+            self._listed = checkpoint["listed"]
+
+    def _list_releases(self):
+        for page in self.fred._iter_pages("get_all_releases", max_workers=1):
+            for release in page["releases"]:
+                unit = "release:%d" % release["id"]
+                self._units.setdefault(unit, {"offset": 0, "done": False})
+        self._listed.append("releases")
+
+    def _read_unit(self, unit: str):
+        """
+        Read the series of one release or category from its checkpointed
+        offset, storing each page as it arrives.
+        """
+        kind, an_id = unit.split(":")
+        method_name = {
+            "release": "get_series_on_a_release",
+            "category": "get_series_in_a_category",
+        }[kind]
+        offset = self._units[unit]["offset"]
+        try:
+            pages = self.fred._iter_pages(
+                method_name,
+                int(an_id),
+                offset=offset,
+                max_workers=1,
+                page_size=self.page_size,
+            )
+            for page in pages:
+                offset += len(page["seriess"])
+                self._store(unit, offset, page["seriess"])
+        except (RuntimeError, KeyError) as e:
+            with self._lock:
+                self.errors[unit] = str(e)
+            return
+        with self._lock:
+            self._units[unit]["done"] = True
+        self._save_checkpoint(force=False)
+
+    def _store(
+        self,
+        unit: str,
+        offset: int,
+        seriess: list,
+    ):
+        """
+        Append the series of a page not mirrored yet to series.jsonl, then
+        record that unit has been read up to offset.
+        """
+        with self._lock:
+            lines = list()
+            for series in seriess:
+                if series["id"] not in self._series_ids:
+                    self._series_ids.add(series["id"])
+                    lines.append(json.dumps(series) + "\n")
+            self._series_file.writelines(lines)
+            self._series_file.flush()
+            self._units[unit]["offset"] = offset
+        self._save_checkpoint(force=False)
+
+    def _save_checkpoint(self, force: bool = True):
+        """
+        Write checkpoint.json, unless force is False and it was written less
+        than checkpoint_interval seconds ago. The file is replaced in one
+        step so a crash never leaves it half written.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._saved is not None:
+                if now - self._saved < self.checkpoint_interval:
+                    return
+            # series must be on disk before the offsets that cover them
+            if self._series_file is not None:
+                os.fsync(self._series_file.fileno())
+            checkpoint = {"listed": self._listed, "units": self._units}
+            temporary = self._path(CHECKPOINT_FILE + ".tmp")
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f)
+            os.replace(temporary, self._path(CHECKPOINT_FILE))
+            self._saved = now
+
+    def write_catalog(self):
+        """
+        Write every series mirrored so far as a columnar catalog: a parquet
+        file if pyarrow or fastparquet is installed, else gzipped JSON with
+        a list per column. Return the catalog as a pd.DataFrame.
+        """
+        import pandas as pd
+
+        columns = catalog_columns(_read_series(self._path(SERIES_FILE)))
+        df = pd.DataFrame(columns, columns=list(CATALOG_FIELDS))
+        if parquet_available():
+            df.to_parquet(self._path(PARQUET_FILE), index=False)
+        else:
+            temporary = self._path(COLUMNS_FILE + ".tmp")
+            with gzip.open(temporary, "wt", encoding="utf-8") as f:
+                json.dump(columns, f)
+            os.replace(temporary, self._path(COLUMNS_FILE))
+        return df
+
+
+def catalog_columns(records) -> dict:
+    """
+    Return the CATALOG_FIELDS of the series records as a dict of column
+    name -> list, popularity and group_popularity as int, others as str,
+    None where a record lacks a field.
+    """
+    columns = {field: list() for field in CATALOG_FIELDS}
+    for record in records:
+        for field, column in columns.items():
+            column.append(record.get(field))
+    for field in ("popularity", "group_popularity"):
+        columns[field] = [int(v) if v is not None else None for v in columns[field]]
+    return columns
+
+
+def load_catalog(directory: str):
+    """
+    Read the catalog a CatalogMirror wrote to directory, as a pd.DataFrame.
+    """
+    import pandas as pd
+
+    parquet_path = os.path.join(directory, PARQUET_FILE)
+    columns_path = os.path.join(directory, COLUMNS_FILE)
+    if os.path.isfile(parquet_path) and parquet_available():
+        return pd.read_parquet(parquet_path)
+    if os.path.isfile(columns_path):
+        with gzip.open(columns_path, "rt", encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f), columns=list(CATALOG_FIELDS))
+    raise FileNotFoundError("No catalog in %s; run a CatalogMirror first" % directory)
+
+
+def _drop_incomplete_line(path: str):
+    """
+    Cut a last line left incomplete by a crash from the file at path, so
+    that lines appended later start on a line of their own.
+    """
+    if not os.path.isfile(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # read back a block at a time to find the last complete line
+        end = size
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+        f.truncate(0)
+
+
+def _read_series(path: str):
+    """
+    Yield the series records of a series.jsonl file, skipping a last line
+    left incomplete by a crash.
+    """
+    if not os.path.isfile(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -1,4 +1,6 @@
+from .category_tree import CategoryTree
 from .fred_base import FredBase
+from .stacks import ResultStack
 
 
 class Categories(FredBase):
@@ -6,7 +8,7 @@ class Categories(FredBase):
     def __init__(self):
         """"""
         super().__init__()
-        self.category_stack = dict()
+        self.category_stack = ResultStack()
 
     def get_a_category(
         self,
@@ -55,8 +57,9 @@ class Categories(FredBase):
         if url_prefix_params["an_int_id"] is None:
             url_prefix_params["an_int_id"] = 0
         url = self._append_id_to_url(**url_prefix_params)
-        self.category_stack["get_a_category"] = self._fetch_data(url)
-        return self.category_stack["get_a_category"]
+        data = self._fetch_data(url)
+        self.category_stack["get_a_category"] = data
+        return data
 
     def get_child_categories(
         self,
@@ -122,8 +125,9 @@ class Categories(FredBase):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.category_stack["get_child_categories"] = self._fetch_data(url)
-        return self.category_stack["get_child_categories"]
+        data = self._fetch_data(url)
+        self.category_stack["get_child_categories"] = data
+        return data
 
     def get_related_categories(
         self,
@@ -187,8 +191,71 @@ class Categories(FredBase):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.category_stack["get_related_categories"] = self._fetch_data(url)
-        return self.category_stack["get_related_categories"]
+        data = self._fetch_data(url)
+        self.category_stack["get_related_categories"] = data
+        return data
+
+    def get_category_tree(
+        self,
+        category_id: int = None,
+        max_workers: int = 8,
+        realtime_start: str = None,
+        realtime_end: str = None,
+    ) -> CategoryTree:
+        """
+        Crawl every category below a category, breadth first with up to
+        max_workers concurrent requests, into a CategoryTree that can be
+        navigated, searched and saved locally.
+
+        Parameters
+        ----------
+        category_id: int, default None
+            The ID of the category at the top of the tree.
+            If None, root category_id of 0 is used, crawling all of FRED's
+            categories; that takes one request per category.
+        max_workers: int, default 8
+            The most requests in flight at once. Every request still passes
+            through fred's rate limiter.
+        realtime_start: str, default None
+            The start of the real-time period formatted as "YYYY-MM-DD".
+            If None, fred.realtime_start is used.
+            If fred.realtime_start = None, FRED web service will use today's date.
+        realtime_end: str, default None
+            The end of the real-time period formatted as "YYYY-MM-DD".
+            If None, fred.realtime_end is used.
+            If fred.realtime_end = None, FRED web service will use today's date.
+
+        Returns
+        -------
+        CategoryTree
+            Also accessible with: f.category_stack['get_category_tree']
+            Categories whose children could not be retrieved are listed,
+            category_id -> error message, in its errors.
+
+        See Also
+        --------
+        fred.get_child_categories: Get the categories directly within a category.
+        CategoryTree.load: Read a tree saved with CategoryTree.save.
+
+        Examples
+        --------
+        >>> tree = fred.get_category_tree()
+        >>> tree.save("categories.json")
+        >>> tree.path(32145)  # names from "Categories" down to 32145
+        >>> tree.descendants(32991)
+        """
+        self._viable_api_key()
+        if category_id is None:
+            category_id = 0
+        tree = CategoryTree.crawl(
+            self,
+            category_id,
+            max_workers=max_workers,
+            realtime_start=realtime_start,
+            realtime_end=realtime_end,
+        )
+        self.category_stack["get_category_tree"] = tree
+        return tree
 
     def get_series_in_a_category(
         self,
@@ -317,8 +384,9 @@ class Categories(FredBase):
             "&exclude_tag_names=": exclude_tag_names,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.category_stack["get_series_in_a_category"] = self._fetch_data(url)
-        return self.category_stack["get_series_in_a_category"]
+        data = self._fetch_data(url)
+        self.category_stack["get_series_in_a_category"] = data
+        return data
 
     def get_tags_for_a_category(
         self,
@@ -429,8 +497,9 @@ class Categories(FredBase):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.category_stack["get_tags_for_a_category"] = self._fetch_data(url)
-        return self.category_stack["get_tags_for_a_category"]
+        data = self._fetch_data(url)
+        self.category_stack["get_tags_for_a_category"] = data
+        return data
 
     def get_related_tags_for_a_category(
         self,
@@ -545,5 +614,6 @@ class Categories(FredBase):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.category_stack["get_related_tags_for_a_category"] = self._fetch_data(url)
-        return self.category_stack["get_related_tags_for_a_category"]
+        data = self._fetch_data(url)
+        self.category_stack["get_related_tags_for_a_category"] = data
+        return data
@@ -0,0 +1,218 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import json
+
+
+class CategoryTree:
+    def __init__(
+        self,
+        categories: list,
+        root_id: int = 0,
+        errors: dict = None,
+    ):
+        """
+        FRED's category hierarchy, or the part of it below root_id, held
+        locally: every category's metadata, a parent pointer and the ordered
+        list of its children, so navigating the tree costs no requests.
+        Ancestor paths are computed once per category and then memoized.
+
+        Parameters
+        ----------
+        categories: list
+            FRED category dicts, each with id, name and parent_id, as in the
+            "categories" of a category/children response. Children keep the
+            order they are listed in.
+        root_id: int, default 0
+            The ID of the category at the top of the tree, itself in
+            categories. Its parent_id is not followed.
+        errors: dict, default None
+            category_id -> error message for categories whose children could
+            not be retrieved, so the tree is incomplete below them.
+
+        See Also
+        --------
+        fred.get_category_tree: Crawl FRED's category tree into a CategoryTree.
+
+        Examples
+        --------
+        >>> tree = CategoryTree.load("categories.json")
+        >>> tree.children(0)
+        >>> tree.path(32145)
+        >>> tree.find("exchange rates")
+        """
+        self.root_id = root_id
+        self.categories = {c["id"]: c for c in categories}
+        if root_id not in self.categories:
+            raise ValueError("categories must hold the root category %d" % root_id)
+        self.errors = dict(errors) if errors is not None else dict()
+        self._children = {category_id: list() for category_id in self.categories}
+        for category_id, category in self.categories.items():
+            if category_id != root_id and category["parent_id"] in self._children:
+                self._children[category["parent_id"]].append(category_id)
+        self._ancestors = {root_id: ()}
+
+    @classmethod
+    def crawl(
+        cls,
+        fred,
+        category_id: int = 0,
+        max_workers: int = 8,
+        realtime_start: str = None,
+        realtime_end: str = None,
+    ):
+        """
+        Build the tree below category_id with a breadth-first crawl of
+        fred/category/children: each category's children are requested as
+        soon as the category is discovered, at most max_workers at once, and
+        every request passes through fred's rate limiter. Categories whose
+        children can't be retrieved are reported in errors.
+        """
+        from .categories import Categories
+
+        def fetch(method, an_id: int, **kwargs) -> dict:
+            prepared = fred._prepare_request(method, an_id, **kwargs)
+            return fred._fetch_data(prepared.url_prefix)
+
+        root = fetch(Categories.get_a_category, category_id)
+        if root is None or not root.get("categories"):
+            message = _error_message(root)
+            raise RuntimeError("Category %d: %s" % (category_id, message))
+        realtime = {"realtime_start": realtime_start, "realtime_end": realtime_end}
+        found = {category_id: root["categories"][0]}
+        errors = dict()
+        pending = dict()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+            def submit(an_id: int):
+                future = pool.submit(
+                    fetch, Categories.get_child_categories, an_id, **realtime
+                )
+                pending[future] = an_id
+
+            submit(category_id)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent_id = pending.pop(future)
+                    response = future.result()
+                    if response is None or "categories" not in response:
+                        errors[parent_id] = _error_message(response)
+                        continue
+                    for child in response["categories"]:
+                        # a category listed twice is only crawled once
+                        if child["id"] not in found:
+                            found[child["id"]] = child
+                            submit(child["id"])
+        return cls(list(found.values()), category_id, errors)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self.categories
+
+    def __getitem__(self, category_id: int) -> dict:
+        return self.categories[category_id]
+
+    def __repr__(self) -> str:
+        return "CategoryTree(root %d: %d categories, %d errors)" % (
+            self.root_id,
+            len(self),
+            len(self.errors),
+        )
+
+    def children(self, category_id: int) -> list:
+        """
+        The categories directly below category_id, in FRED's order.
+        """
+        return [self.categories[k] for k in self._children[category_id]]
+
+    def parent(self, category_id: int) -> dict:
+        """
+        The category directly above category_id, None for the root and for
+        categories whose parent isn't in the tree.
+        """
+        if category_id == self.root_id:
+            return None
+        return self.categories.get(self.categories[category_id]["parent_id"])
+
+    def ancestors(self, category_id: int) -> tuple:
+        """
+        The IDs of the categories above category_id, from the root down to
+        its parent. Each category's ancestors are found once and memoized,
+        as are those of every category passed on the way up.
+        """
+        climbed = list()
+        an_id = category_id
+        while an_id not in self._ancestors:
+            parent_id = self.categories[an_id]["parent_id"]
+            if parent_id not in self.categories:
+                self._ancestors[an_id] = ()
+                break
+            climbed.append(an_id)
+            an_id = parent_id
+        ancestors = self._ancestors[an_id]
+        for an_id in reversed(climbed):
+            ancestors = ancestors + (self.categories[an_id]["parent_id"],)
+            self._ancestors[an_id] = ancestors
+        return self._ancestors[category_id]
+
+    def path(self, category_id: int) -> list:
+        """
+        The names of the categories from the root down to category_id.
+        """
+        ids = self.ancestors(category_id) + (category_id,)
+        return [self.categories[k]["name"] for k in ids]
+
+    def descendants(self, category_id: int) -> list:
+        """
+        The IDs of every category below category_id, breadth first.
+        """
+        found = list()
+        level = self._children[category_id]
+        while level:
+            found.extend(level)
+            level = [k for an_id in level for k in self._children[an_id]]
+        return found
+
+    def find(self, text: str) -> list:
+        """
+        The categories whose name contains text, ignoring case.
+        """
+        text = text.lower()
+        return [c for c in self.categories.values() if text in c["name"].lower()]
+
+    def to_dict(self) -> dict:
+        """
+        The tree as a JSON-serializable dict, categories listed breadth first.
+        """
+        order = dict.fromkeys([self.root_id] + self.descendants(self.root_id))
+        # categories whose parent isn't in the tree follow the rest
+        order.update(dict.fromkeys(self.categories))
+        return {
+            "root_id": self.root_id,
+            "categories": [self.categories[k] for k in order],
+            "errors": {str(k): v for k, v in self.errors.items()},
+        }
+
+    def save(self, path: str):
+        """
+        Write the tree to the JSON file at path; see load.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Read a tree written by save.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        errors = {int(k): v for k, v in data["errors"].items()}
+        return cls(data["categories"], data["root_id"], errors)
+
+
+def _error_message(response: dict) -> str:
+    if response is None:
+        return "Data could not be retrieved"
+    return response.get("error_message", "Response has no categories")
@@ -1,3 +1,5 @@
+from .api_key import ApiKeyPool
+from .cache import ResponseCache
 from .maps import Maps
 
 
@@ -7,6 +9,15 @@ class Fred(Maps):
         api_key_file: str = None,
         observation_start: str = None,
         observation_end: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        requests_per_minute: float = 120,
+        burst: int = 10,
+        max_attempts: int = 5,
+        timeout: float = 30.0,
+        cache: ResponseCache = None,
+        key_pool: ApiKeyPool = None,
     ):
         """
         API Key
@@ -27,7 +38,19 @@ class Fred(Maps):
             To get current api_key_file value:
                 fred.get_api_key_file()
 
-            In neither case is your api key stored. When a request is made your key will be read from api_key_file or environment.
+            The key is never stored in a public attribute or shown by repr. A key from the environment is looked up for each request.
+            A key from api_key_file is read once and held in memory so requests don't touch the file; the file is checked for
+            changes at most every 60 seconds and read again if it changed, so a rotated key is picked up. To change the interval:
+                fred.set_api_key_file('example_key.txt', check_interval=0)
+
+            key_pool
+            --------
+            A crawl can spread its requests over several keys you are entitled to use with a full_fred.api_key.ApiKeyPool.
+            Every request is sent with the key whose own rate limit frees up soonest, so n keys sustain about n times
+            requests_per_minute; the pool's limits replace Fred's while it is set.
+                from full_fred.api_key import ApiKeyPool
+                fred = Fred(key_pool=ApiKeyPool(env_vars=["FRED_KEY_A", "FRED_KEY_B"], requests_per_minute=120))
+                fred.key_pool.stats()
 
         Accessing Fetched Data
         ----------------------
@@ -35,6 +58,10 @@ class Fred(Maps):
         category_stack for category requests, tag_stack for tag requests, etc. Each stack is a dictionary with method names for keys and the retrieved
         data for values. For example, after calling fred.get_tags(), fred.tag_stack["get_tags"] will return the data FRED web service responded with,
         until a new get_tags method invocation is made or you pop "get_tags".
+        A long-running process can bound what the stacks keep with fred.set_stack_limits: keep nothing
+        (enabled=False), only the most recent entries (max_entries), at most a number of bytes (max_bytes),
+        or only data the caller still references (weak=True). Methods return their own results, so threads can share
+        one Fred; with fred.set_stack_limits(thread_local=True) each thread also reads back its own stack entries.
 
         Setting Realtime, Observation Start/End Defaults
         -------------------------
@@ -49,6 +76,48 @@ class Fred(Maps):
         All queries that include observation_start as a parameter will use whatever fred.observation_start is set to if no observation_start argument is given. If
         fred.observation_start is set to None, FRED web service will determine the default value. In cases where observation_start isn't specified FRED
         web service will use '1776-07-04', and '9999-12-31' for fred.observation_end.
+
+        Connection Pooling
+        ------------------
+        All methods share one pooled, keep-alive HTTP session owned by the Fred instance, so
+        repeated queries reuse open connections to FRED instead of paying a new TCP and TLS
+        handshake each time.
+        pool_connections: number of per-host connection pools to cache.
+        pool_maxsize: maximum number of connections kept open per host. Raise it to match the
+        number of threads sharing one Fred.
+        keep_alive: if False, connections are closed after every response.
+        To change these later: fred.set_session_params(pool_maxsize=32)
+        fred.close() releases pooled connections; Fred can also be used as a context manager.
+
+        Rate Limiting
+        -------------
+        FRED allows about 120 requests per minute per api key. Requests from all methods, threads
+        and asyncio tasks sharing a Fred pass through one token bucket so parallel work runs at
+        the highest rate FRED sustains instead of being refused with HTTP 429.
+        requests_per_minute: the sustained request rate; None disables rate limiting.
+        burst: the number of requests that can be sent back to back after a pause.
+        To change these later: fred.set_rate_limit(requests_per_minute=60, burst=5)
+
+        Retries
+        -------
+        Requests that fail with a connection error or HTTP status 429, 500, 502, 503 or 504 are
+        sent again, up to max_attempts times in all, waiting with exponential backoff and jitter
+        between attempts or as long as FRED's Retry-After header asks. A transient outage in a
+        long crawl then costs a short wait instead of silently missing data.
+        max_attempts: total attempts per request; None or 1 disables retries.
+        Backoff can be tuned with fred.set_retry_policy(max_attempts, backoff_base, backoff_max, jitter)
+        timeout: seconds to wait for a connection or for data before an attempt is abandoned and retried;
+        None waits indefinitely. To change it later: fred.set_timeout(60)
+
+        Response Cache
+        --------------
+        cache: an optional full_fred.cache.ResponseCache. When set, responses are cached under their
+        request URL with the api key stripped, and a repeated query is answered from the cache until its
+        endpoint's TTL runs out. Every call returns a fresh copy, so stacks and DataFrames built from a
+        cached response can be modified freely.
+            from full_fred.cache import MemoryCache
+            fred = Fred(cache=MemoryCache(max_bytes=256 * 2**20, ttls={"fred/series": 86400}))
+            fred.cache.stats()
         """
         super().__init__()
         if api_key_file is not None:
@@ -57,3 +126,13 @@ class Fred(Maps):
             self.api_key_file = api_key_file
         self.observation_start = observation_start
         self.observation_end = observation_end
+        self.set_session_params(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+        )
+        self.set_rate_limit(requests_per_minute=requests_per_minute, burst=burst)
+        self.set_retry_policy(max_attempts=max_attempts)
+        self.set_timeout(timeout)
+        self.cache = cache
+        self.set_api_key_pool(key_pool)
@@ -1,7 +1,61 @@
-from requests.exceptions import RequestException
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ChunkedEncodingError, RequestException
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+from .api_key import ApiKeyFile, ApiKeyPool
+from .cache import canonical_url
+from .rate_limiter import TokenBucket
+from .retry import RetryPolicy
+from .stacks import Result, ResultStack
 import requests
+import contextvars
+import itertools
+import threading
+import inspect
+import time
 import os
 
+_preparing_requests = contextvars.ContextVar("_preparing_requests", default=False)
+# set while fetching many series at once, whose failures are collected and
+# returned rather than printed
+_quiet_failures = contextvars.ContextVar("_quiet_failures", default=False)
+
+# largest limit FRED accepts per endpoint method; 1_000 if not listed
+_PAGE_SIZES = {
+    "get_series_df": 100_000,
+    "get_series_vintagedates": 10_000,
+    "get_release_dates": 10_000,
+}
+
+_RETRY_AFTER_TOO_LONG = (
+    "FRED asked to retry after more than retry_after_max, not retrying"
+)
+
+
+def _report_failure(message: str):
+    """
+    Print message, why a request failed, unless failures are collected.
+    """
+    if not _quiet_failures.get():
+        print(message)
+
+
+class _RequestPrepared(Exception):
+    """
+    Raised by _fetch_data and _fetch_geo_data in place of sending a request
+    while FredBase._prepare_request is running an endpoint method.
+    """
+
+    def __init__(
+        self,
+        url_prefix: str,
+        geo: bool = False,
+    ):
+        super().__init__(url_prefix)
+        self.url_prefix = url_prefix
+        self.geo = geo
+
 
 class FredBase:
     def __init__(
@@ -17,6 +71,22 @@ class FredBase:
         self.observation_start = None
         self.observation_end = None
         self.__url_base = "https://api.stlouisfed.org/fred/"
+        self.pool_connections = 10
+        self.pool_maxsize = 10
+        self.pool_block = False
+        self.keep_alive = True
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.rate_limiter = None
+        self.set_rate_limit(requests_per_minute=120, burst=10)
+        self.retry_policy = None
+        self.set_retry_policy()
+        self.timeout = None
+        self.set_timeout()
+        self.cache = None
+        self.api_key_check_interval = 60.0
+        self._api_key_holder = None
+        self.key_pool = None
         if api_key_file is not None:
             self.set_api_key_file(api_key_file)
         else:
@@ -33,28 +103,296 @@ class FredBase:
     def set_api_key_file(
         self,
         api_key_file: str,
+        check_interval: float = 60.0,
     ) -> bool:
         """
-        Return True if api_key_file has been found.
+        Return True if api_key_file has been found. The key is read from it
+        once and held in memory; every check_interval seconds at most the
+        file is checked for changes and read again if it has changed, so
+        a rotated key is picked up. 0 checks before every request, None
+        never re-reads the file.
         """
         if not os.path.isfile(api_key_file):
             e = "Can't find %s on path" % api_key_file
             raise FileNotFoundError(e)
         self.api_key_file = api_key_file
+        self.api_key_check_interval = check_interval
+        self._api_key_holder = None
         return True
 
+    def set_api_key_pool(
+        self,
+        key_pool: ApiKeyPool,
+    ) -> bool:
+        """
+        Send requests with the keys of key_pool, an ApiKeyPool, in place of
+        FRED_API_KEY or api_key_file. Each key is rate limited on its own by
+        the pool, so fred.rate_limiter isn't used while a pool is set. None
+        goes back to the single key. Return True once the pool is in place.
+        """
+        self.key_pool = key_pool
+        return True
+
+    def set_session_params(
+        self,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = None,
+        keep_alive: bool = None,
+    ) -> bool:
+        """
+        Configure the pooled HTTP session used for every request to FRED.
+        Arguments left as None keep their current value. The current session,
+        if any, is closed so the next request opens one with the new settings.
+
+        Parameters
+        ----------
+        pool_connections: int, default None
+            The number of per-host connection pools to cache.
+        pool_maxsize: int, default None
+            The maximum number of connections kept open per host. Raise this
+            when sharing one Fred across many threads.
+        pool_block: bool, default None
+            If True, a request waits for a free connection when pool_maxsize
+            connections to a host are busy instead of opening a throwaway one.
+        keep_alive: bool, default None
+            If False, connections are closed after each response.
+
+        Returns
+        -------
+        bool
+            True once the new settings are in place.
+        """
+        params = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "keep_alive": keep_alive,
+        }
+        for k, v in params.items():
+            if v is not None:
+                setattr(self, k, v)
+        self.close()
+        return True
+
+    def set_rate_limit(
+        self,
+        requests_per_minute: float = 120,
+        burst: int = 10,
+    ) -> bool:
+        """
+        Limit how fast requests are sent to FRED. The limit is shared by every
+        method, fred/ and geofred/ alike, and by all threads and asyncio tasks
+        using this instance, so parallel crawls stay under FRED's per-key quota
+        (120 requests per minute) instead of being answered with HTTP 429.
+
+        Parameters
+        ----------
+        requests_per_minute: float, default 120
+            The sustained request rate. If None, requests are not limited.
+        burst: int, default 10
+            The number of requests that can be sent back to back after a
+            pause. Within any minute at most requests_per_minute + burst
+            requests are sent.
+
+        Returns
+        -------
+        bool
+            True once the new limit is in place.
+        """
+        if requests_per_minute is None:
+            self.rate_limiter = None
+        else:
+            self.rate_limiter = TokenBucket(requests_per_minute / 60, burst)
+        return True
+
+    def set_retry_policy(
+        self,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_after_max: float = 300.0,
+    ) -> bool:
+        """
+        Retry requests that fail with a connection error or HTTP status 429,
+        500, 502, 503 or 504, waiting with exponential backoff and jitter
+        between attempts, or as long as FRED's Retry-After header asks. Only
+        GET requests, all FRED web service uses, are retried.
+
+        Parameters
+        ----------
+        max_attempts: int, default 5
+            The total number of times a request is sent, the first included.
+            If None or 1, failed requests are not retried.
+        backoff_base: float, default 0.5
+            Seconds to wait after the first failure, doubling per failure.
+        backoff_max: float, default 30.0
+            The longest wait between attempts, Retry-After aside.
+        jitter: bool, default True
+            If True, waits are drawn uniformly from [0, backoff].
+        retry_after_max: float, default 300.0
+            The longest Retry-After honored. A response asking for a longer
+            wait is returned as it is, not retried. None honors any wait.
+
+        Returns
+        -------
+        bool
+            True once the new policy is in place.
+        """
+        if max_attempts is None or max_attempts == 1:
+            self.retry_policy = None
+        else:
+            self.retry_policy = RetryPolicy(
+                max_attempts=max_attempts,
+                backoff_base=backoff_base,
+                backoff_max=backoff_max,
+                jitter=jitter,
+                retry_after_max=retry_after_max,
+            )
+        return True
+
+    def set_timeout(
+        self,
+        timeout: float = 30.0,
+    ) -> bool:
+        """
+        Give up on an attempt to reach FRED after timeout seconds without
+        connecting or without receiving data, and retry it per
+        fred.retry_policy, so a stalled connection can't hang a crawl.
+
+        Parameters
+        ----------
+        timeout: float, default 30.0
+            Seconds to wait for a connection and for each read of the
+            response. If None, wait indefinitely.
+
+        Returns
+        -------
+        bool
+            True once the new timeout is in place.
+        """
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.timeout = timeout
+        return True
+
+    def set_stack_limits(
+        self,
+        enabled: bool = True,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak: bool = False,
+        thread_local: bool = False,
+    ) -> bool:
+        """
+        Limit what category_stack, release_stack, series_stack, source_stack,
+        tag_stack and maps_stack keep of the data methods retrieved, so that
+        a long-running process doesn't hold the last response of every
+        method it ever called. Methods return their data either way.
+
+        Parameters
+        ----------
+        enabled: bool, default True
+            If False, the stacks keep nothing.
+        max_entries: int, default None
+            The most entries each stack keeps, evicting the least recently
+            used. If None, no limit.
+        max_bytes: int, default None
+            The most bytes of data each stack keeps, by estimate, evicting
+            the least recently used entries; data larger than max_bytes,
+            such as a big shape file, isn't kept. If None, no limit.
+        weak: bool, default False
+            If True, the stacks hold weak references: an entry stays
+            accessible only as long as the caller keeps the returned data.
+        thread_local: bool, default False
+            If True, each thread sees only the entries stored by its own
+            calls, so threads sharing one Fred can read back the metadata
+            of their own requests, e.g. series_stack["get_series_df"].
+
+        Returns
+        -------
+        bool
+            True once every stack follows the new limits.
+
+        Examples
+        --------
+        >>> fred.set_stack_limits(max_bytes=16 * 2**20)
+        True
+        >>> fred.set_stack_limits(enabled=False)
+        True
+        """
+        for value in vars(self).values():
+            if isinstance(value, ResultStack):
+                value.configure(enabled, max_entries, max_bytes, weak, thread_local)
+        return True
+
+    def _get_session(self) -> requests.Session:
+        """
+        Return the session shared by all request methods, creating it on
+        first use so that a Fred instance that never queries opens no sockets.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        pool_block=self.pool_block,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    if not self.keep_alive:
+                        session.headers["Connection"] = "close"
+                    self._session = session
+        return self._session
+
+    def close(self):
+        """
+        Close the pooled session and release its connections. A later
+        request transparently opens a new session.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _read_api_key_file(
         self,
     ) -> str:
         """
-        Read FRED api key from file. This method exists to minimize the
-        time that the user's API key is human-readable
+        Return the FRED api key on the first line of api_key_file. The file
+        is read once and then only when it changes; see ApiKeyFile.
         """
-        try:
-            with open(self.api_key_file, "r") as key_file:
-                return key_file.readline().strip()
-        except FileNotFoundError as e:
-            print(e)
+        holder = self._api_key_holder
+        if holder is None or holder.path != self.api_key_file:
+            holder = ApiKeyFile(self.api_key_file, self.api_key_check_interval)
+            self._api_key_holder = holder
+        return holder.get()
+
+    def _api_key(self) -> str:
+        """
+        Return the api key to send, from FRED_API_KEY or api_key_file as
+        _viable_api_key decides, or None if it has gone missing.
+        """
+        key_to_use = self._viable_api_key()
+        if key_to_use == "pool":
+            # appended per attempt by _send_request, see ApiKeyPool
+            return ""
+        if key_to_use == "env":
+            try:
+                return os.environ["FRED_API_KEY"]
+            except KeyError as sans:
+                print(sans, " no longer found in environment")
+                return
+        return self._read_api_key_file()
 
     def env_api_key_found(self) -> bool:
         """
@@ -158,7 +496,10 @@ class FredBase:
             attribute: user has set self.__api_key attribute
             env: it's an environment variable
             file: user has specified a file holding the key
+            pool: user has set an ApiKeyPool
         """
+        if self.key_pool is not None:
+            return "pool"
         if self.api_key_file is None:
             if not self.env_api_key_found():
                 raise AttributeError("Cannot locate a FRED API key")
@@ -172,20 +513,16 @@ class FredBase:
         """
         Return the url that can be used to retrieve the desired data given var_url.
         """
-        key_to_use = self._viable_api_key()
+        api_key = self._api_key()
+        if api_key is None:
+            return
         url_base = [
             self.__url_base,
             var_url,
             "&file_type=json&api_key=",
+            api_key,
         ]
-        base = "".join(url_base)
-        if key_to_use == "env":
-            try:
-                return base + os.environ["FRED_API_KEY"]
-            except KeyError as sans:
-                print(sans, " no longer found in environment")
-        if key_to_use == "file":
-            return base + self._read_api_key_file()
+        return "".join(url_base)
 
     def _fetch_data(
         self,
@@ -194,27 +531,345 @@ class FredBase:
         """
         Make request URL, send it to FRED, return JSON upshot
         """
+        if _preparing_requests.get():
+            raise _RequestPrepared(url_prefix)
+        cached = self._read_cache(url_prefix)
+        if cached is not None:
+            return Result(cached)
         url = self._make_request_url(url_prefix)
         json_data = self._get_response(url)
         if json_data is None:
             # never print api key in message for security
             message = "Data could not be retrieved, returning None"
-            print(message)
+            _report_failure(message)
             return
-        return json_data
+        self._write_cache(url_prefix, json_data)
+        return Result(json_data)
+
+    def _fetch_stream(
+        self,
+        url_prefix: str,
+    ) -> requests.Response:
+        """
+        Make request URL, send it to FRED and return the response with its
+        body not yet read, for parsing as it downloads. The caller closes it.
+        """
+        if _preparing_requests.get():
+            raise _RequestPrepared(url_prefix)
+        url = self._make_request_url(url_prefix)
+        response = self._send_request(url, stream=True)
+        if response is None:
+            # never print api key in message for security
+            message = "Data could not be retrieved, returning None"
+            _report_failure(message)
+        return response
+
+    def _cache_key(
+        self,
+        url_prefix: str,
+        geo: bool = False,
+    ) -> str:
+        service = "geofred/" if geo else "fred/"
+        return canonical_url(service + url_prefix)
+
+    def _read_cache(
+        self,
+        url_prefix: str,
+        geo: bool = False,
+    ) -> dict:
+        """
+        Return the response cached for url_prefix, or None if there is none
+        or no cache is set.
+        """
+        if self.cache is None:
+            return
+        return self.cache.get(self._cache_key(url_prefix, geo))
+
+    def _write_cache(
+        self,
+        url_prefix: str,
+        json_data: dict,
+        geo: bool = False,
+    ):
+        """
+        Cache json_data as the response to url_prefix. FRED error responses
+        are never cached.
+        """
+        if self.cache is None or "error_code" in json_data:
+            return
+        self.cache.set(self._cache_key(url_prefix, geo), json_data)
+
+    def _prepare_request(
+        self,
+        method,
+        *args,
+        **kwargs,
+    ) -> _RequestPrepared:
+        """
+        Run the endpoint function method, e.g. Fred.get_a_series, on self with
+        args and kwargs up to the point where it would send its request, and
+        return the prepared request instead. Nothing is sent and no stack is
+        modified, which lets other transports reuse each method's URL building.
+        """
+        token = _preparing_requests.set(True)
+        try:
+            method(self, *args, **kwargs)
+        except _RequestPrepared as prepared:
+            return prepared
+        finally:
+            _preparing_requests.reset(token)
+        raise ValueError("%s does not send a request to FRED" % method.__name__)
 
     def _get_response(self, a_url: str) -> dict:
         """
         Return a JSON dictionary response with data retrieved from a_url
         """
+        response = self._send_request(a_url)
+        if response is None:
+            return
         try:
-            response = requests.get(a_url)
             return response.json()
-        except RequestException:
-            return
         except ValueError:
             return
 
+    def _send_request(
+        self,
+        a_url: str,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        GET a_url through the pooled session, waiting for the rate limiter
+        before each attempt and retrying per fred.retry_policy. With a
+        key_pool set, each attempt instead waits for and is sent with the
+        pool key available soonest. Connection errors, timeouts and
+        responses cut short are retried; any other error, such as a bad URL,
+        is not. Return the last response, or None if no attempt got one.
+        """
+        if a_url is None:
+            # no api key to build the url with, already reported
+            return
+        attempt = 0
+        while True:
+            attempt += 1
+            url = a_url
+            if self.key_pool is not None:
+                url = a_url + self.key_pool.acquire()
+            elif self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self._get_session().get(
+                    url, stream=stream, timeout=self.timeout
+                )
+            except (RequestsConnectionError, Timeout, ChunkedEncodingError):
+                if not self._should_retry(attempt):
+                    return
+                time.sleep(self.retry_policy.delay(attempt))
+                continue
+            except RequestException as e:
+                # never print the url, it holds the api key
+                _report_failure("Request could not be sent: %s" % type(e).__name__)
+                return
+            if not self._should_retry(attempt, response.status_code):
+                return response
+            retry_after = response.headers.get("Retry-After")
+            delay = self.retry_policy.delay(attempt, retry_after)
+            if delay is None:
+                _report_failure(_RETRY_AFTER_TOO_LONG)
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def _should_retry(
+        self,
+        attempt: int,
+        status: int = None,
+    ) -> bool:
+        if self.retry_policy is None:
+            return False
+        return self.retry_policy.should_retry(attempt, status)
+
+    def get_all_pages(
+        self,
+        method_name: str,
+        *args,
+        max_results: int = None,
+        max_workers: int = 4,
+        **kwargs,
+    ):
+        """
+        Call the method method_name with args and kwargs as many times as it
+        takes to retrieve every result, not just the first page of up to
+        1,000 (100,000 observations for get_series_df). The first page tells
+        how many results there are; the remaining pages are fetched
+        concurrently and merged in order.
+
+        Parameters
+        ----------
+        method_name: str
+            The name of a method taking limit and offset arguments, e.g.
+            "search_for_series", "get_series_on_a_release", "get_all_tags".
+        *args, **kwargs:
+            Arguments for method_name, except limit. An offset argument sets
+            where the first page starts.
+        max_results: int, default None
+            The most results to retrieve. If None, all of them.
+        max_workers: int, default 4
+            The most pages requested at once. 0 requests them one by one.
+
+        Returns
+        -------
+        dict or pd.DataFrame
+            The first page's response with its list of results, e.g.
+            "seriess" or "tags", extended by every other page's.
+            A pd.DataFrame of all observations for get_series_df.
+
+        See Also
+        --------
+        fred.iter_pages: Lazily iterate over the pages of results.
+
+        Examples
+        --------
+        >>> results = fred.get_all_pages("search_for_series", ["unemployment"])
+        >>> results["count"] == len(results["seriess"])
+        True
+        """
+        pages = self._iter_pages(
+            method_name,
+            *args,
+            max_results=max_results,
+            max_workers=max_workers,
+            **kwargs,
+        )
+        merged = next(pages)
+        list_key = self._results_key(merged)
+        for page in pages:
+            merged[list_key].extend(page[list_key])
+        merged["limit"] = len(merged[list_key])
+        if method_name == "get_series_df":
+            series_id = args[0] if args else kwargs["series_id"]
+            typed = kwargs.get("typed", False)
+            date_index = kwargs.get("date_index", False)
+            return self._series_df_from_response(
+                series_id, merged, typed=typed, date_index=date_index
+            )
+        return merged
+
+    def iter_pages(
+        self,
+        method_name: str,
+        *args,
+        max_results: int = None,
+        max_workers: int = 4,
+        page_size: int = None,
+        **kwargs,
+    ):
+        """
+        Lazily yield each page of results of method_name, in order, as
+        get_all_pages would merge them: each page is the response dict
+        FRED returned. Up to max_workers pages are fetched ahead of the one
+        being consumed, page_size results at a time (by default the most
+        FRED allows); with max_workers 0 each page is only requested once
+        the one before it has been consumed.
+
+        Examples
+        --------
+        >>> for page in fred.iter_pages("get_all_tags", order_by="popularity"):
+        ...     write_tags(page["tags"])
+        """
+        return self._iter_pages(
+            method_name,
+            *args,
+            max_results=max_results,
+            max_workers=max_workers,
+            page_size=page_size,
+            **kwargs,
+        )
+
+    def _iter_pages(
+        self,
+        method_name: str,
+        *args,
+        max_results: int = None,
+        max_workers: int = 4,
+        page_size: int = None,
+        **kwargs,
+    ):
+        """
+        The generator behind iter_pages, which the package's own paginating
+        methods use so that AsyncFred's iter_pages doesn't replace it.
+        """
+        if "limit" in kwargs:
+            raise TypeError("limit is set by the paginator; use max_results")
+        if max_workers < 0:
+            raise ValueError("max_workers must be at least 0")
+        method = inspect.unwrap(getattr(type(self), method_name))
+        if page_size is None:
+            page_size = _PAGE_SIZES.get(method_name, 1_000)
+        start = kwargs.pop("offset", None) or 0
+        if max_results is not None:
+            page_size = max(1, min(page_size, max_results))
+
+        def fetch_page(offset: int) -> dict:
+            page_kwargs = dict(kwargs, offset=offset, limit=page_size)
+            prepared = self._prepare_request(method, *args, **page_kwargs)
+            if prepared.geo:
+                page = self._fetch_geo_data(prepared.url_prefix)
+            else:
+                page = self._fetch_data(prepared.url_prefix)
+            if page is None or "error_code" in page:
+                message = "Data could not be retrieved"
+                if page is not None:
+                    message = page.get("error_message", message)
+                raise RuntimeError("Page at offset %d: %s" % (offset, message))
+            return page
+
+        def trimmed(offset: int, page: dict) -> dict:
+            results = page[self._results_key(page)]
+            overshoot = offset + len(results) - end
+            if overshoot > 0:
+                results[len(results) - overshoot :] = []
+            return page
+
+        first = fetch_page(start)
+        end = first.get("count", 0)
+        if max_results is not None:
+            end = min(end, start + max_results)
+        offsets = iter(range(start + page_size, end, page_size))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            # the next pages download while the caller handles the first
+            pending = [
+                (o, pool.submit(fetch_page, o))
+                for o in itertools.islice(offsets, max_workers)
+            ]
+            try:
+                yield trimmed(start, first)
+                while True:
+                    if pending:
+                        offset, future = pending.pop(0)
+                        page = future.result()
+                        for o in itertools.islice(offsets, 1):
+                            pending.append((o, pool.submit(fetch_page, o)))
+                    else:
+                        # nothing fetched ahead: the next page, if any, now
+                        offset = next(offsets, None)
+                        if offset is None:
+                            break
+                        page = fetch_page(offset)
+                    yield trimmed(offset, page)
+            finally:
+                # an abandoned iteration doesn't wait on pages not yet sent
+                for _, future in pending:
+                    future.cancel()
+
+    def _results_key(self, page: dict) -> str:
+        """
+        Return the key of the list of results in a paginated response.
+        """
+        for k, v in page.items():
+            if isinstance(v, list):
+                return k
+        raise KeyError("No list of results in response")
+
     def _append_id_to_url(
         self,
         a_url_prefix: str,
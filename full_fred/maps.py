@@ -1,4 +1,5 @@
-import os
+from .fred_base import _preparing_requests, _RequestPrepared
+from .stacks import Result, ResultStack
 from .tags import Tags
 
 
@@ -12,26 +13,27 @@ class Maps(Tags):
         """
         super().__init__()
         self.__geo_url_base = "https://api.stlouisfed.org/geofred/"
-        self.maps_stack = dict()
+        self.maps_stack = ResultStack()
 
     def _make_geo_request_url(self, var_url: str) -> str:
-        key_to_use = self._viable_api_key()
-        base = self.__geo_url_base + var_url + "&file_type=json&api_key="
-        if key_to_use == "env":
-            try:
-                return base + os.environ["FRED_API_KEY"]
-            except KeyError as e:
-                print(e, " no longer found in environment")
-        if key_to_use == "file":
-            return base + self._read_api_key_file()
+        api_key = self._api_key()
+        if api_key is None:
+            return
+        return self.__geo_url_base + var_url + "&file_type=json&api_key=" + api_key
 
     def _fetch_geo_data(self, url_prefix: str) -> dict:
+        if _preparing_requests.get():
+            raise _RequestPrepared(url_prefix, geo=True)
+        cached = self._read_cache(url_prefix, geo=True)
+        if cached is not None:
+            return Result(cached)
         url = self._make_geo_request_url(url_prefix)
         json_data = self._get_response(url)
         if json_data is None:
             print("Data could not be retrieved, returning None")
             return
-        return json_data
+        self._write_cache(url_prefix, json_data, geo=True)
+        return Result(json_data)
 
     def get_geo_series_group(
         self,
@@ -69,8 +71,9 @@ class Maps(Tags):
         url_prefix = self._append_id_to_url(
             "series/group?series_id=", a_str_id=series_id
         )
-        self.maps_stack["get_geo_series_group"] = self._fetch_geo_data(url_prefix)
-        return self.maps_stack["get_geo_series_group"]
+        data = self._fetch_geo_data(url_prefix)
+        self.maps_stack["get_geo_series_group"] = data
+        return data
 
     def get_geo_series(
         self,
@@ -119,8 +122,9 @@ class Maps(Tags):
             "&start_date=": start_date,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.maps_stack["get_geo_series"] = self._fetch_geo_data(url)
-        return self.maps_stack["get_geo_series"]
+        data = self._fetch_geo_data(url)
+        self.maps_stack["get_geo_series"] = data
+        return data
 
     def get_regional_data(
         self,
@@ -194,8 +198,9 @@ class Maps(Tags):
             "&season=": season,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.maps_stack["get_regional_data"] = self._fetch_geo_data(url)
-        return self.maps_stack["get_regional_data"]
+        data = self._fetch_geo_data(url)
+        self.maps_stack["get_regional_data"] = data
+        return data
 
     def get_shape_files(
         self,
@@ -229,8 +234,7 @@ class Maps(Tags):
         ...}}, ...]}
         """
         self._viable_api_key()
-        url_prefix = self._append_id_to_url(
-            "shapes/file?shape=", a_str_id=shape
-        )
-        self.maps_stack["get_shape_files"] = self._fetch_geo_data(url_prefix)
-        return self.maps_stack["get_shape_files"]
+        url_prefix = self._append_id_to_url("shapes/file?shape=", a_str_id=shape)
+        data = self._fetch_geo_data(url_prefix)
+        self.maps_stack["get_shape_files"] = data
+        return data
@@ -0,0 +1,214 @@
+import functools
+import codecs
+import json
+import re
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = ("date", "realtime_start", "realtime_end")
+_ARRAY_START = re.compile(r'"observations"\s*:\s*\[')
+_SKIP = re.compile(r"[\s,]*")
+
+
+def typed_columns(
+    observations: list,
+    names: list = None,
+) -> dict:
+    """
+    Convert a list of observation dicts into a dict of NumPy columns: date
+    columns parsed straight into datetime64[s], every other column cast to
+    float64 with FRED's missing-value marker "." as NaN.
+    """
+    if names is None:
+        names = list(observations[0]) if observations else ["date", "value"]
+    columns = dict()
+    for name in names:
+        column = [o.get(name, ".") for o in observations]
+        if name in DATE_COLUMNS:
+            dates = np.array(column, dtype="datetime64[D]")
+            columns[name] = dates.astype("datetime64[s]")
+            continue
+        values = np.array(column, dtype=object)
+        values[values == "."] = "nan"
+        try:
+            columns[name] = values.astype(np.float64)
+        except ValueError:
+            columns[name] = pd.to_numeric(values, errors="coerce").astype(np.float64)
+    return columns
+
+
+def typed_frame(
+    columns: dict,
+    date_index: bool = False,
+) -> pd.DataFrame:
+    """
+    Wrap typed columns in a DataFrame without copying them, indexed by date
+    if date_index is True.
+    """
+    df = pd.DataFrame(columns, copy=False)
+    if date_index and "date" in df.columns:
+        df = df.set_index("date")
+    return df
+
+
+def wide_panel(
+    frames: dict,
+    how: str = "outer",
+) -> pd.DataFrame:
+    """
+    Align the typed observation DataFrames in frames, series_id -> frame
+    with date and value columns, into one DataFrame indexed by date with a
+    float64 column per series. how="outer" keeps every date of any series,
+    how="inner" only dates every series has. The values are written
+    straight into a single preallocated array instead of merging frames
+    pairwise.
+    """
+    if how not in ("outer", "inner"):
+        raise ValueError('how must be "outer" or "inner"')
+    dates = [df["date"].to_numpy() for df in frames.values()]
+    if not dates:
+        index = np.array([], dtype="datetime64[s]")
+    elif how == "outer":
+        index = np.unique(np.concatenate(dates))
+    else:
+        index = functools.reduce(np.intersect1d, dates)
+    # one row per series so that each series is a contiguous write; the
+    # transpose hands pandas its column-major block without a copy
+    values = np.full((len(frames), len(index)), np.nan)
+    for row, (series_dates, df) in enumerate(zip(dates, frames.values())):
+        positions = np.searchsorted(index, series_dates)
+        found = positions < len(index)
+        found[found] = index[positions[found]] == series_dates[found]
+        values[row, positions[found]] = df["value"].to_numpy()[found]
+    return pd.DataFrame(
+        values.T,
+        index=pd.DatetimeIndex(index, name="date"),
+        columns=list(frames),
+        copy=False,
+    )
+
+
+class ObservationStreamParser:
+    def __init__(
+        self,
+        batch_size: int = 8192,
+    ):
+        """
+        Incremental parser of a series/observations JSON response. Feed it
+        the response body chunk by chunk; the complete observations in each
+        chunk are decoded and converted, batch_size at a time, into typed
+        column arrays, so the full response text and the list of observation
+        dicts never exist at once. Peak memory tracks the size of the final columns.
+
+        Examples
+        --------
+        >>> parser = ObservationStreamParser()
+        >>> for chunk in response.iter_content(65536):
+        ...     parser.feed(chunk)
+        >>> metadata, columns = parser.close()
+        """
+        self.batch_size = batch_size
+        self.metadata = dict()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "header"
+        self._batch = list()
+        self._names = None
+        self._chunks = dict()
+
+    def feed(self, data: bytes):
+        """
+        Parse as much of the response as data completes.
+        """
+        self._buffer += self._decoder.decode(data)
+        if self._state == "header":
+            self._parse_header()
+        if self._state == "items":
+            self._parse_items()
+
+    def close(self) -> tuple:
+        """
+        Finish parsing and return (metadata, columns): metadata holds every
+        key of the response except observations, columns maps each
+        observation field to a NumPy array.
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        if self._state == "header":
+            # no observations array, e.g. an error response
+            self.metadata = json.loads(self._buffer)
+            return self.metadata, None
+        if self._state == "items":
+            self._parse_items()
+        if self._state != "trailer":
+            raise ValueError("Response ended inside the observations array")
+        trailer = self._buffer.strip()
+        if trailer.startswith(","):
+            trailer = trailer[1:]
+        self.metadata.update(json.loads("{" + trailer))
+        self._flush()
+        names = self._names if self._names is not None else ["date", "value"]
+        columns = dict()
+        for name in names:
+            chunks = self._chunks.get(name)
+            if chunks:
+                columns[name] = np.concatenate(chunks)
+            else:
+                columns.update(typed_columns([], [name]))
+        self._chunks = dict()
+        return self.metadata, columns
+
+    def _parse_header(self):
+        match = _ARRAY_START.search(self._buffer)
+        if match is None:
+            return
+        header = self._buffer[: match.start()].rstrip()
+        if header.endswith(","):
+            header = header[:-1]
+        self.metadata = json.loads(header + "}")
+        self._buffer = self._buffer[match.end() :]
+        self._state = "items"
+
+    def _parse_items(self):
+        buffer = self._buffer
+        position = _SKIP.match(buffer).end()
+        # fast path: decode every complete observation in one json.loads
+        last = buffer.rfind("}")
+        if last > position:
+            try:
+                observations = json.loads("[" + buffer[position : last + 1] + "]")
+            except json.JSONDecodeError:
+                # a "}" inside a string; fall back to one at a time
+                observations = None
+            if observations is not None:
+                self._batch.extend(observations)
+                if len(self._batch) >= self.batch_size:
+                    self._flush()
+                position = last + 1
+        while True:
+            position = _SKIP.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                position += 1
+                self._state = "trailer"
+                break
+            try:
+                observation, end = self._json.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # observation is incomplete until the next chunk arrives
+                break
+            position = end
+            self._batch.append(observation)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+        self._buffer = buffer[position:]
+
+    def _flush(self):
+        if not self._batch:
+            return
+        if self._names is None:
+            self._names = list(self._batch[0])
+        for name, column in typed_columns(self._batch, self._names).items():
+            self._chunks.setdefault(name, list()).append(column)
+        self._batch = list()
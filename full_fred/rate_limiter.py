@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+    ):
+        """
+        Thread-safe and asyncio-safe token bucket. Tokens accrue at rate per
+        second up to burst; each request takes one. When the bucket is empty a
+        request reserves the next token to accrue and waits for it, so callers
+        are served in the order they arrive and never exceed the rate.
+
+        Parameters
+        ----------
+        rate: float
+            The sustained number of requests allowed per second.
+        burst: int, default 1
+            The number of requests that can be sent back to back after the
+            bucket has been idle.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available, and return the
+        number of seconds to wait before the token is due.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def available_in(self) -> float:
+        """
+        Return the number of seconds until a token is available, 0.0 if
+        one is now, without taking it.
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            return max(0.0, (1 - tokens) / self.rate)
+
+    def acquire(self) -> float:
+        """
+        Block the calling thread until a request may be sent. Return the
+        number of seconds waited.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Wait, without blocking the event loop, until a request may be sent.
+        Return the number of seconds waited.
+        """
+        import asyncio
+
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
@@ -1,11 +1,12 @@
 from .categories import Categories
+from .stacks import ResultStack
 
 
 class Releases(Categories):
     def __init__(self):
         """"""
         super().__init__()
-        self.release_stack = dict()
+        self.release_stack = ResultStack()
 
     def get_all_releases(
         self,
@@ -89,8 +90,9 @@ class Releases(Categories):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_all_releases"] = self._fetch_data(url)
-        return self.release_stack["get_all_releases"]
+        data = self._fetch_data(url)
+        self.release_stack["get_all_releases"] = data
+        return data
 
     def get_release_dates_all_releases(
         self,
@@ -179,8 +181,9 @@ class Releases(Categories):
             "&include_release_dates_with_no_data": include_empty,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_release_dates_all_releases"] = self._fetch_data(url)
-        return self.release_stack["get_release_dates_all_releases"]
+        data = self._fetch_data(url)
+        self.release_stack["get_release_dates_all_releases"] = data
+        return data
 
     def get_a_release(
         self,
@@ -243,8 +246,9 @@ class Releases(Categories):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_a_release"] = self._fetch_data(url)
-        return self.release_stack["get_a_release"]
+        data = self._fetch_data(url)
+        self.release_stack["get_a_release"] = data
+        return data
 
     def get_release_dates(
         self,
@@ -335,8 +339,9 @@ class Releases(Categories):
             "&include_release_dates_with_no_data=": include_empty,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_release_dates"] = self._fetch_data(url)
-        return self.release_stack["get_release_dates"]
+        data = self._fetch_data(url)
+        self.release_stack["get_release_dates"] = data
+        return data
 
     def get_series_on_a_release(
         self,
@@ -461,8 +466,9 @@ class Releases(Categories):
             "&exclude_tag_names=": exclude_tag_names,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_series_on_a_release"] = self._fetch_data(url)
-        return self.release_stack["get_series_on_a_release"]
+        data = self._fetch_data(url)
+        self.release_stack["get_series_on_a_release"] = data
+        return data
 
     def get_sources_for_a_release(
         self,
@@ -525,8 +531,9 @@ class Releases(Categories):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_sources_for_a_release"] = self._fetch_data(url)
-        return self.release_stack["get_sources_for_a_release"]
+        data = self._fetch_data(url)
+        self.release_stack["get_sources_for_a_release"] = data
+        return data
 
     def get_tags_for_a_release(
         self,
@@ -633,8 +640,9 @@ class Releases(Categories):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.release_stack["get_tags_for_a_release"] = self._fetch_data(url)
-        return self.release_stack["get_tags_for_a_release"]
+        data = self._fetch_data(url)
+        self.release_stack["get_tags_for_a_release"] = data
+        return data
 
     def get_related_tags_for_release(
         self,
@@ -745,8 +753,9 @@ class Releases(Categories):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args_plus_tag_names)
-        self.release_stack["get_related_tags_for_release"] = self._fetch_data(url)
-        return self.release_stack["get_related_tags_for_release"]
+        data = self._fetch_data(url)
+        self.release_stack["get_related_tags_for_release"] = data
+        return data
 
     def get_release_tables(
         self,
@@ -823,5 +832,6 @@ class Releases(Categories):
             "&observation_date=": observation_date,
         }
         url = self._add_optional_params(url_prefix, optional_args_plus_tag_names)
-        self.release_stack["get_release_tables"] = self._fetch_data(url)
-        return self.release_stack["get_release_tables"]
+        data = self._fetch_data(url)
+        self.release_stack["get_release_tables"] = data
+        return data
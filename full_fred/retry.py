@@ -0,0 +1,101 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import random
+
+
+class RetryPolicy:
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RETRY_METHODS = frozenset({"GET"})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_after_max: float = 300.0,
+    ):
+        """
+        When and how long to wait before resending a failed request. Only
+        idempotent GET requests are retried, after a connection error or a
+        response with status 429 (too many requests) or 500, 502, 503, 504.
+
+        Parameters
+        ----------
+        max_attempts: int, default 5
+            The total number of times a request is sent, the first included.
+        backoff_base: float, default 0.5
+            Seconds to wait after the first failure. The wait doubles with
+            each further failure.
+        backoff_max: float, default 30.0
+            The longest wait between attempts, Retry-After headers aside.
+        jitter: bool, default True
+            If True, each wait is drawn uniformly from [0, backoff] ("full
+            jitter") so that many clients failing at once don't retry in lockstep.
+        retry_after_max: float, default 300.0
+            The longest wait a Retry-After header is honored for. A response
+            asking for longer isn't retried, so a crawl fails rather than
+            stalls. None honors any wait.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_after_max = retry_after_max
+
+    def should_retry(
+        self,
+        attempt: int,
+        status: int = None,
+        method: str = "GET",
+    ) -> bool:
+        """
+        Whether a request that failed on attempt (counting from 1) should be
+        sent again. status is the response's HTTP status, None after a
+        connection error.
+        """
+        if method.upper() not in self.RETRY_METHODS:
+            return False
+        if attempt >= self.max_attempts:
+            return False
+        return status is None or status in self.RETRY_STATUSES
+
+    def delay(
+        self,
+        attempt: int,
+        retry_after: str = None,
+    ) -> float:
+        """
+        Seconds to wait after attempt failed. A Retry-After header value,
+        in seconds or as an HTTP date, takes precedence over backoff; None
+        if it asks for longer than retry_after_max, and the request should
+        not be retried.
+        """
+        server_delay = self._parse_retry_after(retry_after)
+        if server_delay is not None:
+            if self.retry_after_max is not None:
+                if server_delay > self.retry_after_max:
+                    return
+            return server_delay
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str) -> float:
+        if retry_after is None:
+            return
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
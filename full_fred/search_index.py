@@ -0,0 +1,443 @@
+import re
+import numpy as np
+from .catalog import CATALOG_FIELDS
+
+# the catalog fields full_text searches match words of
+FULL_TEXT_FIELDS = ("id", "title", "units", "frequency", "seasonal_adjustment")
+
+FILTER_VARIABLES = ("frequency", "units", "seasonal_adjustment")
+
+# order_by values other than search_rank, and the catalog field each sorts by
+ORDER_FIELDS = {
+    "series_id": "id",
+    "title": "title",
+    "units": "units",
+    "frequency": "frequency",
+    "seasonal_adjustment": "seasonal_adjustment",
+    "last_updated": "last_updated",
+    "observation_start": "observation_start",
+    "observation_end": "observation_end",
+    "popularity": "popularity",
+    "group_popularity": "group_popularity",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def words(text: str) -> list:
+    """
+    Split text into the lowercase stems full_text matches on: runs of
+    letters and digits with a plural ending dropped, so "Industries"
+    matches "industry" and "Rates" matches "rate".
+    """
+    return [_stem(word) for word in _WORD.findall(text.lower())]
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+class _InvertedIndex:
+    """
+    Word -> sorted row numbers of the rows containing it, held as one
+    array of row numbers and the offsets of each word's run in it.
+    """
+
+    def __init__(self, texts: list):
+        postings = dict()
+        stems = dict()
+        for row, text in enumerate(texts):
+            found = set()
+            for word in _WORD.findall(text.lower()):
+                # a catalog repeats few distinct words many times
+                stem = stems.get(word)
+                if stem is None:
+                    stem = stems[word] = _stem(word)
+                found.add(stem)
+            for word in found:
+                postings.setdefault(word, list()).append(row)
+        vocabulary = sorted(postings)
+        self.vocabulary = np.array(vocabulary, dtype=object)
+        lengths = [len(postings[word]) for word in vocabulary]
+        self.offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.rows = np.fromiter(
+            (row for word in vocabulary for row in postings[word]),
+            dtype=np.int32,
+            count=int(self.offsets[-1]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    def rows_with(self, word: str) -> np.ndarray:
+        i = np.searchsorted(self.vocabulary, word)
+        if i == len(self.vocabulary) or self.vocabulary[i] != word:
+            return np.empty(0, dtype=np.int32)
+        return self.rows[self.offsets[i] : self.offsets[i + 1]]
+
+    def rows_with_prefix(self, prefix: str) -> np.ndarray:
+        first = np.searchsorted(self.vocabulary, prefix)
+        last = np.searchsorted(self.vocabulary, prefix + "\U0010ffff")
+        if first == last:
+            return np.empty(0, dtype=np.int32)
+        rows = self.rows[self.offsets[first] : self.offsets[last]]
+        if last - first == 1:
+            return rows
+        return np.unique(rows)
+
+
+class _SortedStrings:
+    """
+    strings, with the rows of those starting with a prefix found by binary
+    search.
+    """
+
+    def __init__(self, strings: list):
+        self.strings = strings
+        self.order = np.array(
+            sorted(range(len(strings)), key=strings.__getitem__), dtype=np.int32
+        )
+        self.sorted = np.array(
+            [strings[row] for row in self.order.tolist()], dtype=object
+        )
+
+    def rows_with_prefix(self, prefix: str) -> np.ndarray:
+        first = np.searchsorted(self.sorted, prefix)
+        last = np.searchsorted(self.sorted, prefix + "\U0010ffff")
+        return np.sort(self.order[first:last])
+
+
+class SearchIndex:
+    def __init__(
+        self,
+        catalog,
+        notes: bool = False,
+    ):
+        """
+        An offline stand-in for fred.search_for_series over a local series
+        catalog, such as one written by CatalogMirror. Building it takes an
+        inverted index of the catalog's words and the series ids; after that
+        a search is a few array intersections and sorts, answered in
+        milliseconds without a request, so it suits autocomplete.
+
+        Parameters
+        ----------
+        catalog: pd.DataFrame or dict
+            A catalog with the columns of CATALOG_FIELDS, as returned by
+            CatalogMirror.run or load_catalog, or a dict of column name -> list.
+        notes: bool, default False
+            If True, full_text also matches words of the series' notes. The
+            index is then several times larger.
+
+        See Also
+        --------
+        full_fred.catalog.CatalogMirror: Mirror every series' metadata locally.
+
+        Examples
+        --------
+        >>> index = SearchIndex(load_catalog("fred_catalog"))
+        >>> index.search_for_series(["unemployment", "rate"], limit=10)
+        >>> index.search_for_series("unemp", prefix=True, order_by="popularity")
+        >>> index.search_for_series("*SL", search_type="series_id",
+        ...     filter_variable="frequency", filter_value="Monthly")
+        """
+        if hasattr(catalog, "to_dict"):
+            catalog = {
+                field: [_none_if_missing(v) for v in catalog[field].tolist()]
+                for field in CATALOG_FIELDS
+            }
+        self.columns = {field: list(catalog[field]) for field in CATALOG_FIELDS}
+        for field in ("popularity", "group_popularity"):
+            self.columns[field] = [
+                int(v) if v is not None else None for v in self.columns[field]
+            ]
+        self.notes = notes
+        fields = FULL_TEXT_FIELDS + (("notes",) if notes else ())
+        texts = [
+            " ".join(v for v in values if v)
+            for values in zip(*(self.columns[field] for field in fields))
+        ]
+        self._words = _InvertedIndex(texts)
+        self._title_words = _InvertedIndex([v or "" for v in self.columns["title"]])
+        # series_id searches: ids sorted forwards and backwards for anchored
+        # patterns, and every id on a line of its own for substrings
+        ids = [(v or "").upper() for v in self.columns["id"]]
+        self._ids = _SortedStrings(ids)
+        self._reversed_ids = _SortedStrings([v[::-1] for v in ids])
+        self._id_lines = "\n".join(ids)
+        self._line_starts = np.zeros(len(ids), dtype=np.int64)
+        if ids:
+            np.cumsum([len(v) + 1 for v in ids[:-1]], out=self._line_starts[1:])
+        self._ranks = dict()
+        self._filters = dict()
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: str,
+        notes: bool = False,
+    ):
+        """
+        Build a SearchIndex of the catalog a CatalogMirror wrote to directory.
+        """
+        from .catalog import load_catalog
+
+        return cls(load_catalog(directory), notes)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __repr__(self) -> str:
+        return "SearchIndex(%d series, %d words)" % (len(self), len(self._words))
+
+    def search_for_series(
+        self,
+        search_words,
+        search_type: str = None,
+        limit: int = None,
+        offset: int = None,
+        order_by: str = None,
+        sort_order: str = None,
+        filter_variable: str = None,
+        filter_value: str = None,
+        prefix: bool = False,
+    ) -> dict:
+        """
+        Get the series of the catalog that match search_words, the way
+        fred.search_for_series does.
+
+        Parameters
+        ----------
+        search_words: list or str
+            Words to match against economic data series.
+        search_type: str, default None
+            full_text:
+                Series whose id, title, units, frequency or seasonal
+                adjustment (and notes, if indexed) contain every word, in
+                singular or plural form.
+            series_id:
+                Substring search of series' IDs. "*" anchors a search and
+                matches any characters: "EX*" finds IDs starting with EX,
+                "*EX" ending with EX, "M*SL" starting with M and ending with SL.
+            If None, 'full_text' is used.
+        limit: int, default None
+            The maximum number of results to return. If None, 1_000.
+        offset: int, default None
+            Non-negative integer. If None, offset of 0 is used.
+        order_by: str, default None
+            "search_rank" or one of ORDER_FIELDS. search_rank puts series
+            whose title holds every word first, then more popular series.
+            If None and search_type is full_text, "search_rank" is used.
+            If None and search_type is series_id, "series_id" is used.
+        sort_order: str, default None
+            "asc" or "desc".
+            If None and order_by is "popularity", "group_popularity" or
+            "search_rank", "desc" is used, else "asc".
+        filter_variable: str, default None
+            One of "frequency", "units", "seasonal_adjustment".
+        filter_value: str, default None
+            The value filter_variable must equal, e.g. "Monthly".
+        prefix: bool, default False
+            If True, the last of search_words matches any word it begins,
+            for searching as a user types. full_text only.
+
+        Returns
+        -------
+        dict
+            count, offset, limit, order_by, sort_order and seriess, the
+            metadata of each matching series, like FRED's response.
+        """
+        if search_type is None:
+            search_type = "full_text"
+        if isinstance(search_words, str):
+            search_words = [search_words]
+        text = " ".join(search_words)
+        if search_type == "full_text":
+            rows = self._full_text_rows(text, prefix)
+        elif search_type == "series_id":
+            rows = self._series_id_rows(text)
+        else:
+            raise ValueError("search_type must be 'full_text' or 'series_id'")
+        if filter_variable is not None:
+            rows = np.intersect1d(
+                rows,
+                self._filter_rows(filter_variable, filter_value),
+                assume_unique=True,
+            )
+        if order_by is None:
+            order_by = "search_rank" if search_type == "full_text" else "series_id"
+        if sort_order is None:
+            descending = ("search_rank", "popularity", "group_popularity")
+            sort_order = "desc" if order_by in descending else "asc"
+        if sort_order not in ("asc", "desc"):
+            raise ValueError("sort_order must be 'asc' or 'desc'")
+        rows = self._ordered(rows, order_by, text)
+        if sort_order == "desc":
+            rows = rows[::-1]
+        limit = 1_000 if limit is None else limit
+        offset = 0 if offset is None else offset
+        page = rows[offset : offset + limit]
+        return {
+            "order_by": order_by,
+            "sort_order": sort_order,
+            "count": len(rows),
+            "offset": offset,
+            "limit": limit,
+            "seriess": [self._record(row) for row in page.tolist()],
+        }
+
+    def _record(self, row: int) -> dict:
+        return {field: self.columns[field][row] for field in CATALOG_FIELDS}
+
+    def _full_text_rows(
+        self,
+        text: str,
+        prefix: bool,
+    ) -> np.ndarray:
+        """
+        Return the sorted rows holding every word of text.
+        """
+        raw_words = _WORD.findall(text.lower())
+        if not raw_words:
+            return np.arange(len(self), dtype=np.int32)
+        matches = [self._words.rows_with(_stem(word)) for word in raw_words]
+        if prefix:
+            last = raw_words[-1]
+            matches[-1] = self._words.rows_with_prefix(last)
+            if _stem(last) != last:
+                matches[-1] = np.union1d(
+                    matches[-1], self._words.rows_with_prefix(_stem(last))
+                )
+        # intersecting the rarest words first keeps the arrays short
+        matches.sort(key=len)
+        rows = matches[0]
+        for more in matches[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, more, assume_unique=True)
+        return rows
+
+    def _series_id_rows(self, pattern: str) -> np.ndarray:
+        """
+        Return the sorted rows whose id matches pattern; see search_for_series.
+        """
+        pattern = pattern.strip().upper()
+        parts = pattern.split("*")
+        if len(parts) == 1:
+            return self._rows_containing(pattern)
+        # narrow down by the anchored ends, each a binary search
+        rows = None
+        if parts[0]:
+            rows = self._ids.rows_with_prefix(parts[0])
+        if parts[-1]:
+            ending = self._reversed_ids.rows_with_prefix(parts[-1][::-1])
+            rows = (
+                ending
+                if rows is None
+                else np.intersect1d(rows, ending, assume_unique=True)
+            )
+        if rows is None:
+            rows = self._rows_containing(max(parts, key=len))
+        if len(parts) > 2 or (parts[0] and parts[-1]):
+            # the ends may overlap, and middle parts must appear in order
+            expression = re.compile(
+                ".*".join(re.escape(part) for part in parts), re.DOTALL
+            )
+            ids = self._ids.strings
+            rows = rows[
+                [expression.fullmatch(ids[row]) is not None for row in rows.tolist()]
+            ]
+        return rows.astype(np.int32)
+
+    def _rows_containing(self, text: str) -> np.ndarray:
+        """
+        Return the sorted rows whose id contains text.
+        """
+        starts = [m.start() for m in re.finditer(re.escape(text), self._id_lines)]
+        rows = np.searchsorted(self._line_starts, starts, "right") - 1
+        return np.unique(rows).astype(np.int32)
+
+    def _filter_rows(
+        self,
+        filter_variable: str,
+        filter_value: str,
+    ) -> np.ndarray:
+        if filter_variable not in FILTER_VARIABLES:
+            raise ValueError(
+                "filter_variable must be one of %s" % ", ".join(FILTER_VARIABLES)
+            )
+        key = (filter_variable, filter_value)
+        if key not in self._filters:
+            values = self.columns[filter_variable]
+            self._filters[key] = np.array(
+                [row for row, v in enumerate(values) if v == filter_value],
+                dtype=np.int32,
+            )
+        return self._filters[key]
+
+    def _ordered(
+        self,
+        rows: np.ndarray,
+        order_by: str,
+        text: str,
+    ) -> np.ndarray:
+        """
+        Return rows in ascending order_by order.
+        """
+        if order_by == "search_rank":
+            in_title = np.isin(rows, self._full_text_title_rows(text))
+            ranks = self._rank("popularity")[rows]
+            return rows[np.lexsort((ranks, in_title))]
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(
+                "order_by must be one of %s"
+                % ", ".join(("search_rank",) + tuple(ORDER_FIELDS))
+            )
+        return rows[np.argsort(self._rank(ORDER_FIELDS[order_by])[rows], kind="stable")]
+
+    def _full_text_title_rows(self, text: str) -> np.ndarray:
+        rows = None
+        for word in words(text):
+            found = self._title_words.rows_with(word)
+            rows = (
+                found
+                if rows is None
+                else np.intersect1d(rows, found, assume_unique=True)
+            )
+        return rows if rows is not None else np.empty(0, dtype=np.int32)
+
+    def _rank(self, field: str) -> np.ndarray:
+        """
+        Return the position of every row when sorted by field, ascending
+        with missing values first, computed once per field.
+        """
+        if field not in self._ranks:
+            values = self.columns[field]
+            order = sorted(
+                range(len(values)),
+                key=lambda row: (
+                    (False,) if values[row] is None else (True, values[row])
+                ),
+            )
+            ranks = np.empty(len(values), dtype=np.int32)
+            ranks[order] = np.arange(len(values), dtype=np.int32)
+            self._ranks[field] = ranks
+        return self._ranks[field]
+
+
+def _none_if_missing(value):
+    """
+    Return None for a pandas missing value (NaN, None, pd.NA), else value.
+    """
+    try:
+        if value is None or value != value:
+            return None
+    except TypeError:
+        # pd.NA has no truth value
+        return None
+    return value
@@ -1,6 +1,14 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from .fred_base import _quiet_failures
 from .releases import Releases
-import pandas as pd
+from .stacks import Frames, Result, ResultStack
 from datetime import datetime
+import json
+import time
+
+# pandas, NumPy and the modules built on them are imported by the methods
+# that use them, so that import full_fred.fred stays fast for metadata work
 
 
 class Series(Releases):
@@ -13,7 +21,8 @@ class Series(Releases):
         For a pd.DataFrame of a series use get_series_df
         """
         super().__init__()
-        self.series_stack = dict()
+        self.series_stack = ResultStack()
+        self._series_tails = dict()
 
     def get_a_series(
         self,
@@ -82,8 +91,9 @@ class Series(Releases):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_a_series"] = self._fetch_data(url)
-        return self.series_stack["get_a_series"]
+        data = self._fetch_data(url)
+        self.series_stack["get_a_series"] = data
+        return data
 
     def get_categories_of_series(
         self,
@@ -140,8 +150,9 @@ class Series(Releases):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_categories_of_series"] = self._fetch_data(url)
-        return self.series_stack["get_categories_of_series"]
+        data = self._fetch_data(url)
+        self.series_stack["get_categories_of_series"] = data
+        return data
 
     def get_series_df(
         self,
@@ -158,6 +169,9 @@ class Series(Releases):
         aggregation_method: str = None,
         output_type: int = None,
         vintage_dates: list = None,
+        typed: bool = False,
+        date_index: bool = False,
+        stream: bool = False,
     ) -> pd.DataFrame:
         """
         Get the observations, the data values, for an economic data
@@ -255,12 +269,26 @@ class Series(Releases):
             Specifying vintage_dates can be a substitute for specifying a realtime period.
             For more on vintage_dates, see the URL in the Notes section below.
             If None, no vintage dates are set.
+        typed: bool, default False
+            If True, build typed columns directly from the response: date,
+            realtime_start and realtime_end as datetime64[s], values as
+            float64 with FRED's missing-value marker "." as NaN. Faster and
+            several times smaller than the default columns of str.
+        date_index: bool, default False
+            If True, and typed is True, index the DataFrame by date.
+        stream: bool, default False
+            If True, parse the response incrementally as it downloads
+            straight into typed columns (implies typed=True). Peak memory
+            stays near the size of the final DataFrame instead of several
+            times it, which matters for full-vintage pulls of tens of MB.
+            Streamed responses bypass fred.cache.
 
         Returns
         -------
         pd.DataFrame
-            DataFrame of requested observations. Metadata regarding
-            the series is accessible with: f.series_stack['get_series_df']
+            DataFrame of requested observations. Metadata regarding the
+            series is in its attrs, and accessible with:
+            f.series_stack['get_series_df']
 
         See Also
         --------
@@ -330,20 +358,825 @@ class Series(Releases):
             "&vintage_dates=": vintage_dates,
         }
         url = self._add_optional_params(url_prefix, optional_args)
+        if stream:
+            return self._stream_series_df(series_id, url, date_index)
         df_and_metadata = self._fetch_data(url)
-        self.series_stack["get_series_df"] = df_and_metadata
-        self.series_stack["get_series_df"]["series_id"] = series_id
+        return self._series_df_from_response(
+            series_id, df_and_metadata, typed=typed, date_index=date_index
+        )
+
+    def _series_df_from_response(
+        self,
+        series_id: str,
+        df_and_metadata: dict,
+        method_name: str = "get_series_df",
+        typed: bool = False,
+        date_index: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Store the series/observations response df_and_metadata in
+        series_stack[method_name] with its observations replaced by a
+        pd.DataFrame, and return the DataFrame with the rest of the response
+        in its attrs. Return None if there is no response to store.
+        """
+        if df_and_metadata is None:
+            return
+        df_and_metadata["series_id"] = series_id
         try:
-            df = pd.DataFrame(df_and_metadata["observations"])
+            observations = df_and_metadata.pop("observations")
         except KeyError as e:
-            if "error_code" in self.series_stack["get_series_df"].keys():
-                error_message = self.series_stack["get_series_df"]["error_message"]
+            if "error_code" in df_and_metadata.keys():
+                error_message = df_and_metadata["error_message"]
                 print(f"Error Message: {error_message}")
             else:
                 print(e)
-        self.series_stack["get_series_df"].pop("observations")
-        self.series_stack["get_series_df"]["df"] = df
-        return self.series_stack["get_series_df"]["df"]
+            self.series_stack[method_name] = df_and_metadata
+            raise
+        if typed:
+            df = self._typed_observations_df(observations, date_index)
+        else:
+            import pandas as pd
+
+            df = pd.DataFrame(observations)
+        return self._store_series_df(method_name, df_and_metadata, df)
+
+    def _store_series_df(
+        self,
+        method_name: str,
+        metadata: dict,
+        df: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """
+        Put the response metadata in df.attrs and df in metadata, then store
+        metadata in series_stack[method_name] and return df.
+        """
+        df.attrs.update(metadata)
+        metadata["df"] = df
+        # stored only once complete, so other threads never see it half built
+        self.series_stack[method_name] = metadata
+        return df
+
+    def _typed_observations_df(
+        self,
+        observations: list,
+        date_index: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Build a DataFrame of observations column by column: date columns are
+        parsed by NumPy straight into datetime64, value columns cast to
+        float64 with "." as NaN, skipping the object-dtype intermediate frame.
+        Works for every output_type, whose value columns may be named after
+        vintages.
+        """
+        from .observations import typed_columns, typed_frame
+
+        return typed_frame(typed_columns(observations), date_index)
+
+    def _stream_series_df(
+        self,
+        series_id: str,
+        url_prefix: str,
+        date_index: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Send the series/observations request url_prefix and parse the
+        response body as it arrives into typed columns, then store the
+        metadata and DataFrame in series_stack["get_series_df"] like
+        _series_df_from_response and return the DataFrame.
+        """
+        from .observations import ObservationStreamParser, typed_frame
+
+        response = self._fetch_stream(url_prefix)
+        if response is None:
+            return
+        parser = ObservationStreamParser()
+        try:
+            with response:
+                for chunk in response.iter_content(chunk_size=65536):
+                    parser.feed(chunk)
+            metadata, columns = parser.close()
+        except ValueError:
+            # not JSON, e.g. an HTML error page
+            print("Data could not be retrieved, returning None")
+            return
+        metadata = Result(metadata)
+        if columns is None:
+            # an error response: reported and raised as without streaming
+            return self._series_df_from_response(series_id, metadata)
+        metadata["series_id"] = series_id
+        df = typed_frame(columns, date_index)
+        return self._store_series_df("get_series_df", metadata, df)
+
+    def transform_series_df(
+        self,
+        df: pd.DataFrame,
+        units: str,
+        frequency: str = None,
+    ) -> pd.DataFrame:
+        """
+        Apply one of FRED's data value transformations locally to the levels
+        of a series, as returned by get_series_df with units None or "lin",
+        so the same series in other units costs no further requests.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Observations of one vintage of a series, as returned by
+            get_series_df, typed or not, with or without a date index.
+        units: str
+            One of "lin", "chg", "ch1", "pch", "pc1", "pca", "cch", "cca",
+            "log"; see get_series_df.
+        frequency: str, default None
+            The series' frequency_short, e.g. "m" or "q", which sets the
+            number of observations per year that "ch1", "pc1", "pca" and
+            "cca" use. If None, inferred from the observation dates.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of df with every value column transformed to float64.
+
+        See Also
+        --------
+        Details of FRED's unit transformation: https://alfred.stlouisfed.org/help#growth_formulas
+
+        Examples
+        --------
+        >>> levels = fred.get_series_df("GDPC1", typed=True)
+        >>> growth = fred.transform_series_df(levels, "pca")
+        >>> year_over_year = fred.transform_series_df(levels, "pc1")
+        """
+        import numpy as np
+        import pandas as pd
+        from .observations import DATE_COLUMNS
+        from .transforms import transform
+
+        df = df.copy()
+        dates = df.index if "date" not in df.columns else df["date"]
+        dates = pd.to_datetime(dates, format="%Y-%m-%d").to_numpy()
+        if len(dates) and (np.diff(dates) <= np.timedelta64(0)).any():
+            raise ValueError(
+                "df must hold one vintage of a series in ascending date order"
+            )
+        for column in df.columns:
+            if column in DATE_COLUMNS:
+                continue
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(np.float64)
+            df[column] = transform(values, units, dates, frequency)
+        return df
+
+    def aggregate_series_df(
+        self,
+        df: pd.DataFrame,
+        frequency: str,
+        aggregation_method: str = "avg",
+    ) -> pd.DataFrame:
+        """
+        Aggregate a series fetched at its native frequency to a lower
+        frequency locally, as FRED does for the frequency and
+        aggregation_method arguments of get_series_df, so every aggregation
+        level of the same series costs no further requests.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Observations of one vintage of a series, as returned by
+            get_series_df, typed or not, with or without a date index.
+        frequency: str
+            The frequency to aggregate to; see get_series_df. Weekly periods
+            are labeled by their last day, longer ones by their first.
+            Biweekly frequencies aren't supported locally; request them
+            from FRED with get_series_df.
+        aggregation_method: str, default "avg"
+            "avg", "sum" or "eop" (end of period). Missing values are left
+            out of every period.
+
+        Returns
+        -------
+        pd.DataFrame
+            date and float64 value columns, a row per period.
+
+        Examples
+        --------
+        >>> daily = fred.get_series_df("DGS10", typed=True)
+        >>> weekly = fred.aggregate_series_df(daily, "weth")
+        >>> monthly_close = fred.aggregate_series_df(daily, "m", "eop")
+        """
+        import numpy as np
+        import pandas as pd
+        from .transforms import aggregate
+
+        dates = df.index if "date" not in df.columns else df["date"]
+        dates = pd.to_datetime(dates, format="%Y-%m-%d").to_numpy()
+        if len(dates) and (np.diff(dates) <= np.timedelta64(0)).any():
+            raise ValueError(
+                "df must hold one vintage of a series in ascending date order"
+            )
+        values = pd.to_numeric(df["value"], errors="coerce").to_numpy(np.float64)
+        labels, aggregated = aggregate(values, dates, frequency, aggregation_method)
+        return pd.DataFrame({"date": labels, "value": aggregated})
+
+    def iter_series_df(
+        self,
+        series_id: str,
+        realtime_start: str = None,
+        realtime_end: str = None,
+        sort_order: str = None,
+        observation_start: str = None,
+        observation_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method: str = None,
+        output_type: int = None,
+        vintage_dates: list = None,
+        chunk_size: int = 100_000,
+        max_results: int = None,
+        prefetch: int = 1,
+        typed: bool = False,
+        date_index: bool = False,
+    ):
+        """
+        Lazily yield the observations of a series as pd.DataFrame chunks of
+        up to chunk_size rows, one page of results each, in order. While a
+        chunk is being handled the next prefetch pages are downloaded in the
+        background, so a caller writing chunks to disk never holds more
+        than a few of them in memory, even for full real-time histories
+        that don't fit at once.
+
+        Parameters
+        ----------
+        series_id: str
+            The ID of the series.
+        realtime_start, realtime_end, sort_order, observation_start,
+        observation_end, units, frequency, aggregation_method, output_type,
+        vintage_dates, typed, date_index:
+            See fred.get_series_df.
+        chunk_size: int, default 100_000
+            Rows per chunk, at most 100_000.
+        max_results: int, default None
+            The most rows yielded in all. If None, every observation.
+        prefetch: int, default 1
+            The number of chunks downloaded ahead of the one being handled.
+            0 downloads each chunk only once it is asked for.
+
+        Returns
+        -------
+        generator of pd.DataFrame
+            Each chunk's response metadata is in its attrs; that of the
+            latest chunk is also accessible with:
+            f.series_stack['iter_series_df']
+
+        See Also
+        --------
+        fred.get_series_df: Get up to 100_000 observations in one DataFrame.
+        fred.iter_pages: Lazily iterate over the pages of any paginated method.
+
+        Examples
+        --------
+        >>> chunks = fred.iter_series_df("GDPC1", realtime_start="1776-07-04",
+        ...     output_type=1, typed=True)
+        >>> for i, chunk in enumerate(chunks):
+        ...     chunk.to_parquet(f"GDPC1/part-{i}.parquet")
+        """
+        if not 1 <= chunk_size <= 100_000:
+            raise ValueError("chunk_size must be in range(1, 100_001)")
+        pages = self._iter_pages(
+            "get_series_df",
+            series_id,
+            realtime_start=realtime_start,
+            realtime_end=realtime_end,
+            sort_order=sort_order,
+            observation_start=observation_start,
+            observation_end=observation_end,
+            units=units,
+            frequency=frequency,
+            aggregation_method=aggregation_method,
+            output_type=output_type,
+            vintage_dates=vintage_dates,
+            max_results=max_results,
+            max_workers=prefetch,
+            page_size=chunk_size,
+        )
+        for page in pages:
+            yield self._series_df_from_response(
+                series_id,
+                page,
+                method_name="iter_series_df",
+                typed=typed,
+                date_index=date_index,
+            )
+
+    def get_vintage_cube(
+        self,
+        series_id: str,
+        realtime_start: str = "1776-07-04",
+        realtime_end: str = "9999-12-31",
+        observation_start: str = None,
+        observation_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method: str = None,
+    ) -> VintageCube:
+        """
+        Get the real-time history of a series, every value each observation
+        date has had across ALFRED vintages, as a VintageCube: compact
+        interval arrays with vectorized "value as of vintage" lookups and a
+        dense observation date x vintage date matrix on demand.
+
+        Parameters
+        ----------
+        series_id: str
+            The ID of the series.
+        realtime_start: str, default "1776-07-04"
+            The start of the real-time period formatted as "YYYY-MM-DD".
+            By default the first vintage.
+        realtime_end: str, default "9999-12-31"
+            The end of the real-time period formatted as "YYYY-MM-DD".
+            By default the latest vintage.
+        observation_start, observation_end, units, frequency, aggregation_method:
+            See get_series_df.
+
+        Returns
+        -------
+        VintageCube
+            Also accessible with: f.series_stack['get_vintage_cube']
+
+        See Also
+        --------
+        fred.get_series_vintagedates: Get the dates the series was revised on.
+
+        Examples
+        --------
+        >>> cube = fred.get_vintage_cube("GDPC1")
+        >>> cube.as_of("2008-10-30")  # GDPC1 as published that day
+        >>> cube.to_frame()  # observation date x vintage date
+        """
+        cube = self._fetch_vintage_cube(
+            series_id,
+            realtime_start=realtime_start,
+            realtime_end=realtime_end,
+            observation_start=observation_start,
+            observation_end=observation_end,
+            units=units,
+            frequency=frequency,
+            aggregation_method=aggregation_method,
+        )
+        self.series_stack["get_vintage_cube"] = cube
+        return cube
+
+    def _fetch_vintage_cube(
+        self,
+        series_id: str,
+        **kwargs,
+    ) -> VintageCube:
+        """
+        Fetch every page of series_id's observations requested with kwargs,
+        see get_series_df, and return them as a VintageCube without touching
+        series_stack, so that many cubes can be fetched at once.
+        """
+        import numpy as np
+        from .observations import typed_columns
+        from .vintages import VintageCube
+
+        names = ["realtime_start", "realtime_end", "date", "value"]
+        chunks = {name: list() for name in names}
+        for page in self._iter_pages("get_series_df", series_id, **kwargs):
+            for name, column in typed_columns(page["observations"], names).items():
+                chunks[name].append(column)
+        columns = {name: np.concatenate(chunks[name]) for name in names}
+        return VintageCube(
+            columns["date"],
+            columns["realtime_start"],
+            columns["realtime_end"],
+            columns["value"],
+            series_id,
+        )
+
+    def refresh_series_df(
+        self,
+        series_id: str,
+        realtime_start: str = None,
+        realtime_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method: str = None,
+        revision_overlap: int = 5,
+    ) -> pd.DataFrame:
+        """
+        Get all observations of a series like get_series_df, downloading only
+        what's new since the last call. The first call fetches the whole
+        series and remembers it; later calls request observations from the
+        last revision_overlap observation dates onward and merge them into
+        the remembered observations, so a daily series decades long costs a
+        few rows per refresh instead of its whole history.
+
+        Observations are remembered per series_id, realtime period, units,
+        frequency and aggregation_method, the realtime period and
+        observation window including fred's defaults: in fred.cache if one
+        is set, so they persist with an SQLiteCache, otherwise on this Fred
+        instance. In fred.cache they share its max_bytes with responses and
+        may be evicted like them, after which the next call downloads the
+        whole series again.
+
+        Parameters
+        ----------
+        series_id: str
+            The ID of the series.
+        realtime_start, realtime_end, units, frequency, aggregation_method:
+            See get_series_df.
+        revision_overlap: int, default 5
+            The number of most recent remembered observation dates to fetch
+            again, picking up revisions to recent values. Revisions to older
+            values are only picked up by a full download, e.g. after
+            fred.forget_series_df(series_id). If realtime_end is in the past,
+            the remembered observations can't change and are returned
+            without a request.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame of all observations of the series. Metadata is in its
+            attrs, and accessible with: fred.series_stack["refresh_series_df"]
+
+        See Also
+        --------
+        fred.get_series_df: Get observations of a series with every option FRED offers.
+
+        Examples
+        --------
+        >>> fred.refresh_series_df("DGS10")  # downloads the full history
+        >>> fred.refresh_series_df("DGS10")  # downloads the last 5 observations
+        >>> fred.refresh_series_df("DGS10").attrs["new_observations"]
+        5
+        """
+        self._viable_api_key()
+        request_args = self._series_tail_args(
+            realtime_start, realtime_end, units, frequency, aggregation_method
+        )
+        tail_key = self._series_tail_key(series_id, request_args)
+        stored = self._load_series_tail(tail_key)
+        realtime_start = request_args["realtime_start"]
+        realtime_end = request_args["realtime_end"]
+        kept = list()
+        if stored is not None:
+            today = datetime.now().strftime("%Y-%m-%d")
+            if realtime_end is not None and realtime_end < today:
+                # a realtime period that has ended can no longer change
+                stored["new_observations"] = 0
+                return self._series_df_from_response(
+                    series_id, stored, "refresh_series_df"
+                )
+            dates = sorted({o["date"] for o in stored["observations"]})
+            if dates:
+                start = dates[max(0, len(dates) - revision_overlap)]
+                request_args["observation_start"] = start
+                kept = [o for o in stored["observations"] if o["date"] < start]
+        prepared = self._prepare_request(
+            Series.get_series_df, series_id, **request_args
+        )
+        # bypass the response cache: a stale cached response would be
+        # merged in and remembered as current
+        response = self._get_response(self._make_request_url(prepared.url_prefix))
+        if response is None:
+            print("Data could not be retrieved, returning None")
+            return
+        if "observations" not in response:
+            return self._series_df_from_response(
+                series_id, response, "refresh_series_df"
+            )
+        new_observations = response["observations"]
+        if realtime_start is None and realtime_end is None:
+            # today's realtime period: what's kept is still current today
+            for o in kept:
+                o["realtime_start"] = response["realtime_start"]
+                o["realtime_end"] = response["realtime_end"]
+        response["observations"] = kept + new_observations
+        response["count"] = len(response["observations"])
+        if stored is not None:
+            response["observation_start"] = stored["observation_start"]
+        self._store_series_tail(tail_key, response)
+        response["new_observations"] = len(new_observations)
+        return self._series_df_from_response(series_id, response, "refresh_series_df")
+
+    def forget_series_df(
+        self,
+        series_id: str,
+        realtime_start: str = None,
+        realtime_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method: str = None,
+    ) -> bool:
+        """
+        Forget the observations refresh_series_df remembers for series_id
+        and the given arguments, so the next refresh downloads the full
+        series. Return whether anything was forgotten.
+        """
+        request_args = self._series_tail_args(
+            realtime_start, realtime_end, units, frequency, aggregation_method
+        )
+        tail_key = self._series_tail_key(series_id, request_args)
+        if self.cache is not None:
+            return self.cache.delete(tail_key)
+        return self._series_tails.pop(tail_key, None) is not None
+
+    def _series_tail_args(
+        self,
+        realtime_start: str,
+        realtime_end: str,
+        units: str,
+        frequency: str,
+        aggregation_method: str,
+    ) -> dict:
+        """
+        Return the arguments refresh_series_df requests and remembers a
+        series under, with the realtime period and observation window of
+        this Fred's defaults where no argument is given, as they are sent.
+        """
+        if realtime_start is None:
+            realtime_start = self.realtime_start
+        if realtime_end is None:
+            realtime_end = self.realtime_end
+        return {
+            "realtime_start": realtime_start,
+            "realtime_end": realtime_end,
+            "observation_start": self.observation_start,
+            "observation_end": self.observation_end,
+            "units": units,
+            "frequency": frequency,
+            "aggregation_method": aggregation_method,
+        }
+
+    def _series_tail_key(
+        self,
+        series_id: str,
+        request_args: dict,
+    ) -> str:
+        params = ["series_id=%s" % series_id]
+        params += ["%s=%s" % (k, v) for k, v in sorted(request_args.items())]
+        return "incremental/series/observations?" + "&".join(params)
+
+    def _load_series_tail(self, tail_key: str) -> dict:
+        # through the cache's primitives, so refreshes don't count as cache
+        # hits or misses
+        if self.cache is not None:
+            data = self.cache._get(tail_key, time.time())
+            return json.loads(data) if data is not None else None
+        stored = self._series_tails.get(tail_key)
+        if stored is None:
+            return
+        return dict(stored, observations=list(map(dict, stored["observations"])))
+
+    def _store_series_tail(
+        self,
+        tail_key: str,
+        response: dict,
+    ):
+        if self.cache is not None:
+            data = json.dumps(response, separators=(",", ":")).encode()
+            self.cache._set(tail_key, data, float("inf"))
+            return
+        self._series_tails[tail_key] = dict(
+            response, observations=list(map(dict, response["observations"]))
+        )
+
+    def get_many_series_df(
+        self,
+        series_ids: list,
+        realtime_start: str = None,
+        realtime_end: str = None,
+        observation_start: str = None,
+        observation_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method: str = None,
+        output_type: int = None,
+        vintage_dates: list = None,
+        max_workers: int = 8,
+        long_format: bool = False,
+        typed: bool = False,
+    ):
+        """
+        Get the observations of many series concurrently. Each series is
+        requested as get_series_df would request it, using the same
+        arguments for every series, through a pool of max_workers threads.
+
+        Parameters
+        ----------
+        series_ids: list
+            The IDs of the series. Duplicates are fetched once.
+        realtime_start, realtime_end, observation_start, observation_end,
+        units, frequency, aggregation_method, output_type, vintage_dates:
+            Passed on to FRED for every series; see get_series_df.
+        max_workers: int, default 8
+            The maximum number of requests in flight at once. To keep every
+            worker on a pooled connection, fred.pool_maxsize should be at
+            least max_workers.
+        long_format: bool, default False
+            If True, return one pd.DataFrame with a series_id column instead
+            of a dict.
+        typed: bool, default False
+            If True, build datetime64 and float64 columns; see get_series_df.
+
+        Returns
+        -------
+        dict or pd.DataFrame
+            series_id -> pd.DataFrame of observations for every series that
+            was retrieved, in the order of series_ids, or their concatenation
+            if long_format is True. Series that could not be retrieved are
+            left out and reported, series_id -> error message, in
+            attrs["errors"] of the result, and in
+            fred.series_stack["get_many_series_df"]["errors"].
+
+        See Also
+        --------
+        fred.get_series_df: Get observations of one series.
+
+        Examples
+        --------
+        >>> dfs = fred.get_many_series_df(["GDP", "UNRATE", "NOT_A_SERIES"])
+        >>> list(dfs)
+        ['GDP', 'UNRATE']
+        >>> dfs.attrs["errors"]
+        {'NOT_A_SERIES': 'Bad Request.  The series does not exist.'}
+        """
+        self._viable_api_key()
+        series_ids = list(dict.fromkeys(series_ids))
+        shared_args = {
+            "realtime_start": realtime_start,
+            "realtime_end": realtime_end,
+            "observation_start": observation_start,
+            "observation_end": observation_end,
+            "units": units,
+            "frequency": frequency,
+            "aggregation_method": aggregation_method,
+            "output_type": output_type,
+            "vintage_dates": vintage_dates,
+        }
+
+        dfs, errors = self._fetch_many_observations(
+            series_ids, shared_args, max_workers, typed
+        )
+        result = Frames(dfs)
+        if long_format:
+            import pandas as pd
+
+            frames = [df.assign(series_id=k) for k, df in dfs.items()]
+            if frames:
+                result = pd.concat(frames, ignore_index=True)
+            else:
+                result = pd.DataFrame(columns=["series_id"])
+        result.attrs.update({"series_ids": series_ids, "errors": errors})
+        self.series_stack["get_many_series_df"] = Result(result.attrs, df=result)
+        return result
+
+    def get_series_panel(
+        self,
+        series_ids: list,
+        how: str = "outer",
+        observation_start: str = None,
+        observation_end: str = None,
+        realtime_start: str = None,
+        realtime_end: str = None,
+        units: str = None,
+        frequency: str = None,
+        aggregation_method=None,
+        max_workers: int = 8,
+    ) -> pd.DataFrame:
+        """
+        Get many series as one wide pd.DataFrame indexed by observation
+        date, with a float64 column of values per series. The series are
+        fetched concurrently like get_many_series_df and written into a
+        single preallocated array aligned on date, rather than merged one
+        by one.
+
+        Parameters
+        ----------
+        series_ids: list
+            The IDs of the series, in column order. Duplicates are fetched once.
+        how: str, default "outer"
+            "outer" keeps every date any series has, with NaN where a series
+            has no observation; "inner" keeps only dates all series share.
+        observation_start, observation_end, realtime_start, realtime_end, units:
+            Passed on to FRED for every series; see get_series_df. A realtime
+            period spanning several vintages of a series gives it several
+            observations per date, of which the panel keeps one.
+        frequency: str, default None
+            Harmonize the panel by having FRED aggregate every series to
+            this frequency, e.g. "m" or "q"; see get_series_df. Series that
+            can't be aggregated to it, such as quarterly series with
+            frequency="m", are reported as errors.
+        aggregation_method: str or dict, default None
+            "avg", "sum" or "eop" for every series, or a dict of
+            series_id -> method for some of them; see get_series_df.
+        max_workers: int, default 8
+            The maximum number of requests in flight at once.
+
+        Returns
+        -------
+        pd.DataFrame
+            Values of the series that were retrieved. Series that could not
+            be retrieved are left out and reported, series_id -> error
+            message, in the panel's attrs["errors"], and in
+            fred.series_stack["get_series_panel"]["errors"].
+
+        See Also
+        --------
+        fred.get_many_series_df: Get many series as separate DataFrames.
+
+        Examples
+        --------
+        >>> panel = fred.get_series_panel(
+        ...     ["UNRATE", "PAYEMS", "DGS10"], frequency="m",
+        ...     aggregation_method={"DGS10": "eop"}, how="inner")
+        >>> panel.columns.tolist()
+        ['UNRATE', 'PAYEMS', 'DGS10']
+        """
+        self._viable_api_key()
+        series_ids = list(dict.fromkeys(series_ids))
+        shared_args = {
+            "realtime_start": realtime_start,
+            "realtime_end": realtime_end,
+            "observation_start": observation_start,
+            "observation_end": observation_end,
+            "units": units,
+            "frequency": frequency,
+        }
+        per_series_args = None
+        if isinstance(aggregation_method, dict):
+            per_series_args = {
+                k: {"aggregation_method": v} for k, v in aggregation_method.items()
+            }
+        else:
+            shared_args["aggregation_method"] = aggregation_method
+        dfs, errors = self._fetch_many_observations(
+            series_ids, shared_args, max_workers, True, per_series_args
+        )
+        from .observations import wide_panel
+
+        panel = wide_panel(dfs, how)
+        panel.attrs.update({"series_ids": series_ids, "errors": errors})
+        self.series_stack["get_series_panel"] = Result(panel.attrs, df=panel)
+        return panel
+
+    def _fetch_many_observations(
+        self,
+        series_ids: list,
+        shared_args: dict,
+        max_workers: int,
+        typed: bool = False,
+        per_series_args: dict = None,
+    ) -> tuple:
+        """
+        Request the observations of every series in series_ids with
+        shared_args, updated by per_series_args[series_id] if given, through
+        a pool of max_workers threads. Return (series_id -> pd.DataFrame,
+        series_id -> error message), both in the order of series_ids.
+        """
+        if per_series_args is None:
+            per_series_args = dict()
+
+        def fetch_one(series_id: str) -> tuple:
+            args = dict(shared_args, **per_series_args.get(series_id, dict()))
+            prepared = self._prepare_request(Series.get_series_df, series_id, **args)
+            quiet = _quiet_failures.set(True)
+            try:
+                response = self._fetch_data(prepared.url_prefix)
+            finally:
+                _quiet_failures.reset(quiet)
+            return self._observations_df(response, typed)
+
+        dfs = dict()
+        errors = dict()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(fetch_one, series_ids)
+            for series_id, (df, error_message) in zip(series_ids, results):
+                if error_message is None:
+                    dfs[series_id] = df
+                else:
+                    errors[series_id] = error_message
+        return dfs, errors
+
+    def _observations_df(
+        self,
+        df_and_metadata: dict,
+        typed: bool = False,
+    ) -> tuple:
+        """
+        Return (pd.DataFrame of observations, None) for a series/observations
+        response, or (None, error message) if the response holds no observations.
+        """
+        if df_and_metadata is None:
+            return None, "Data could not be retrieved"
+        if "observations" not in df_and_metadata:
+            if "error_message" in df_and_metadata:
+                return None, df_and_metadata["error_message"]
+            return None, "Response has no observations"
+        if typed:
+            return self._typed_observations_df(df_and_metadata["observations"]), None
+        import pandas as pd
+
+        return pd.DataFrame(df_and_metadata["observations"]), None
 
     def get_release_for_a_series(
         self,
@@ -402,8 +1235,9 @@ class Series(Releases):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_release_for_a_series"] = self._fetch_data(url)
-        return self.series_stack["get_release_for_a_series"]
+        data = self._fetch_data(url)
+        self.series_stack["get_release_for_a_series"] = data
+        return data
 
     def search_for_series(
         self,
@@ -572,8 +1406,9 @@ class Series(Releases):
             "&exclude_tag_names=": exclude_tag_names,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["search_for_series"] = self._fetch_data(url)
-        return self.series_stack["search_for_series"]
+        data = self._fetch_data(url)
+        self.series_stack["search_for_series"] = data
+        return data
 
     def get_tags_for_series_search(
         self,
@@ -703,8 +1538,9 @@ class Series(Releases):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_tags_for_series_search"] = self._fetch_data(url)
-        return self.series_stack["get_tags_for_series_search"]
+        data = self._fetch_data(url)
+        self.series_stack["get_tags_for_series_search"] = data
+        return data
 
     def get_related_tags_for_series_search(
         self,
@@ -840,8 +1676,9 @@ class Series(Releases):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix1, optional_args)
-        self.series_stack["get_related_tags_for_series_search"] = self._fetch_data(url)
-        return self.series_stack["get_related_tags_for_series_search"]
+        data = self._fetch_data(url)
+        self.series_stack["get_related_tags_for_series_search"] = data
+        return data
 
     def get_tags_for_a_series(
         self,
@@ -921,8 +1758,9 @@ class Series(Releases):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_tags_for_a_series"] = self._fetch_data(url)
-        return self.series_stack["get_tags_for_a_series"]
+        data = self._fetch_data(url)
+        self.series_stack["get_tags_for_a_series"] = data
+        return data
 
     def get_series_updates(
         self,
@@ -1076,8 +1914,9 @@ class Series(Releases):
             "&end_time=": end_time,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_series_updates"] = self._fetch_data(url)
-        return self.series_stack["get_series_updates"]
+        data = self._fetch_data(url)
+        self.series_stack["get_series_updates"] = data
+        return data
 
     def get_series_vintagedates(
         self,
@@ -1158,5 +1997,6 @@ class Series(Releases):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.series_stack["get_series_vintagedates"] = self._fetch_data(url)
-        return self.series_stack["get_series_vintagedates"]
+        data = self._fetch_data(url)
+        self.series_stack["get_series_vintagedates"] = data
+        return data
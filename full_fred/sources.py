@@ -1,4 +1,5 @@
 from .series import Series
+from .stacks import ResultStack
 
 
 class Sources(Series):
@@ -8,7 +9,7 @@ class Sources(Series):
         Bank of Japan, Chicago Board Options Exchange, etc.
         """
         super().__init__()
-        self.source_stack = dict()
+        self.source_stack = ResultStack()
 
     def get_all_sources(
         self,
@@ -91,8 +92,9 @@ class Sources(Series):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.source_stack["get_all_sources"] = self._fetch_data(url)
-        return self.source_stack["get_all_sources"]
+        data = self._fetch_data(url)
+        self.source_stack["get_all_sources"] = data
+        return data
 
     def get_a_source(
         self,
@@ -152,8 +154,9 @@ class Sources(Series):
             "&realtime_end=": realtime_end,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.source_stack["get_a_source"] = self._fetch_data(url)
-        return self.source_stack["get_a_source"]
+        data = self._fetch_data(url)
+        self.source_stack["get_a_source"] = data
+        return data
 
     def get_releases_for_a_source(
         self,
@@ -244,5 +247,6 @@ class Sources(Series):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.source_stack["get_releases_for_a_source"] = self._fetch_data(url)
-        return self.source_stack["get_releases_for_a_source"]
+        data = self._fetch_data(url)
+        self.source_stack["get_releases_for_a_source"] = data
+        return data
@@ -0,0 +1,260 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import threading
+import weakref
+import sys
+
+
+class Result(dict):
+    """
+    A FRED response. A dict that can be weakly referenced, so that a
+    ResultStack with weak=True can hold it without keeping it alive.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class Frames(Result):
+    """
+    A dict of DataFrames, as returned by get_many_series_df, with attrs like
+    a DataFrame's holding what the call reports alongside them, such as
+    errors, so it stays with the data whatever the stacks keep.
+    """
+
+    __slots__ = ("attrs",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.attrs = dict()
+
+
+def size_of(value) -> int:
+    """
+    Estimate the bytes held by value: DataFrames and NumPy arrays by their
+    own accounting, dicts, lists and tuples by walking their contents.
+    """
+    total = 0
+    seen = set()
+    pending = [value]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if hasattr(obj, "memory_usage"):
+            usage = obj.memory_usage(deep=True)
+            total += int(usage.sum() if hasattr(usage, "sum") else usage)
+        elif hasattr(obj, "nbytes"):
+            total += int(obj.nbytes)
+        else:
+            total += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                pending.extend(obj.keys())
+                pending.extend(obj.values())
+            elif isinstance(obj, (list, tuple)):
+                pending.extend(obj)
+    return total
+
+
+class ResultStack(MutableMapping):
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak: bool = False,
+        thread_local: bool = False,
+    ):
+        """
+        Thread-safe mapping of method name -> the data that method last
+        retrieved, such as fred.series_stack. By default it behaves like a
+        dict; it can instead keep nothing, keep only the most recently
+        stored entries, keep entries only while the caller does, keep at
+        most a number of bytes of them, or keep them per thread.
+
+        Parameters
+        ----------
+        enabled: bool, default True
+            If False, nothing is stored.
+        max_entries: int, default None
+            The most entries kept; storing more evicts the least recently
+            used. If None, no limit.
+        max_bytes: int, default None
+            The most bytes of data kept, as estimated by size_of; storing
+            more evicts the least recently used entries, and data larger
+            than max_bytes is not stored. If None, entries aren't sized.
+        weak: bool, default False
+            If True, entries are held by weak reference and vanish once the
+            caller drops them. Data that can't be weakly referenced isn't stored.
+        thread_local: bool, default False
+            If True, every thread sees only the entries it stored itself, so
+            threads sharing a Fred each read back the results of their own
+            calls. The limits apply to each thread's entries.
+        """
+        self._lock = threading.RLock()
+        self._shared = (OrderedDict(), dict())
+        self._local = threading.local()
+        self.configure(enabled, max_entries, max_bytes, weak, thread_local)
+
+    def configure(
+        self,
+        enabled: bool = True,
+        max_entries: int = None,
+        max_bytes: int = None,
+        weak: bool = False,
+        thread_local: bool = False,
+    ):
+        """
+        Change the stack's policy, see ResultStack, dropping entries that
+        don't fit it. Switching weak or thread_local, or configuring a
+        thread_local stack, drops every entry.
+        """
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must be non-negative")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        with self._lock:
+            if (
+                not enabled
+                or thread_local
+                or weak != getattr(self, "weak", weak)
+                or thread_local != getattr(self, "thread_local", thread_local)
+            ):
+                self._shared = (OrderedDict(), dict())
+                self._local = threading.local()
+            self.enabled = enabled
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.weak = weak
+            self.thread_local = thread_local
+            entries, sizes = self._containers()
+            if max_bytes is not None:
+                for key in list(entries):
+                    if key not in sizes:
+                        sizes[key] = size_of(self._load(entries, key))
+            else:
+                sizes.clear()
+            self._evict(entries, sizes)
+
+    def _containers(self) -> tuple:
+        """
+        Return the (entries, sizes) dicts of the calling thread if the stack
+        is thread_local, else the shared ones.
+        """
+        if not self.thread_local:
+            return self._shared
+        containers = getattr(self._local, "containers", None)
+        if containers is None:
+            containers = (OrderedDict(), dict())
+            self._local.containers = containers
+        return containers
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Estimated bytes of the entries held, 0 if max_bytes is None.
+        """
+        with self._lock:
+            return sum(self._containers()[1].values())
+
+    def _load(
+        self,
+        entries: OrderedDict,
+        key: str,
+    ):
+        value = entries[key]
+        if self.weak:
+            value = value()
+        return value
+
+    def _evict(
+        self,
+        entries: OrderedDict,
+        sizes: dict,
+    ):
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and sum(sizes.values()) > self.max_bytes)
+        ):
+            key = next(iter(entries))
+            del entries[key]
+            sizes.pop(key, None)
+
+    def __setitem__(self, key: str, value):
+        if not self.enabled or self.max_entries == 0:
+            return
+        size = None
+        if self.max_bytes is not None:
+            size = size_of(value)
+        with self._lock:
+            entries, sizes = self._containers()
+            entries.pop(key, None)
+            sizes.pop(key, None)
+            if size is not None and size > self.max_bytes:
+                return
+            if self.weak:
+                try:
+                    value = weakref.ref(value, self._forget(entries, sizes, key))
+                except TypeError:
+                    return
+            entries[key] = value
+            if size is not None:
+                sizes[key] = size
+            self._evict(entries, sizes)
+
+    def _forget(
+        self,
+        entries: OrderedDict,
+        sizes: dict,
+        key: str,
+    ):
+        """
+        Return a weakref callback removing key from entries once its data is
+        collected, unless key has been stored again since. It may run in any
+        thread, so it is bound to the containers key was stored in.
+        """
+        lock = self._lock
+
+        def callback(reference):
+            with lock:
+                if entries.get(key) is reference:
+                    del entries[key]
+                    sizes.pop(key, None)
+
+        return callback
+
+    def __getitem__(self, key: str):
+        with self._lock:
+            entries = self._containers()[0]
+            value = self._load(entries, key)
+            if self.weak and value is None:
+                raise KeyError(key)
+            entries.move_to_end(key)
+            return value
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            entries, sizes = self._containers()
+            del entries[key]
+            sizes.pop(key, None)
+
+    def __iter__(self):
+        with self._lock:
+            keys = list(self._containers()[0])
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(self._containers()[0])
+
+    def clear(self):
+        """
+        Remove every entry; of a thread_local stack, every entry of the
+        calling thread.
+        """
+        with self._lock:
+            entries, sizes = self._containers()
+            entries.clear()
+            sizes.clear()
+
+    def __repr__(self) -> str:
+        return "ResultStack(%r)" % {key: self.get(key) for key in self}
@@ -1,4 +1,5 @@
 from .sources import Sources
+from .stacks import ResultStack
 
 
 class Tags(Sources):
@@ -10,7 +11,7 @@ class Tags(Sources):
         https://fred.stlouisfed.org/docs/api/fred/
         """
         super().__init__()
-        self.tag_stack = dict()
+        self.tag_stack = ResultStack()
 
     def get_all_tags(
         self,
@@ -112,8 +113,9 @@ class Tags(Sources):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.tag_stack["get_all_tags"] = self._fetch_data(url)
-        return self.tag_stack["get_all_tags"]
+        data = self._fetch_data(url)
+        self.tag_stack["get_all_tags"] = data
+        return data
 
     def get_related_tags_for_a_tag(
         self,
@@ -226,8 +228,9 @@ class Tags(Sources):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.tag_stack["get_related_tags_for_a_tag"] = self._fetch_data(url)
-        return self.tag_stack["get_related_tags_for_a_tag"]
+        data = self._fetch_data(url)
+        self.tag_stack["get_related_tags_for_a_tag"] = data
+        return data
 
     def get_series_matching_tags(
         self,
@@ -342,5 +345,6 @@ class Tags(Sources):
             "&sort_order=": sort_order,
         }
         url = self._add_optional_params(url_prefix, optional_args)
-        self.tag_stack["get_series_matching_tags"] = self._fetch_data(url)
-        return self.tag_stack["get_series_matching_tags"]
+        data = self._fetch_data(url)
+        self.tag_stack["get_series_matching_tags"] = data
+        return data
@@ -0,0 +1,39 @@
+import pytest
+from full_fred.fred import Fred
+from .fred_test_utils import StubFredServer, use_stub_server
+
+
+@pytest.fixture
+def env_api_key(monkeypatch):
+    """
+    Put a well-formed, made-up api key in FRED_API_KEY.
+    """
+    monkeypatch.setenv("FRED_API_KEY", "abcdefghijklmnopqrstuvwxyz123456")
+
+
+@pytest.fixture
+def stub_fred(env_api_key):
+    """
+    Return a factory: stub_fred(respond, **kwargs) starts a StubFredServer
+    answering with respond and returns (fred, server), fred being an
+    unthrottled Fred built with kwargs that sends its requests to server.
+    Pass fred_class=AsyncFred for an AsyncFred. Servers are shut down and
+    sessions closed after the test.
+    """
+    servers = list()
+    freds = list()
+
+    def make(respond=None, fred_class=Fred, **kwargs):
+        server = StubFredServer(respond).__enter__()
+        servers.append(server)
+        kwargs.setdefault("requests_per_minute", None)
+        fred = fred_class(**kwargs)
+        freds.append(fred)
+        use_stub_server(fred, server)
+        return fred, server
+
+    yield make
+    for fred in freds:
+        fred.close()
+    for server in servers:
+        server.__exit__(None, None, None)
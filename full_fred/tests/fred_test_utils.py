@@ -1,4 +1,9 @@
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+import threading
+import socket
+import json
 import os
 
 
@@ -56,3 +61,180 @@ def api_key_found_in_env() -> bool:
     if "FRED_API_KEY" not in os.environ.keys():
         return False
     return True
+
+
+class StubFredServer:
+    """
+    Local HTTP server standing in for FRED web service so request-path
+    behavior can be tested without an api key or network access.
+
+    respond is called with the request path (query string included) and
+    returns a (status, headers, body) tuple; body may be bytes, str or a
+    JSON-serializable object. Each accepted TCP connection is counted in
+    connections, each request path is appended to paths.
+    """
+
+    def __init__(self, respond=None):
+        self.respond = respond if respond is not None else self._echo
+        self.connections = 0
+        self.paths = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                stub.connections += 1
+                # headers and body are written separately; without
+                # TCP_NODELAY keep-alive responses stall on delayed ACKs
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                super().setup()
+
+            def do_GET(self):
+                stub.paths.append(self.path)
+                status, headers, body = stub.respond(self.path)
+                if not isinstance(body, (bytes, str)):
+                    body = json.dumps(body)
+                if isinstance(body, str):
+                    body = body.encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = "http://127.0.0.1:%d/" % self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @staticmethod
+    def _echo(path: str) -> tuple:
+        return 200, {}, {"path": path}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def use_stub_server(fred, server: StubFredServer):
+    """
+    Point fred's fred/ and geofred/ base urls at server.
+    """
+    fred._FredBase__url_base = server.url + "fred/"
+    if hasattr(fred, "_Maps__geo_url_base"):
+        fred._Maps__geo_url_base = server.url + "geofred/"
+
+
+def stub_observations(path: str) -> tuple:
+    """
+    StubFredServer responder: series/observations requests get two
+    observations whose second value is the series id; ids starting with
+    BAD get FRED's error response. Other paths are echoed.
+    """
+    if "series/observations" not in path:
+        return StubFredServer._echo(path)
+    series_id = path.split("series_id=")[1].split("&")[0]
+    if series_id.startswith("BAD"):
+        body = {
+            "error_code": 400,
+            "error_message": "Bad Request.  The series does not exist.",
+        }
+        return 400, {}, body
+    body = {
+        "count": 2,
+        "observations": [
+            {"date": "2020-01-01", "value": "1.5"},
+            {"date": "2020-02-01", "value": series_id},
+        ],
+    }
+    return 200, {}, body
+
+
+def stub_paginated(n_results: int):
+    """
+    Return a StubFredServer responder paging through n_results tags,
+    "tag0" to "tag<n_results - 1>", honoring limit and offset.
+    """
+
+    def respond(path: str) -> tuple:
+        params = dict(parse_qsl(path.split("?", 1)[1]))
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 1000))
+        tags = [
+            {"name": "tag%d" % i} for i in range(offset, min(n_results, offset + limit))
+        ]
+        body = {"count": n_results, "offset": offset, "limit": limit, "tags": tags}
+        return 200, {}, body
+
+    return respond
+
+
+def stub_category_tree(n_categories: int, broken: tuple = ()):
+    """
+    Return a StubFredServer responder for a tree of categories 0 to
+    n_categories - 1 where category k's children are 3k + 1 to 3k + 3,
+    named "cat<k>". Children of the ids in broken get FRED's error response.
+    """
+
+    def category(k: int) -> dict:
+        return {"id": k, "name": "cat%d" % k, "parent_id": (k - 1) // 3 if k else 0}
+
+    def respond(path: str) -> tuple:
+        params = dict(parse_qsl(path.split("?", 1)[1]))
+        category_id = int(params["category_id"])
+        if "category/children" not in path:
+            return 200, {}, {"categories": [category(category_id)]}
+        if category_id in broken:
+            body = {"error_code": 400, "error_message": "Bad Request."}
+            return 400, {}, body
+        children = range(3 * category_id + 1, min(3 * category_id + 4, n_categories))
+        return 200, {}, {"categories": [category(k) for k in children]}
+
+    return respond
+
+
+def stub_releases(releases: dict, failing: set = None):
+    """
+    Return a StubFredServer responder for releases, release_id -> list of
+    series ids on it, paging releases and release/series by limit and
+    offset. Pages (release_id, offset) in failing get FRED's error
+    response; remove them from the set to let the next request through.
+    """
+    failing = failing if failing is not None else set()
+
+    def respond(path: str) -> tuple:
+        params = dict(parse_qsl(path.split("?", 1)[1]))
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 1000))
+        if "release/series" not in path:
+            ids = sorted(releases)
+            results = [
+                {"id": k, "name": "release%d" % k} for k in ids[offset : offset + limit]
+            ]
+            return 200, {}, {"count": len(ids), "releases": results}
+        release_id = int(params["release_id"])
+        if (release_id, offset) in failing:
+            return 400, {}, {"error_code": 400, "error_message": "Bad Request."}
+        ids = releases[release_id]
+        seriess = [
+            {
+                "id": k,
+                "title": "Series %s" % k,
+                "frequency_short": "M",
+                "popularity": len(k),
+            }
+            for k in ids[offset : offset + limit]
+        ]
+        return 200, {}, {"count": len(ids), "seriess": seriess}
+
+    return respond
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import time
+import os
+import pytest
+from full_fred.api_key import ApiKeyFile, ApiKeyPool
+
+
+def write_key(path, key: str, mtime_ns: int):
+    path.write_text(key + "\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_key_file_is_read_once_until_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "key.txt"
+    write_key(path, "a" * 32, 1_000_000_000)
+    holder = ApiKeyFile(str(path), check_interval=0)
+    opened = list()
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    assert [holder.get() for _ in range(5)] == ["a" * 32] * 5
+    assert len(opened) == 1
+    write_key(path, "b" * 32, 2_000_000_000)
+    assert holder.get() == "b" * 32
+    assert len(opened) == 2
+    assert "a" * 32 not in repr(holder) and "b" * 32 not in repr(holder)
+
+
+def test_check_interval_defers_rotation(tmp_path):
+    path = tmp_path / "key.txt"
+    write_key(path, "a" * 32, 1_000_000_000)
+    holder = ApiKeyFile(str(path), check_interval=None)
+    assert holder.get() == "a" * 32
+    write_key(path, "b" * 32, 2_000_000_000)
+    assert holder.get() == "a" * 32
+    holder.invalidate()
+    assert holder.get() == "b" * 32
+
+
+def test_key_survives_file_being_replaced(tmp_path):
+    path = tmp_path / "key.txt"
+    write_key(path, "a" * 32, 1_000_000_000)
+    holder = ApiKeyFile(str(path), check_interval=0)
+    holder.get()
+    path.unlink()
+    assert holder.get() == "a" * 32
+
+
+def test_requests_use_the_held_key(tmp_path, monkeypatch, stub_fred):
+    monkeypatch.delenv("FRED_API_KEY", raising=False)
+    path = tmp_path / "key.txt"
+    write_key(path, "c" * 32, 1_000_000_000)
+    fred, server = stub_fred(api_key_file=str(path))
+    fred.get_all_tags()
+    fred.get_shape_files("state")
+    assert all(p.endswith("api_key=" + "c" * 32) for p in server.paths)
+    assert server.paths[1].startswith("/geofred/")
+
+
+def test_pool_spreads_requests_across_keys(tmp_path, monkeypatch, stub_fred):
+    keys = ["d" * 32, "e" * 32, "f" * 32]
+    for i, key in enumerate(keys[:2]):
+        monkeypatch.setenv("FRED_KEY_%d" % i, key)
+    path = tmp_path / "key.txt"
+    write_key(path, keys[2], 1_000_000_000)
+    # 3 keys at 600 requests per minute each: 30 requests take about 0.3 s
+    pool = ApiKeyPool(
+        api_key_files=[str(path)],
+        env_vars=["FRED_KEY_0", "FRED_KEY_1"],
+        requests_per_minute=600,
+        burst=1,
+    )
+    assert all(key not in repr(pool) for key in keys)
+    fred, server = stub_fred(key_pool=pool)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(lambda i: fred.get_a_series("S%d" % i), range(30)))
+    elapsed = time.monotonic() - start
+    used = collections.Counter(p.rsplit("api_key=", 1)[1] for p in server.paths)
+    assert used == {key: 10 for key in keys}
+    assert sorted(pool.stats().values()) == [10, 10, 10]
+    # one key alone would need about 2.9 s
+    assert 0.25 <= elapsed < 2.0
+
+
+def test_pool_needs_its_keys(tmp_path, monkeypatch):
+    monkeypatch.delenv("FRED_KEY_MISSING", raising=False)
+    with pytest.raises(ValueError):
+        ApiKeyPool()
+    with pytest.raises(AttributeError):
+        ApiKeyPool(env_vars=["FRED_KEY_MISSING"])
+    with pytest.raises(FileNotFoundError):
+        ApiKeyPool(api_key_files=[str(tmp_path / "missing.txt")])
@@ -0,0 +1,70 @@
+import asyncio
+import inspect
+import pytest
+from full_fred.async_fred import (
+    _ASYNC_ENDPOINTS,
+    _THREADED_ITERATORS,
+    _THREADED_METHODS,
+    AsyncFred,
+)
+from full_fred.fred import Fred
+from .fred_test_utils import stub_observations, stub_paginated
+
+pytest.importorskip("aiohttp")
+
+
+def test_every_endpoint_is_a_coroutine_function():
+    for method_names in _ASYNC_ENDPOINTS.values():
+        for method_name in method_names:
+            assert inspect.iscoroutinefunction(getattr(AsyncFred, method_name))
+    assert inspect.iscoroutinefunction(AsyncFred.get_series_df)
+    for method_name in _THREADED_METHODS:
+        assert inspect.iscoroutinefunction(getattr(AsyncFred, method_name))
+    for method_name in _THREADED_ITERATORS:
+        assert inspect.isasyncgenfunction(getattr(AsyncFred, method_name))
+
+
+def test_endpoints_share_sync_url_building(env_api_key):
+    fred = AsyncFred()
+    fred.realtime_start = "2020-01-01"
+    prepared = fred._prepare_request(Fred.get_a_series, "GNPCA")
+    assert prepared.url_prefix == "series?series_id=GNPCA&realtime_start=2020-01-01"
+    assert not prepared.geo
+    assert fred._prepare_request(Fred.get_shape_files, "state").geo
+    assert "get_a_series" not in fred.series_stack
+
+
+def test_many_requests_in_flight(stub_fred):
+    async def run(fred):
+        async with fred:
+            ids = ["S%d" % i for i in range(50)]
+            dfs = await asyncio.gather(*(fred.get_series_df(i) for i in ids))
+            category = await fred.get_a_category(0)
+            return ids, dfs, category
+
+    fred, _ = stub_fred(stub_observations, fred_class=AsyncFred)
+    ids, dfs, category = asyncio.run(run(fred))
+    assert [df["value"].iloc[1] for df in dfs] == ids
+    assert category["path"].startswith("/fred/category?category_id=0")
+    assert fred.category_stack["get_a_category"] is category
+
+
+def test_bulk_methods_run_off_the_event_loop(stub_fred):
+    async def run(fred):
+        async with fred:
+            dfs = await fred.get_many_series_df(["S1", "BAD1"])
+            tags = await fred.get_all_pages("get_all_tags")
+            pages = [page async for page in fred.iter_pages("get_all_tags")]
+            return dfs, tags, pages
+
+    def respond(path: str) -> tuple:
+        if "series/observations" in path:
+            return stub_observations(path)
+        return stub_paginated(1_500)(path)
+
+    fred, _ = stub_fred(respond, fred_class=AsyncFred)
+    dfs, tags, pages = asyncio.run(run(fred))
+    assert list(dfs) == ["S1"]
+    assert list(dfs.attrs["errors"]) == ["BAD1"]
+    assert len(tags["tags"]) == 1_500
+    assert [len(page["tags"]) for page in pages] == [1_000, 500]
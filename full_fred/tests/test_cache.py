@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+import pytest
+from full_fred.cache import MemoryCache, SQLiteCache, canonical_url
+from .fred_test_utils import stub_observations
+
+
+def test_canonical_url_strips_key_and_sorts_params():
+    url = (
+        "https://api.stlouisfed.org/fred/series?series_id=GDP"
+        "&realtime_start=2020-01-01&file_type=json&api_key=secret"
+    )
+    key = canonical_url(url)
+    assert key == "fred/series?realtime_start=2020-01-01&series_id=GDP"
+    assert key == canonical_url("fred/series?realtime_start=2020-01-01&series_id=GDP")
+    assert "secret" not in key
+
+
+def test_entries_expire_per_endpoint_ttl():
+    cache = MemoryCache(default_ttl=60, ttls={"fred/series": 0.05, "fred/tags": 0})
+    cache.set("fred/series?series_id=GDP", {"a": 1})
+    cache.set("fred/category?category_id=0", {"b": 2})
+    assert not cache.set("fred/tags?", {"c": 3})
+    assert cache.get("fred/series?series_id=GDP") == {"a": 1}
+    time.sleep(0.06)
+    assert cache.get("fred/series?series_id=GDP") is None
+    assert cache.get("fred/category?category_id=0") == {"b": 2}
+    assert cache.get("fred/tags?") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_evicted_past_max_bytes():
+    cache = MemoryCache(max_bytes=40)
+    cache.set("a", {"v": "x" * 10})
+    cache.set("b", {"v": "y" * 10})
+    cache.get("a")
+    cache.set("c", {"v": "z" * 10})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size <= 40
+    assert cache.stats()["evictions"] == 1
+    assert not cache.set("d", {"v": "w" * 40})
+
+
+def test_cached_copies_are_independent():
+    cache = MemoryCache()
+    cache.set("k", {"observations": [1, 2]})
+    cache.get("k").pop("observations")
+    assert cache.get("k") == {"observations": [1, 2]}
+
+
+def test_fred_answers_repeat_queries_from_cache(stub_fred):
+    fred, server = stub_fred(stub_observations, cache=MemoryCache())
+    first = fred.get_series_df("GDP")
+    second = fred.get_series_df("GDP")
+    fred.get_shape_files("state")
+    fred.get_shape_files("state")
+    fred._fetch_data("series/observations?series_id=BAD1")
+    fred._fetch_data("series/observations?series_id=BAD1")
+    assert first.equals(second)
+    assert len(server.paths) == 4
+    assert fred.cache.stats()["hits"] == 2
+
+
+@pytest.fixture
+def sqlite_path(tmp_path) -> str:
+    return str(tmp_path / "fred_cache.sqlite")
+
+
+def test_sqlite_cache_is_shared_between_instances(sqlite_path: str):
+    writer = SQLiteCache(sqlite_path)
+    writer.set("fred/series?series_id=GDP", {"seriess": [{"id": "GDP"}]})
+    reader = SQLiteCache(sqlite_path)
+    assert reader.get("fred/series?series_id=GDP") == {"seriess": [{"id": "GDP"}]}
+    mode = reader._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_sqlite_cache_expires_and_stays_under_max_bytes(sqlite_path: str):
+    cache = SQLiteCache(sqlite_path, max_bytes=400, ttls={"fred/tags": 0.05})
+    cache.set("fred/tags?tag_names=gdp", {"tags": []})
+    time.sleep(0.06)
+    assert cache.get("fred/tags?tag_names=gdp") is None
+    for i in range(20):
+        # random-ish payloads so compression can't shrink them away
+        cache.set("fred/series?series_id=S%d" % i, {"v": str(hash(str(i)) * 10**6)})
+    assert cache.size <= 400
+    assert cache.get("fred/series?series_id=S19") is not None
+    assert cache.get("fred/series?series_id=S0") is None
+
+
+def test_sqlite_cache_keeps_a_running_size(sqlite_path: str):
+    cache = SQLiteCache(sqlite_path)
+
+    def summed() -> int:
+        query = "SELECT COALESCE(SUM(size), 0) FROM responses"
+        return cache._connect().execute(query).fetchone()[0]
+
+    cache.set("a", {"v": "x" * 100})
+    cache.set("b", {"v": "y" * 50})
+    cache.set("a", {"v": "z" * 10})
+    assert cache.size == summed() > 0
+    cache.delete("b")
+    assert cache.size == summed()
+    cache.clear()
+    assert cache.size == 0
+    cache.set("c", {"v": 1})
+    assert SQLiteCache(sqlite_path).size == summed()
+
+
+def test_sqlite_cache_records_use_at_access_resolution(sqlite_path: str):
+    cache = SQLiteCache(sqlite_path, access_resolution=60)
+    cache.set("a", {"v": 1})
+    query = "SELECT accessed FROM responses WHERE key = 'a'"
+    accessed = cache._connect().execute(query).fetchone()[0]
+    assert cache.get("a") == {"v": 1}
+    assert cache._connect().execute(query).fetchone()[0] == accessed
+    cache.access_resolution = 0
+    cache.get("a")
+    assert cache._connect().execute(query).fetchone()[0] > accessed
+
+
+def test_sqlite_cache_across_threads(sqlite_path: str):
+    cache = SQLiteCache(sqlite_path)
+
+    def work(i: int):
+        cache.set("k%d" % i, {"i": i})
+        return cache.get("k%d" % i)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(40)))
+    assert results == [{"i": i} for i in range(40)]
+    assert len(cache) == 40
+
+
+def test_fred_with_sqlite_cache_skips_network_in_new_instance(
+    stub_fred,
+    sqlite_path: str,
+):
+    first, first_server = stub_fred(stub_observations, cache=SQLiteCache(sqlite_path))
+    first.get_series_df("GDP")
+    second, second_server = stub_fred(stub_observations, cache=SQLiteCache(sqlite_path))
+    df = second.get_series_df("GDP")
+    assert len(first_server.paths) == 1
+    assert len(second_server.paths) == 0
+    assert list(df["value"]) == ["1.5", "GDP"]
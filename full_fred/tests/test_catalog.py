@@ -0,0 +1,68 @@
+import os
+from full_fred.catalog import (
+    CHECKPOINT_FILE,
+    SERIES_FILE,
+    CatalogMirror,
+    load_catalog,
+)
+from .fred_test_utils import stub_releases
+
+RELEASES = {
+    1: ["A%d" % i for i in range(25)],
+    2: ["B%d" % i for i in range(10)] + ["A0", "A1"],
+    3: ["C%d" % i for i in range(5)],
+}
+
+
+def mirror_run(fred, directory) -> tuple:
+    fred.set_retry_policy(max_attempts=1)
+    mirror = CatalogMirror(fred, str(directory), max_workers=2, page_size=10)
+    return mirror, mirror.run()
+
+
+def test_mirror_deduplicates_and_writes_catalog(stub_fred, tmp_path):
+    fred, _ = stub_fred(stub_releases(RELEASES))
+    mirror, catalog = mirror_run(fred, tmp_path)
+    assert not mirror.errors
+    assert len(catalog) == 25 + 10 + 5
+    assert catalog["id"].is_unique
+    assert catalog.columns[0] == "id" and "popularity" in catalog.columns
+    assert load_catalog(str(tmp_path)).equals(catalog)
+
+
+def test_mirror_resumes_from_checkpoint(stub_fred, tmp_path):
+    failing = {(1, 20), (3, 0)}
+    fred, _ = stub_fred(stub_releases(RELEASES, failing))
+    mirror, catalog = mirror_run(fred, tmp_path)
+    assert sorted(mirror.errors) == ["release:1", "release:3"]
+    assert len(catalog) == 20 + 10
+    # a crash while appending leaves an incomplete last line
+    with open(os.path.join(str(tmp_path), SERIES_FILE), "a") as f:
+        f.write('{"id": "A2')
+    failing.clear()
+    fred, server = stub_fred(stub_releases(RELEASES, failing))
+    mirror, catalog = mirror_run(fred, tmp_path)
+    resumed = server.paths
+    assert not mirror.errors
+    assert len(catalog) == 40 and catalog["id"].is_unique
+    # release 1 picks up at its failed page; release 2 isn't read again
+    release_pages = sorted(p.split("?")[1].split("&api_key")[0] for p in resumed)
+    assert all("release_id=2" not in p for p in release_pages)
+    assert any("release_id=1" in p and "offset=20" in p for p in release_pages)
+    assert all("release_id=1" not in p or "offset=20" in p for p in release_pages)
+
+
+def test_final_checkpoint_syncs_series_first(monkeypatch, stub_fred, tmp_path):
+    fred, _ = stub_fred(stub_releases(RELEASES))
+    events = list()
+    fsync, replace = os.fsync, os.replace
+
+    def record_replace(source, target):
+        events.append(os.path.basename(target))
+        replace(source, target)
+
+    monkeypatch.setattr(os, "fsync", lambda fd: events.append("fsync") or fsync(fd))
+    monkeypatch.setattr(os, "replace", record_replace)
+    mirror_run(fred, tmp_path)
+    last = len(events) - 1 - events[::-1].index(CHECKPOINT_FILE)
+    assert events[last - 1] == "fsync"
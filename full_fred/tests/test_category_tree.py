@@ -0,0 +1,37 @@
+from full_fred.category_tree import CategoryTree
+from .fred_test_utils import stub_category_tree
+
+
+def crawl(stub_fred, n_categories: int, broken: tuple = ()) -> tuple:
+    fred, server = stub_fred(stub_category_tree(n_categories, broken))
+    tree = fred.get_category_tree(max_workers=4)
+    return fred, tree, server
+
+
+def test_crawl_finds_every_category_once(stub_fred):
+    fred, tree, server = crawl(stub_fred, 121)
+    assert fred.category_stack["get_category_tree"] is tree
+    assert len(tree) == 121 and not tree.errors
+    # the root itself, then the children of every category
+    assert len(server.paths) == 1 + 121
+    assert [c["id"] for c in tree.children(1)] == [4, 5, 6]
+    assert tree.parent(0) is None and tree.parent(40)["id"] == 13
+    assert tree.ancestors(120) == (0, 3, 12, 39)
+    assert tree.path(13) == ["cat0", "cat1", "cat4", "cat13"]
+    assert sorted(tree.descendants(1)) == [4, 5, 6] + list(range(13, 22)) + list(
+        range(40, 67)
+    )
+    assert sorted(c["id"] for c in tree.find("CAT11")) == [11] + list(range(110, 120))
+
+
+def test_errors_are_reported_and_tree_round_trips(stub_fred, tmp_path):
+    _, tree, _ = crawl(stub_fred, 40, broken=(2,))
+    assert list(tree.errors) == [2]
+    assert 2 in tree and 7 not in tree
+    path = str(tmp_path / "categories.json")
+    tree.save(path)
+    loaded = CategoryTree.load(path)
+    assert loaded.errors == {2: "Bad Request."}
+    assert loaded.categories == tree.categories
+    assert all(loaded.ancestors(k) == tree.ancestors(k) for k in tree.categories)
+    assert [c["id"] for c in loaded.children(0)] == [1, 2, 3]
@@ -1,7 +1,12 @@
+import subprocess
+import sys
+import os
 import pytest
 
 from full_fred.fred import Fred
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 @pytest.fixture
 def fred() -> Fred:
@@ -11,3 +16,16 @@ def fred() -> Fred:
 def test_observation_start_end_assigned(fred: Fred):
     assert fred.observation_start == "2024-01-01"
     assert fred.observation_end == "2024-06-30"
+
+
+def test_import_defers_pandas_and_version():
+    # a fresh interpreter, since this one has imported pandas already
+    code = (
+        "import sys, full_fred, full_fred.fred;"
+        "fred = full_fred.fred.Fred();"
+        "heavy = {'pandas', 'numpy', 'asyncio', 'full_fred._version'} & set(sys.modules);"
+        "assert not heavy, heavy;"
+        "assert full_fred.__version__;"
+        "assert 'full_fred._version' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=REPO_ROOT)
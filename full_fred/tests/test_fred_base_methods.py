@@ -1,6 +1,7 @@
 import pytest
+from full_fred.fred import Fred
 from full_fred.fred_base import FredBase
-from .fred_test_utils import api_key_found_in_env
+from .fred_test_utils import api_key_found_in_env, stub_paginated
 
 ENV_API_KEY = api_key_found_in_env()
 
@@ -61,3 +62,69 @@ def test_add_optional_params(
     assert "observation_end" in url_string
     assert observation_start_attr in url_string
     assert observation_end_attr in url_string
+
+
+def test_session_is_created_once_and_reused(fredbase: FredBase):
+    session = fredbase._get_session()
+    assert fredbase._get_session() is session
+    fredbase.close()
+    assert fredbase._get_session() is not session
+
+
+def test_set_session_params_configures_adapter(fredbase: FredBase):
+    fredbase.set_session_params(pool_connections=3, pool_maxsize=25, keep_alive=False)
+    session = fredbase._get_session()
+    adapter = session.get_adapter("https://api.stlouisfed.org/fred/")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 25
+    assert session.headers["Connection"] == "close"
+
+
+def test_requests_reuse_pooled_connection(stub_fred):
+    fred, server = stub_fred()
+    for _ in range(5):
+        fred.get_a_category(0)
+    fred.get_shape_files("state")
+    assert len(server.paths) == 6
+    assert server.paths[-1].startswith("/geofred/shapes/file?shape=state")
+    assert server.connections == 1
+
+
+def test_get_all_pages_merges_every_page_in_order(stub_fred):
+    fred, server = stub_fred(stub_paginated(2_345))
+    tags = fred.get_all_pages("get_all_tags", order_by="popularity")
+    limited = fred.get_all_pages("get_all_tags", offset=10, max_results=1_500)
+    assert [t["name"] for t in tags["tags"]] == ["tag%d" % i for i in range(2_345)]
+    assert tags["limit"] == 2_345
+    assert len(server.paths) == 3 + 2
+    assert all("order_by=popularity" in p for p in server.paths[:3])
+    assert [t["name"] for t in limited["tags"]] == [
+        "tag%d" % i for i in range(10, 1_510)
+    ]
+
+
+def test_iter_pages_is_lazy(stub_fred):
+    fred, server = stub_fred(stub_paginated(10_000))
+    pages = fred.iter_pages("search_for_series", "gdp", max_workers=2)
+    first = next(pages)
+    pages.close()
+    assert len(first["tags"]) == 1_000
+    assert len(server.paths) <= 3
+
+
+def test_iter_pages_without_prefetch_requests_on_demand(stub_fred):
+    fred, server = stub_fred(stub_paginated(2_345))
+    pages = fred.iter_pages("get_all_tags", max_workers=0)
+    next(pages)
+    assert len(server.paths) == 1
+    rest = list(pages)
+    assert [len(page["tags"]) for page in rest] == [1_000, 345]
+    assert len(server.paths) == 3
+    with pytest.raises(ValueError):
+        next(fred.iter_pages("get_all_tags", max_workers=-1))
+
+
+def test_get_all_pages_refuses_limit(env_api_key):
+    fred = Fred()
+    with pytest.raises(TypeError):
+        next(fred.iter_pages("get_all_tags", limit=5))
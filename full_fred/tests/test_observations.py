@@ -0,0 +1,86 @@
+import json
+import numpy as np
+import pytest
+from full_fred.observations import ObservationStreamParser, typed_columns
+
+
+def make_response(n: int) -> dict:
+    observations = [
+        {
+            "realtime_start": "2021-01-01",
+            "realtime_end": "9999-12-31",
+            "date": "%04d-01-01" % (1900 + i),
+            "value": "." if i % 7 == 0 else str(i / 4),
+        }
+        for i in range(n)
+    ]
+    return {
+        "realtime_start": "2021-01-01",
+        "realtime_end": "9999-12-31",
+        "units": "lin",
+        "count": n,
+        "observations": observations,
+        "note": "café",
+    }
+
+
+def parse_in_chunks(body: bytes, chunk_size: int, batch_size: int = 8192) -> tuple:
+    parser = ObservationStreamParser(batch_size=batch_size)
+    for i in range(0, len(body), chunk_size):
+        parser.feed(body[i : i + chunk_size])
+    return parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_matches_buffered_parse(chunk_size: int):
+    response = make_response(100)
+    body = json.dumps(response, indent=1, ensure_ascii=False).encode()
+    metadata, columns = parse_in_chunks(body, chunk_size, batch_size=16)
+    expected = typed_columns(response.pop("observations"))
+    assert metadata == response
+    assert list(columns) == list(expected)
+    for name in expected:
+        np.testing.assert_array_equal(columns[name], expected[name])
+
+
+def test_stream_without_observations():
+    body = json.dumps({"count": 0, "observations": []}).encode()
+    metadata, columns = parse_in_chunks(body, 3)
+    assert metadata == {"count": 0}
+    assert len(columns["date"]) == 0
+    error = {"error_code": 400, "error_message": "Bad Request."}
+    metadata, columns = parse_in_chunks(json.dumps(error).encode(), 5)
+    assert metadata == error
+    assert columns is None
+
+
+def test_truncated_stream_raises():
+    body = json.dumps(make_response(10)).encode()
+    with pytest.raises(ValueError):
+        parse_in_chunks(body[: len(body) // 2], 64)
+
+
+def test_get_series_df_stream(stub_fred):
+    response = make_response(1_000)
+    fred, _ = stub_fred(lambda path: (200, {}, response))
+    streamed = fred.get_series_df("GNPCA", stream=True)
+    buffered = fred.get_series_df("GNPCA", typed=True)
+    assert streamed.equals(buffered)
+    assert fred.series_stack["get_series_df"]["count"] == 1_000
+
+
+def test_get_series_df_stream_error_response(stub_fred):
+    error = {"error_code": 400, "error_message": "Bad Request. Series does not exist."}
+    fred, _ = stub_fred(lambda path: (400, {}, error))
+    with pytest.raises(KeyError):
+        fred.get_series_df("NOSERIES", stream=True)
+    stored = fred.series_stack["get_series_df"]
+    assert stored["error_message"] == error["error_message"]
+    assert stored["series_id"] == "NOSERIES"
+
+
+def test_get_series_df_stream_non_json_response(stub_fred, capsys):
+    page = "<html><body>503 Service Unavailable</body></html>"
+    fred, _ = stub_fred(lambda path: (200, {}, page))
+    assert fred.get_series_df("GNPCA", stream=True) is None
+    assert "Data could not be retrieved" in capsys.readouterr().out
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+import pytest
+from full_fred.fred import Fred
+from full_fred.rate_limiter import TokenBucket
+
+
+def test_burst_is_free_then_rate_applies():
+    bucket = TokenBucket(rate=50, burst=5)
+    waits = [bucket._reserve() for _ in range(10)]
+    assert waits[:5] == [0.0] * 5
+    assert waits[5:] == pytest.approx([0.02, 0.04, 0.06, 0.08, 0.1], abs=0.005)
+
+
+def test_threads_share_the_rate():
+    bucket = TokenBucket(rate=100, burst=1)
+    threads = [
+        threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)])
+        for _ in range(4)
+    ]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 20 requests, 1 free, 19 paced at 100 per second
+    assert time.monotonic() - start >= 0.18
+
+
+def test_tasks_share_the_rate_without_blocking_loop():
+    bucket = TokenBucket(rate=100, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(20)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.18
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0)
+
+
+def test_fred_rate_limit_configuration():
+    fred = Fred(requests_per_minute=60, burst=3)
+    assert fred.rate_limiter.rate == 1
+    assert fred.rate_limiter.burst == 3
+    fred.set_rate_limit(requests_per_minute=None)
+    assert fred.rate_limiter is None
+
+
+def test_fred_and_geofred_requests_share_one_bucket(stub_fred):
+    fred, _ = stub_fred(requests_per_minute=1, burst=5)
+    fred.get_a_category(0)
+    fred.get_shape_files("state")
+    assert fred.rate_limiter._tokens == pytest.approx(3, abs=0.01)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+from full_fred.fred import Fred
+from full_fred.retry import RetryPolicy
+
+
+def flaky(failures: list):
+    """
+    Responder answering with the statuses in failures, in order, then 200.
+    """
+
+    def respond(path: str) -> tuple:
+        if failures:
+            status = failures.pop(0)
+            return status, {"Retry-After": "0"}, {"error_code": status}
+        return 200, {}, {"path": path}
+
+    return respond
+
+
+def test_should_retry():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(1, 503)
+    assert policy.should_retry(1, 429)
+    assert policy.should_retry(2)
+    assert not policy.should_retry(3, 503)
+    assert not policy.should_retry(1, 400)
+    assert not policy.should_retry(1, 503, method="POST")
+
+
+def test_delay_backs_off_exponentially():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3, jitter=False)
+    assert [policy.delay(a) for a in range(1, 6)] == [0.5, 1, 2, 3, 3]
+    jittered = RetryPolicy(backoff_base=0.5, backoff_max=3)
+    assert all(0 <= jittered.delay(4) <= 3 for _ in range(50))
+
+
+def test_delay_honors_retry_after():
+    policy = RetryPolicy()
+    assert policy.delay(1, "7") == 7
+    later = datetime.now(timezone.utc) + timedelta(seconds=20)
+    assert policy.delay(1, format_datetime(later, usegmt=True)) == pytest.approx(
+        20, abs=2
+    )
+    assert policy.delay(1, "soon") <= 0.5
+
+
+def test_delay_caps_retry_after():
+    policy = RetryPolicy(retry_after_max=60)
+    assert policy.delay(1, "60") == 60
+    assert policy.delay(1, "86400") is None
+    later = datetime.now(timezone.utc) + timedelta(days=1)
+    assert policy.delay(1, format_datetime(later, usegmt=True)) is None
+    assert RetryPolicy(retry_after_max=None).delay(1, "86400") == 86400
+
+
+def test_long_retry_after_is_not_waited_for(stub_fred):
+    def respond(path: str) -> tuple:
+        return 429, {"Retry-After": "86400"}, {"error_code": 429}
+
+    fred, server = stub_fred(respond)
+    start = time.monotonic()
+    data = fred.get_a_category(0)
+    assert time.monotonic() - start < 1
+    assert len(server.paths) == 1
+    assert data == {"error_code": 429}
+
+
+def test_transient_errors_are_retried(stub_fred):
+    fred, server = stub_fred(flaky([503, 429, 502]))
+    fred.set_retry_policy(max_attempts=4, backoff_base=0.01)
+    data = fred.get_a_category(0)
+    assert len(server.paths) == 4
+    assert data["path"].startswith("/fred/category")
+
+
+def test_gives_up_after_max_attempts(stub_fred):
+    fred, server = stub_fred(flaky([503] * 5), max_attempts=2)
+    data = fred.get_a_category(0)
+    assert len(server.paths) == 2
+    assert data == {"error_code": 503}
+
+
+def test_client_errors_are_not_retried(stub_fred):
+    fred, server = stub_fred(flaky([400]))
+    fred.get_a_category(0)
+    assert len(server.paths) == 1
+
+
+def test_async_transient_errors_are_retried(stub_fred):
+    pytest.importorskip("aiohttp")
+    from full_fred.async_fred import AsyncFred
+
+    async def run(fred):
+        async with fred:
+            fred.set_retry_policy(backoff_base=0.01)
+            return await fred.get_a_category(0)
+
+    fred, server = stub_fred(flaky([503, 500]), fred_class=AsyncFred)
+    data = asyncio.run(run(fred))
+    assert len(server.paths) == 3
+    assert data["path"].startswith("/fred/category")
+
+
+def stalling(stalls: list):
+    """
+    Responder that sleeps for the durations in stalls, in order, before
+    answering, then answers at once.
+    """
+
+    def respond(path: str) -> tuple:
+        if stalls:
+            time.sleep(stalls.pop(0))
+        return 200, {}, {"path": path}
+
+    return respond
+
+
+def test_stalled_attempts_time_out_and_are_retried(stub_fred):
+    fred, server = stub_fred(stalling([2, 2]), timeout=0.2)
+    fred.set_retry_policy(backoff_base=0.01)
+    start = time.monotonic()
+    data = fred.get_a_category(0)
+    elapsed = time.monotonic() - start
+    assert len(server.paths) == 3
+    assert data["path"].startswith("/fred/category")
+    assert elapsed < 1.5
+
+
+def test_async_stalled_attempts_time_out_and_are_retried(stub_fred):
+    pytest.importorskip("aiohttp")
+    from full_fred.async_fred import AsyncFred
+
+    async def run(fred):
+        async with fred:
+            fred.set_retry_policy(backoff_base=0.01)
+            return await fred.get_a_category(0)
+
+    fred, server = stub_fred(stalling([2]), fred_class=AsyncFred, timeout=0.2)
+    data = asyncio.run(run(fred))
+    assert len(server.paths) == 2
+    assert data["path"].startswith("/fred/category")
+
+
+def test_bad_url_fails_fast(env_api_key):
+    fred = Fred(requests_per_minute=None)
+    fred._FredBase__url_base = "not a url/"
+    start = time.monotonic()
+    assert fred.get_a_category(0) is None
+    assert time.monotonic() - start < 0.5
+
+
+def test_missing_key_fails_fast(tmp_path):
+    key_path = tmp_path / "key.txt"
+    key_path.write_text("abcdefghijklmnopqrstuvwxyz123456\n")
+    fred = Fred(api_key_file=str(key_path), requests_per_minute=None)
+    key_path.unlink()
+    start = time.monotonic()
+    assert fred.get_a_category(0) is None
+    assert time.monotonic() - start < 0.5
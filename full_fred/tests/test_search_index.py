@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+from full_fred.catalog import CATALOG_FIELDS
+from full_fred.search_index import SearchIndex
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    rows = [
+        ("UNRATE", "Unemployment Rate", "Percent", "Monthly", 94),
+        ("UNRATENSA", "Unemployment Rate", "Percent", "Monthly", 60),
+        ("CAUR", "Unemployment Rate in California", "Percent", "Monthly", 70),
+        (
+            "INDPRO",
+            "Industrial Production: Total Index",
+            "Index 2017=100",
+            "Monthly",
+            40,
+        ),
+        (
+            "IPMAN",
+            "Industrial Production: Manufacturing",
+            "Index 2017=100",
+            "Quarterly",
+            50,
+        ),
+        (
+            "DEXJPUS",
+            "Japanese Yen to U.S. Dollar Spot Exchange Rate",
+            "Yen to 1 U.S. $",
+            "Daily",
+            75,
+        ),
+        (
+            "EXJPUS",
+            "Japanese Yen to U.S. Dollar Exchange Rate",
+            "Yen to 1 U.S. $",
+            "Monthly",
+            65,
+        ),
+        (
+            "MSL",
+            "Manufacturing Industries Employment",
+            "Thousands of Persons",
+            "Monthly",
+            None,
+        ),
+    ]
+    df = pd.DataFrame(rows, columns=["id", "title", "units", "frequency", "popularity"])
+    for field in CATALOG_FIELDS:
+        if field not in df:
+            df[field] = None
+    return SearchIndex(df)
+
+
+def ids(response: dict) -> list:
+    return [series["id"] for series in response["seriess"]]
+
+
+def test_full_text_matches_every_word_by_search_rank(index: SearchIndex):
+    response = index.search_for_series(["unemployment", "rates"])
+    assert response["count"] == 3 and response["order_by"] == "search_rank"
+    assert ids(response) == ["UNRATE", "CAUR", "UNRATENSA"]
+    assert ids(index.search_for_series("rate yen")) == ["DEXJPUS", "EXJPUS"]
+    # IPMAN is more popular but has "index" only in its units
+    assert ids(index.search_for_series("index")) == ["INDPRO", "IPMAN"]
+    assert ids(index.search_for_series("industry")) == ["MSL"]
+    assert ids(index.search_for_series("manufacturing", order_by="popularity")) == [
+        "IPMAN",
+        "MSL",
+    ]
+    assert index.search_for_series("unemployment nowhere")["count"] == 0
+
+
+def test_prefix_filters_and_paging(index: SearchIndex):
+    assert ids(index.search_for_series("unemployment calif", prefix=True)) == ["CAUR"]
+    assert ids(index.search_for_series("indus", prefix=True)) == [
+        "IPMAN",
+        "INDPRO",
+        "MSL",
+    ]
+    response = index.search_for_series(
+        "rate", filter_variable="frequency", filter_value="Monthly", limit=2, offset=1
+    )
+    assert response["count"] == 4
+    assert ids(response) == ["CAUR", "EXJPUS"]
+    with pytest.raises(ValueError):
+        index.search_for_series("rate", filter_variable="title", filter_value="x")
+
+
+def test_series_id_search_with_wildcards(index: SearchIndex):
+    def search(pattern: str) -> list:
+        return ids(index.search_for_series(pattern, search_type="series_id"))
+
+    assert search("rate") == ["UNRATE", "UNRATENSA"]
+    assert search("EX*") == ["EXJPUS"]
+    assert search("*US") == ["DEXJPUS", "EXJPUS"]
+    assert search("U*E") == ["UNRATE"]
+    assert search("IN*") == ["INDPRO"]
+    assert ids(
+        index.search_for_series("ex", search_type="series_id", sort_order="desc")
+    ) == [
+        "EXJPUS",
+        "DEXJPUS",
+    ]
@@ -1,10 +1,13 @@
 import pytest
+from full_fred.cache import MemoryCache
 from full_fred.fred import Fred
 from pandas import DataFrame
+import pandas as pd
 from .fred_test_utils import (
     returned_ok,
     make_time_string,
     api_key_found_in_env,
+    stub_observations,
 )
 
 ENV_API_KEY = api_key_found_in_env()
@@ -372,3 +375,248 @@ def test_get_series_vintagedates(
     get_series_vintagedates_method_works: bool,
 ):
     assert get_series_vintagedates_method_works == True
+
+
+def test_get_many_series_df_keeps_order_and_shared_args(stub_fred):
+    ids = ["S%d" % i for i in range(20)] + ["S0"]
+    fred, server = stub_fred(stub_observations)
+    dfs = fred.get_many_series_df(ids, units="pch", max_workers=4)
+    long_df = fred.get_many_series_df(ids[:3], long_format=True)
+    assert list(dfs) == ids[:20]
+    assert all(dfs[k]["value"].iloc[1] == k for k in dfs)
+    assert all("units=pch" in path for path in server.paths[:20])
+    assert list(long_df["series_id"]) == ["S0", "S0", "S1", "S1", "S2", "S2"]
+
+
+def test_get_many_series_df_collects_error_messages(stub_fred):
+    fred, _ = stub_fred(stub_observations)
+    dfs = fred.get_many_series_df(["S1", "BAD1"])
+    assert list(dfs) == ["S1"]
+    errors = fred.series_stack["get_many_series_df"]["errors"]
+    assert errors == {"BAD1": "Bad Request.  The series does not exist."}
+
+
+def test_get_many_series_df_doesnt_print_failures(stub_fred, capsys):
+    def respond(path: str) -> tuple:
+        if "series_id=DOWN" in path:
+            return 503, {}, "<html>Service Unavailable</html>"
+        return stub_observations(path)
+
+    fred, _ = stub_fred(respond, max_attempts=1)
+    dfs = fred.get_many_series_df(["S1"] + ["DOWN%d" % i for i in range(5)])
+    assert list(dfs) == ["S1"]
+    assert len(dfs.attrs["errors"]) == 5
+    assert capsys.readouterr().out == ""
+    assert fred.get_a_series("DOWN0") is None
+    assert "Data could not be retrieved" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "limits", [{"weak": True}, {"enabled": False}, {"max_bytes": 1}]
+)
+def test_errors_and_metadata_come_with_the_result(stub_fred, limits):
+    fred, _ = stub_fred(stub_observations)
+    fred.set_stack_limits(**limits)
+    dfs = fred.get_many_series_df(["S1", "BAD1"])
+    long_df = fred.get_many_series_df(["S1", "BAD1"], long_format=True)
+    panel = fred.get_series_panel(["S1", "BAD1"])
+    df = fred.get_series_df("S1")
+    streamed = fred.get_series_df("S1", stream=True)
+    for result in (dfs, long_df, panel):
+        assert list(result.attrs["errors"]) == ["BAD1"]
+        assert result.attrs["series_ids"] == ["S1", "BAD1"]
+    assert list(dfs) == ["S1"]
+    assert df.attrs["series_id"] == streamed.attrs["series_id"] == "S1"
+    assert "observations" not in df.attrs
+    assert df.attrs["count"] == streamed.attrs["count"]
+
+
+class GrowingSeries:
+    """
+    StubFredServer responder for a daily series whose latest observations
+    can be added or revised between requests.
+    """
+
+    def __init__(self, n: int):
+        self.values = {"2020-01-%02d" % (d + 1): str(d) for d in range(n)}
+
+    def __call__(self, path: str) -> tuple:
+        start = "0000"
+        if "observation_start=" in path:
+            start = path.split("observation_start=")[1].split("&")[0]
+        offset = limit = None
+        if "offset=" in path:
+            offset = int(path.split("offset=")[1].split("&")[0])
+        if "limit=" in path:
+            limit = int(path.split("limit=")[1].split("&")[0])
+        observations = [
+            {
+                "realtime_start": "2024-01-02",
+                "realtime_end": "2024-01-02",
+                "date": d,
+                "value": v,
+            }
+            for d, v in sorted(self.values.items())
+            if d >= start
+        ]
+        body = {
+            "realtime_start": "2024-01-02",
+            "realtime_end": "2024-01-02",
+            "observation_start": "1776-07-04",
+            "count": len(observations),
+            "offset": offset or 0,
+            "observations": observations[offset:][:limit],
+        }
+        return 200, {}, body
+
+
+@pytest.mark.parametrize("cache", [None, MemoryCache()])
+def test_refresh_series_df_fetches_only_the_tail(stub_fred, cache):
+    series = GrowingSeries(20)
+    fred, server = stub_fred(series, cache=cache)
+    first = fred.refresh_series_df("DGS10")
+    series.values["2020-01-19"] = "revised"
+    series.values["2020-01-21"] = "20"
+    second = fred.refresh_series_df("DGS10", revision_overlap=3)
+    assert fred.series_stack["refresh_series_df"]["new_observations"] == 4
+    assert fred.forget_series_df("DGS10")
+    third = fred.refresh_series_df("DGS10")
+    assert len(first) == 20
+    assert "observation_start" not in server.paths[0]
+    assert "observation_start=2020-01-18" in server.paths[1]
+    assert len(second) == 21
+    assert second["value"].iloc[18] == "revised"
+    assert second["value"].iloc[-1] == "20"
+    assert "observation_start" not in server.paths[2]
+    assert second.equals(third)
+
+
+def test_refresh_series_df_remembers_per_default_realtime_period(stub_fred):
+    cache = MemoryCache()
+    fred, server = stub_fred(GrowingSeries(10), cache=cache)
+    fred.realtime_start = fred.realtime_end = "2001-01-01"
+    fred.refresh_series_df("DGS10")
+    fred.realtime_start = fred.realtime_end = "2015-01-01"
+    df = fred.refresh_series_df("DGS10")
+    assert len(df) == 10
+    assert "realtime_start=2015-01-01" in server.paths[1]
+    assert "observation_start" not in server.paths[1]
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_typed_observations_df():
+    fred = Fred()
+    observations = [
+        {
+            "realtime_start": "2020-01-01",
+            "realtime_end": "9999-12-31",
+            "date": "1947-01-01",
+            "value": "243.164",
+        },
+        {
+            "realtime_start": "2020-01-01",
+            "realtime_end": "9999-12-31",
+            "date": "1947-04-01",
+            "value": ".",
+        },
+    ]
+    df = fred._typed_observations_df(observations)
+    assert list(df.columns) == ["realtime_start", "realtime_end", "date", "value"]
+    assert str(df["date"].dtype) == "datetime64[s]"
+    assert df["realtime_end"].iloc[0] == pd.Timestamp("9999-12-31")
+    assert df["value"].dtype == "float64"
+    assert df["value"].iloc[0] == 243.164
+    assert pd.isna(df["value"].iloc[1])
+    indexed = fred._typed_observations_df(observations, date_index=True)
+    assert isinstance(indexed.index, pd.DatetimeIndex)
+    assert fred._typed_observations_df([]).empty
+
+
+def test_typed_observations_df_with_vintage_columns():
+    fred = Fred()
+    observations = [
+        {
+            "date": "2019-01-01",
+            "GNPCA_20200326": "19351.27",
+            "GNPCA_20200730": "19338.371",
+        },
+        {"date": "2020-01-01", "GNPCA_20200326": ".", "GNPCA_20200730": "18384.687"},
+    ]
+    df = fred._typed_observations_df(observations)
+    assert df["GNPCA_20200730"].tolist() == [19338.371, 18384.687]
+    assert pd.isna(df["GNPCA_20200326"].iloc[1])
+
+
+def test_get_series_df_typed(stub_fred):
+    fred, _ = stub_fred(GrowingSeries(3))
+    df = fred.get_series_df("GDP", typed=True, date_index=True)
+    assert df["value"].tolist() == [0.0, 1.0, 2.0]
+    assert df.index[0] == pd.Timestamp("2020-01-01")
+
+
+def test_iter_series_df_yields_chunks_in_order(stub_fred):
+    fred, server = stub_fred(GrowingSeries(25))
+    chunks = list(fred.iter_series_df("GDP", chunk_size=10, typed=True))
+    limited = list(fred.iter_series_df("GDP", chunk_size=10, max_results=12))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert pd.concat(chunks)["value"].tolist() == [float(d) for d in range(25)]
+    assert [len(c) for c in limited] == [10, 2]
+    assert fred.series_stack["iter_series_df"]["series_id"] == "GDP"
+    assert "limit=10" in server.paths[0]
+
+
+def test_iter_series_df_without_prefetch(stub_fred):
+    fred, server = stub_fred(GrowingSeries(25))
+    chunks = list(fred.iter_series_df("GDP", chunk_size=10, prefetch=0))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert len(server.paths) == 3
+
+
+def test_iter_series_df_rejects_bad_chunk_size():
+    fred = Fred()
+    with pytest.raises(ValueError):
+        next(fred.iter_series_df("GDP", chunk_size=0))
+
+
+def staggered_series(path: str) -> tuple:
+    """
+    StubFredServer responder: series S<k> has monthly observations from
+    month k + 1 of 2020 through June, valued k; ids starting with BAD get
+    FRED's error response.
+    """
+    series_id = path.split("series_id=")[1].split("&")[0]
+    if series_id.startswith("BAD"):
+        return stub_observations(path)
+    k = int(series_id[1:])
+    observations = [
+        {"date": "2020-%02d-01" % m, "value": str(k)} for m in range(k + 1, 7)
+    ]
+    return 200, {}, {"count": len(observations), "observations": observations}
+
+
+def test_get_series_panel_aligns_on_date(stub_fred):
+    fred, server = stub_fred(staggered_series)
+    outer = fred.get_series_panel(["S2", "S0", "BAD1", "S2"], frequency="m")
+    errors = fred.series_stack["get_series_panel"]["errors"]
+    inner = fred.get_series_panel(
+        ["S0", "S3"], how="inner", aggregation_method={"S3": "eop"}
+    )
+    assert outer.columns.tolist() == ["S2", "S0"]
+    assert outer.index.tolist() == list(
+        pd.date_range("2020-01-01", periods=6, freq="MS")
+    )
+    assert outer["S2"].isna().tolist() == [True, True, False, False, False, False]
+    assert (outer["S0"] == 0).all()
+    assert list(errors) == ["BAD1"]
+    assert inner.index[0] == pd.Timestamp("2020-04-01")
+    assert inner["S3"].tolist() == [3.0, 3.0, 3.0]
+    assert all("frequency=m" in p for p in server.paths[:3])
+    assert sum("aggregation_method=eop" in p for p in server.paths[3:]) == 1
+
+
+def test_refresh_series_df_returns_none_without_a_response(env_api_key, capsys):
+    fred = Fred(requests_per_minute=None)
+    fred._FredBase__url_base = "not a url/"
+    assert fred.refresh_series_df("DGS10") is None
+    assert fred.get_series_df("DGS10") is None
+    assert "Data could not be retrieved" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import gc
+import numpy as np
+import pandas as pd
+import pytest
+from full_fred.stacks import Result, ResultStack, size_of
+from .fred_test_utils import stub_observations
+
+
+def test_default_stack_behaves_like_a_dict():
+    stack = ResultStack()
+    stack["a"] = None
+    stack["b"] = {"x": 1}
+    assert stack["a"] is None
+    assert dict(stack) == {"a": None, "b": {"x": 1}}
+    assert stack.pop("a") is None
+    assert "a" not in stack
+
+
+def test_disabled_stack_keeps_nothing():
+    stack = ResultStack(enabled=False)
+    stack["a"] = {"x": 1}
+    assert len(stack) == 0
+    with pytest.raises(KeyError):
+        stack["a"]
+
+
+def test_max_entries_evicts_least_recently_used():
+    stack = ResultStack(max_entries=2)
+    stack["a"] = 1
+    stack["b"] = 2
+    stack["a"]
+    stack["c"] = 3
+    assert list(stack) == ["a", "c"]
+
+
+def test_max_bytes_accounts_sizes():
+    df = pd.DataFrame({"value": np.zeros(1_000)})
+    assert size_of({"df": df}) > df["value"].to_numpy().nbytes
+    stack = ResultStack(max_bytes=3 * size_of(df))
+    stack["a"] = df
+    stack["b"] = df.copy()
+    stack["c"] = df.copy()
+    stack["d"] = df.copy()
+    assert list(stack) == ["b", "c", "d"]
+    assert stack.nbytes <= stack.max_bytes
+    stack["huge"] = pd.concat([df] * 4)
+    assert "huge" not in stack
+    stack.configure(max_bytes=size_of(df))
+    assert list(stack) == ["d"]
+
+
+def test_weak_stack_follows_the_caller():
+    stack = ResultStack(weak=True)
+    held = Result(x=1)
+    stack["held"] = held
+    stack["dropped"] = Result(x=2)
+    stack["plain"] = {"x": 3}
+    gc.collect()
+    assert list(stack) == ["held"]
+    assert stack["held"] is held
+    del held
+    gc.collect()
+    assert len(stack) == 0
+
+
+def test_set_stack_limits_applies_to_every_stack(stub_fred):
+    fred, _ = stub_fred()
+    fred.get_all_tags()
+    assert fred.set_stack_limits(enabled=False)
+    assert len(fred.tag_stack) == 0
+    tags = fred.get_all_tags()
+    fred.set_stack_limits(weak=True)
+    source = fred.get_a_source(1)
+    assert tags["path"].startswith("/fred/tags")
+    assert len(fred.tag_stack) == 0
+    assert fred.source_stack["get_a_source"] is source
+    for stack in (fred.category_stack, fred.series_stack, fred.maps_stack):
+        assert stack.weak
+
+
+def test_thread_local_stack_separates_threads():
+    stack = ResultStack(thread_local=True)
+    stack["a"] = "main"
+    seen = list()
+
+    def worker():
+        seen.append("a" in stack)
+        stack["a"] = "worker"
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen == [False]
+    assert stack["a"] == "main"
+
+
+def test_one_fred_shared_across_threads(stub_fred):
+    series_ids = ["S%d" % i for i in range(64)]
+    fred, server = stub_fred(stub_observations, pool_maxsize=8)
+    fred.set_stack_limits(thread_local=True)
+
+    def fetch(series_id: str) -> tuple:
+        df = fred.get_series_df(series_id)
+        return df["value"].iloc[1], fred.series_stack["get_series_df"]["series_id"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(fetch, series_ids))
+    assert results == [(k, k) for k in series_ids]
+    assert server.connections <= 8
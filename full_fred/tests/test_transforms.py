@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+from full_fred.fred import Fred
+from full_fred.transforms import aggregate, infer_frequency, transform
+
+# quarterly levels; the fifth observation is FRED's missing value "."
+DATES = pd.date_range("2019-01-01", periods=7, freq="QS").to_numpy()
+LEVELS = np.array([100.0, 102.0, 101.0, 105.0, np.nan, 110.0, 112.0])
+
+# expected outputs worked out by hand from FRED's growth formulas
+EXPECTED = {
+    "chg": [np.nan, 2.0, -1.0, 4.0, np.nan, np.nan, 2.0],
+    "ch1": [np.nan, np.nan, np.nan, np.nan, np.nan, 8.0, 11.0],
+    "pch": [np.nan, 2.0, -0.980392, 3.960396, np.nan, np.nan, 1.818182],
+    "pc1": [np.nan, np.nan, np.nan, np.nan, np.nan, 7.843137, 10.891089],
+    "pca": [np.nan, 8.243216, -3.864275, 16.807761, np.nan, np.nan, 7.473490],
+    "cch": [np.nan, 1.980263, -0.985230, 3.883983, np.nan, np.nan, 1.801851],
+    "cca": [np.nan, 7.921051, -3.940919, 15.535933, np.nan, np.nan, 7.207402],
+    "log": [4.605170, 4.624973, 4.615121, 4.653960, np.nan, 4.700480, 4.718499],
+}
+
+
+@pytest.mark.parametrize("units", sorted(EXPECTED))
+def test_transform_matches_growth_formulas(units):
+    observed = transform(LEVELS, units, DATES)
+    np.testing.assert_allclose(observed, EXPECTED[units], atol=1e-6)
+
+
+def test_transform_frequency_overrides_inference():
+    pca = transform(LEVELS[:2], "pca", frequency="m")
+    assert pca[1] == pytest.approx((1.02**12 - 1) * 100)
+    with pytest.raises(ValueError):
+        transform(LEVELS, "pca")
+    with pytest.raises(ValueError):
+        transform(LEVELS, "percent")
+
+
+def test_daily_change_from_year_ago_matches_dates():
+    dates = pd.bdate_range("2019-01-01", "2020-01-10").to_numpy()
+    values = np.arange(len(dates), dtype=float)
+    ch1 = transform(values, "ch1", dates)
+    assert infer_frequency(dates) == "d"
+    # 2020-01-01 has a year-ago observation, 2020-01-06 doesn't (2019-01-06 was a Sunday)
+    position = {str(d)[:10]: i for i, d in enumerate(dates)}
+    assert (
+        ch1[position["2020-01-01"]] == position["2020-01-01"] - position["2019-01-01"]
+    )
+    assert np.isnan(ch1[position["2020-01-06"]])
+
+
+@pytest.mark.parametrize("frequency", ["a", "sa", "q", "m", "bw", "w", "d"])
+def test_infer_frequency(frequency):
+    step = {
+        "a": "YS",
+        "sa": "6MS",
+        "q": "QS",
+        "m": "MS",
+        "bw": "2W",
+        "w": "W",
+        "d": "B",
+    }
+    dates = pd.date_range("2000-01-01", periods=30, freq=step[frequency]).to_numpy()
+    assert infer_frequency(dates) == frequency
+
+
+def test_transform_series_df():
+    fred = Fred()
+    df = pd.DataFrame(
+        {
+            "realtime_start": "2024-01-02",
+            "realtime_end": "2024-01-02",
+            "date": [str(d)[:10] for d in DATES],
+            "value": ["100", "102", "101", "105", ".", "110", "112"],
+        }
+    )
+    pc1 = fred.transform_series_df(df, "pc1")
+    assert pc1["date"].tolist() == df["date"].tolist()
+    np.testing.assert_allclose(pc1["value"], EXPECTED["pc1"], atol=1e-6)
+    typed = fred._typed_observations_df(df.to_dict("records"), date_index=True)
+    np.testing.assert_allclose(
+        fred.transform_series_df(typed, "pch")["value"], EXPECTED["pch"], atol=1e-6
+    )
+    with pytest.raises(ValueError):
+        fred.transform_series_df(pd.concat([df, df]), "chg")
+
+
+def daily_response() -> list:
+    """
+    Observations of a business-daily series from 2020-01-01 through
+    2020-02-14 valued by day of year, with 2020-01-09 missing, as FRED
+    returns them.
+    """
+    observations = list()
+    for date in pd.bdate_range("2020-01-01", "2020-02-14"):
+        value = "." if date.day == 9 else str(date.dayofyear)
+        observations.append({"date": date.strftime("%Y-%m-%d"), "value": value})
+    return observations
+
+
+# expected aggregates worked out by hand from daily_response
+AGGREGATES = [
+    ("wef", "avg", ["2020-01-03", "2020-01-10"], [2.0, 7.75]),
+    ("w", "sum", ["2020-01-03", "2020-01-10"], [6.0, 31.0]),
+    ("weth", "eop", ["2020-01-02", "2020-01-09", "2020-01-16"], [2.0, 8.0, 16.0]),
+    ("wesu", "avg", ["2020-01-05", "2020-01-12"], [2.0, 7.75]),
+    ("m", "sum", ["2020-01-01", "2020-02-01"], [367.0, 395.0]),
+    ("m", "avg", ["2020-01-01", "2020-02-01"], [367.0 / 22, 39.5]),
+    ("q", "avg", ["2020-01-01"], [762.0 / 32]),
+    ("a", "eop", ["2020-01-01"], [45.0]),
+]
+
+
+@pytest.mark.parametrize("frequency, method, dates, values", AGGREGATES)
+def test_aggregate_series_df_matches_fred_semantics(frequency, method, dates, values):
+    fred = Fred()
+    df = pd.DataFrame(daily_response())
+    aggregated = fred.aggregate_series_df(df, frequency, method)
+    n = len(dates)
+    assert aggregated["date"].iloc[:n].tolist() == [pd.Timestamp(d) for d in dates]
+    np.testing.assert_allclose(aggregated["value"].iloc[:n], values)
+
+
+@pytest.mark.parametrize("frequency", ["bw", "bwem", "bwew"])
+def test_aggregate_refuses_biweekly(frequency):
+    dates = np.array(["2020-01-01", "2020-01-02"], dtype="datetime64[s]")
+    with pytest.raises(ValueError):
+        aggregate(np.array([1.0, 2.0]), dates, frequency)
+
+
+def test_aggregate_leaves_empty_periods_missing():
+    dates = np.array(["2020-01-01", "2020-02-03", "2020-02-28"], dtype="datetime64[s]")
+    for method in ("avg", "sum", "eop"):
+        labels, values = aggregate(np.array([np.nan, 2.0, np.nan]), dates, "m", method)
+        assert np.isnan(values[0]) and values[1] == 2.0
+    with pytest.raises(ValueError):
+        aggregate(np.ones(3), dates, "d")
+    with pytest.raises(ValueError):
+        aggregate(np.ones(3), dates, "m", "median")
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from full_fred.fred import Fred
+from full_fred.vintages import AsOfEngine, VintageCube
+
+# 2020-01-01 is first published on 2020-02-01, revised on 2020-03-01;
+# 2020-02-01 is published on 2020-03-01 and withdrawn after 2020-03-31
+OBSERVATIONS = [
+    {
+        "realtime_start": "2020-02-01",
+        "realtime_end": "2020-02-29",
+        "date": "2020-01-01",
+        "value": "1.0",
+    },
+    {
+        "realtime_start": "2020-03-01",
+        "realtime_end": "9999-12-31",
+        "date": "2020-01-01",
+        "value": "1.5",
+    },
+    {
+        "realtime_start": "2020-03-01",
+        "realtime_end": "2020-03-31",
+        "date": "2020-02-01",
+        "value": ".",
+    },
+]
+
+
+@pytest.fixture
+def cube() -> VintageCube:
+    return VintageCube.from_observations(OBSERVATIONS, "S")
+
+
+def test_as_of_a_single_vintage(cube: VintageCube):
+    before = cube.as_of("2020-01-15")
+    first = cube.as_of("2020-02-10")
+    assert before.isna().all()
+    assert first.tolist()[0] == 1.0
+    assert np.isnan(first.tolist()[1])
+    assert cube.as_of("2020-03-01").loc["2020-01-01"] == 1.5
+    assert cube.latest().loc["2020-01-01"] == 1.5
+    assert cube.latest().isna().tolist() == [False, True]
+
+
+def test_value(cube: VintageCube):
+    assert cube.value("2020-01-01", "2020-02-29") == 1.0
+    assert cube.value("2020-01-01", "2020-02-29T12:00") == 1.0
+    assert cube.value("2020-01-01", "2021-01-01") == 1.5
+    assert np.isnan(cube.value("2020-01-01", "2020-01-31"))
+    assert np.isnan(cube.value("2020-03-01", "2021-01-01"))
+
+
+def test_lookups_leave_the_dense_matrix_unbuilt(cube: VintageCube):
+    cube.as_of(["2020-02-10", "2020-03-10"])
+    cube.value("2020-01-01", "2020-03-10")
+    assert cube._dense is None
+    empty = VintageCube([], [], [], [])
+    assert empty.as_of("2020-01-01").empty
+    assert np.isnan(empty.value("2020-01-01", "2020-01-01"))
+
+
+def test_as_of_many_vintages(cube: VintageCube):
+    df = cube.as_of(["2020-02-10", "2020-03-10", "2020-04-10"])
+    assert df.shape == (2, 3)
+    assert df.loc["2020-01-01"].tolist() == [1.0, 1.5, 1.5]
+
+
+def test_dense_matrix(cube: VintageCube):
+    assert len(cube) == 3
+    assert cube.vintages.tolist() == list(
+        np.array(["2020-02-01", "2020-03-01"], dtype="datetime64[s]")
+    )
+    frame = cube.to_frame()
+    assert frame.loc["2020-01-01"].tolist() == [1.0, 1.5]
+    assert frame.loc["2020-02-01"].isna().all()
+    for vintage in cube.vintages:
+        assert frame[vintage].equals(cube.as_of(vintage).rename(frame[vintage].name))
+
+
+def test_from_frame_matches_from_observations(cube: VintageCube):
+    fred = Fred()
+    df = fred._typed_observations_df(OBSERVATIONS, date_index=True)
+    other = VintageCube.from_frame(df, "S")
+    assert np.array_equal(other.values, cube.values, equal_nan=True)
+
+
+def test_get_vintage_cube(stub_fred):
+    body = {"count": len(OBSERVATIONS), "observations": OBSERVATIONS}
+    fred, server = stub_fred(lambda path: (200, {}, body))
+    cube = fred.get_vintage_cube("S")
+    assert "realtime_start=1776-07-04" in server.paths[0]
+    assert fred.series_stack["get_vintage_cube"] is cube
+    assert cube.as_of("2020-02-10").loc["2020-01-01"] == 1.0
+
+
+def test_as_of_engine_fetches_each_series_once(stub_fred):
+    def respond(path: str) -> tuple:
+        if "series_id=BAD" in path:
+            return 400, {}, {"error_code": 400, "error_message": "Bad Request."}
+        return 200, {}, {"count": len(OBSERVATIONS), "observations": OBSERVATIONS}
+
+    fred, server = stub_fred(respond)
+    engine = AsOfEngine(fred).load(["A", "B", "BAD"])
+    results = engine.query(
+        [("A", "2020-02-10"), ("B", "2020-03-10"), ("A", "2020-04-10")]
+    )
+    assert engine.value("B", "2020-01-01", "2020-02-10") == 1.0
+    with pytest.raises(KeyError):
+        engine.cube("BAD")
+    assert sorted(engine.cubes) == ["A", "B"]
+    assert "BAD" in engine.errors
+    assert [r.loc["2020-01-01"] for r in results] == [1.0, 1.5, 1.5]
+    assert results[1].name == pd.Timestamp("2020-03-10")
+    assert sum("series_id=A" in p for p in server.paths) == 1
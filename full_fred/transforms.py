@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+
+UNITS = ("lin", "chg", "ch1", "pch", "pc1", "pca", "cch", "cca", "log")
+
+# n_obs_per_yr of FRED's growth formulas, by frequency_short
+OBSERVATIONS_PER_YEAR = {
+    "a": 1,
+    "sa": 2,
+    "q": 4,
+    "m": 12,
+    "bw": 26,
+    "w": 52,
+    "d": 260,
+}
+
+
+def infer_frequency(dates: np.ndarray) -> str:
+    """
+    Return the frequency, one of OBSERVATIONS_PER_YEAR's keys, of the
+    sorted datetime64 array dates judged by the median gap between them.
+    """
+    if len(dates) < 2:
+        raise ValueError("Cannot infer the frequency of fewer than 2 observations")
+    gap = np.median(np.diff(dates).astype("timedelta64[D]").astype(np.int64))
+    for frequency, most_days in (
+        ("d", 4),
+        ("w", 8),
+        ("bw", 16),
+        ("m", 35),
+        ("q", 100),
+        ("sa", 200),
+    ):
+        if gap <= most_days:
+            return frequency
+    return "a"
+
+
+def year_ago_positions(
+    dates: np.ndarray,
+    frequency: str,
+) -> np.ndarray:
+    """
+    Return, for each of dates, the position of the observation one year
+    earlier, -1 if there is none. Daily series are matched on the calendar
+    date a year before, since their observations don't fall a fixed number
+    of positions apart; other frequencies are n_obs_per_yr positions back.
+    """
+    positions = np.arange(len(dates)) - OBSERVATIONS_PER_YEAR[frequency]
+    if frequency != "d":
+        return np.maximum(positions, -1)
+    year_ago = (pd.DatetimeIndex(dates) - pd.DateOffset(years=1)).to_numpy()
+    positions = np.searchsorted(dates, year_ago)
+    found = positions < len(dates)
+    found[found] = dates[positions[found]] == year_ago[found]
+    return np.where(found, positions, -1)
+
+
+def transform(
+    values: np.ndarray,
+    units: str,
+    dates: np.ndarray = None,
+    frequency: str = None,
+) -> np.ndarray:
+    """
+    Apply one of FRED's data value transformations to the levels values,
+    observations of a series in date order, the way FRED computes it for
+    the units argument of series/observations. NaN values, FRED's ".",
+    propagate to every result they enter.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        float64 levels ("lin") in ascending date order.
+    units: str
+        One of UNITS, see get_series_df.
+    dates: np.ndarray, default None
+        The datetime64 observation dates of values. Needed by "ch1", "pc1",
+        "pca" and "cca" unless frequency is given, and by "ch1" and "pc1"
+        for daily series.
+    frequency: str, default None
+        The series' frequency_short, one of OBSERVATIONS_PER_YEAR's keys.
+        If None, inferred from dates.
+
+    Returns
+    -------
+    np.ndarray
+        float64 transformed values, NaN where a previous observation is needed
+        but missing.
+
+    Notes
+    -----
+    FRED's formulas: https://alfred.stlouisfed.org/help#growth_formulas
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if units not in UNITS:
+        raise ValueError("units must be one of %s" % ", ".join(UNITS))
+    if units == "lin":
+        return values.copy()
+    if units == "log":
+        return np.log(values)
+    previous = np.full(len(values), np.nan)
+    if units in ("ch1", "pc1"):
+        positions = year_ago_positions(dates, _frequency(dates, frequency))
+        found = positions >= 0
+        previous[found] = values[positions[found]]
+    else:
+        previous[1:] = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if units in ("chg", "ch1"):
+            return values - previous
+        if units in ("pch", "pc1"):
+            return (values / previous - 1) * 100
+        if units == "cch":
+            return (np.log(values) - np.log(previous)) * 100
+        n = OBSERVATIONS_PER_YEAR[_frequency(dates, frequency)]
+        if units == "pca":
+            return ((values / previous) ** n - 1) * 100
+        return (np.log(values) - np.log(previous)) * 100 * n
+
+
+def _frequency(
+    dates: np.ndarray,
+    frequency: str,
+) -> str:
+    if frequency is not None:
+        if frequency not in OBSERVATIONS_PER_YEAR:
+            raise ValueError(
+                "frequency must be one of %s" % ", ".join(OBSERVATIONS_PER_YEAR)
+            )
+        return frequency
+    if dates is None:
+        raise ValueError("Either dates or frequency is needed")
+    return infer_frequency(dates)
+
+
+AGGREGATION_METHODS = ("avg", "sum", "eop")
+
+# weekday, Monday = 0, that weekly periods end on
+_PERIOD_END_WEEKDAYS = {
+    "wem": 0,
+    "wetu": 1,
+    "wew": 2,
+    "weth": 3,
+    "wef": 4,
+    "wesa": 5,
+    "wesu": 6,
+}
+_FREQUENCY_ALIASES = {"w": "wef"}
+# the fortnight biweekly periods are phased on hasn't been checked against
+# FRED's responses, so they are left to FRED
+_BIWEEKLY = ("bw", "bwem", "bwew")
+
+
+def period_labels(
+    dates: np.ndarray,
+    frequency: str,
+) -> np.ndarray:
+    """
+    Return the datetime64[s] date FRED labels the period each of dates falls
+    in when aggregating to frequency: the first day of the period for
+    "m", "q", "sa" and "a", the last day for weekly periods. Biweekly
+    frequencies aren't supported: which fortnight FRED's periods fall on
+    isn't verified, so request them from FRED with get_series_df.
+    """
+    if frequency in _BIWEEKLY:
+        raise ValueError(
+            "Biweekly aggregation isn't done locally; request frequency=%r "
+            "from FRED with get_series_df" % frequency
+        )
+    frequency = _FREQUENCY_ALIASES.get(frequency, frequency)
+    days = np.asarray(dates, dtype="datetime64[D]")
+    if frequency in _PERIOD_END_WEEKDAYS:
+        # 1970-01-01, day 0, was a Thursday
+        weekday = (days.astype(np.int64) + 3) % 7
+        ends = days + (_PERIOD_END_WEEKDAYS[frequency] - weekday) % 7
+        return ends.astype("datetime64[s]")
+    months = days.astype("datetime64[M]")
+    months_per_period = {"m": 1, "q": 3, "sa": 6, "a": 12}
+    if frequency not in months_per_period:
+        raise ValueError(
+            "frequency must be one of %s"
+            % ", ".join(
+                list(months_per_period)
+                + list(_FREQUENCY_ALIASES)
+                + list(_PERIOD_END_WEEKDAYS)
+            )
+        )
+    month_numbers = months.astype(np.int64)
+    starts = month_numbers - month_numbers % months_per_period[frequency]
+    return starts.astype("datetime64[M]").astype("datetime64[s]")
+
+
+def aggregate(
+    values: np.ndarray,
+    dates: np.ndarray,
+    frequency: str,
+    aggregation_method: str = "avg",
+) -> tuple:
+    """
+    Aggregate the observations values, dated dates in ascending order, to
+    the lower frequency frequency the way FRED does for the frequency and
+    aggregation_method arguments of series/observations. Missing values
+    (NaN) are left out of every period; a period without values is NaN.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        float64 observations.
+    dates: np.ndarray
+        Their datetime64 observation dates, ascending.
+    frequency: str
+        "w", "m", "q", "sa", "a" or a weekly-ending variant: "wem",
+        "wetu", "wew", "weth", "wef", "wesa", "wesu". "w" is weekly ending
+        Friday. Biweekly frequencies raise ValueError; see period_labels.
+    aggregation_method: str, default "avg"
+        "avg", "sum" or "eop" (the period's last value).
+
+    Returns
+    -------
+    tuple
+        (labels, aggregated): datetime64[s] period labels, see
+        period_labels, and the float64 aggregated values.
+    """
+    if aggregation_method not in AGGREGATION_METHODS:
+        raise ValueError(
+            "aggregation_method must be one of %s" % ", ".join(AGGREGATION_METHODS)
+        )
+    values = np.asarray(values, dtype=np.float64)
+    labels, groups = np.unique(period_labels(dates, frequency), return_inverse=True)
+    known = ~np.isnan(values)
+    if aggregation_method == "eop":
+        last = np.full(len(labels), -1)
+        np.maximum.at(last, groups[known], np.flatnonzero(known))
+        aggregated = np.where(last >= 0, values[last], np.nan)
+        return labels, aggregated
+    sums = np.bincount(groups[known], values[known], minlength=len(labels))
+    counts = np.bincount(groups[known], minlength=len(labels))
+    with np.errstate(invalid="ignore"):
+        if aggregation_method == "sum":
+            return labels, np.where(counts > 0, sums, np.nan)
+        return labels, sums / np.where(counts > 0, counts, np.nan)
@@ -0,0 +1,342 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import numpy as np
+import pandas as pd
+from .observations import typed_columns
+
+
+class VintageCube:
+    def __init__(
+        self,
+        dates: np.ndarray,
+        realtime_start: np.ndarray,
+        realtime_end: np.ndarray,
+        values: np.ndarray,
+        series_id: str = None,
+    ):
+        """
+        The real-time history of a series, observation date x vintage date,
+        stored as one interval per distinct value: the value an observation
+        date had from realtime_start through realtime_end, both inclusive.
+        A series with hundreds of vintages takes four compact arrays instead
+        of a row of strings per observation per real-time period. Lookups
+        are binary searches over the intervals, keyed by observation date
+        and then realtime_start; the dense matrix of every date at every
+        vintage is only built for values and to_frame.
+
+        Parameters
+        ----------
+        dates, realtime_start, realtime_end: np.ndarray
+            datetime64 arrays, one element per interval.
+        values: np.ndarray
+            float64 array, one element per interval; NaN where FRED reported
+            the missing-value marker ".".
+        series_id: str, default None
+            The ID of the series, for reference.
+
+        See Also
+        --------
+        fred.get_vintage_cube: Fetch a series' full real-time history as a VintageCube.
+
+        Examples
+        --------
+        >>> cube = VintageCube.from_observations(response["observations"])
+        >>> cube.as_of("2020-06-30")
+        >>> cube.as_of(["2019-12-31", "2020-06-30"])
+        >>> cube.to_frame()
+        """
+        dates = np.asarray(dates, dtype="datetime64[s]")
+        realtime_start = np.asarray(realtime_start, dtype="datetime64[s]")
+        realtime_end = np.asarray(realtime_end, dtype="datetime64[s]")
+        values = np.asarray(values, dtype=np.float64)
+        order = np.lexsort((realtime_start, dates))
+        self.series_id = series_id
+        self.dates, date_idx = np.unique(dates[order], return_inverse=True)
+        self.vintages = np.unique(realtime_start)
+        self._date_idx = date_idx.astype(np.int32)
+        self._start = realtime_start[order]
+        self._end = realtime_end[order]
+        self._values = values[order]
+        # one sorted int64 key per interval: date index, then start day
+        start_days = self._start.astype("datetime64[D]").astype(np.int64)
+        self._first_day = start_days.min() if len(start_days) else 0
+        self._span = start_days.max() - self._first_day + 1 if len(start_days) else 1
+        self._keys = self._date_idx * self._span + (start_days - self._first_day)
+        self._dense = None
+
+    @classmethod
+    def from_observations(
+        cls,
+        observations: list,
+        series_id: str = None,
+    ):
+        """
+        Build a VintageCube from the observations of a series/observations
+        response requested with output_type=1 (the default) and a realtime
+        period, each having realtime_start, realtime_end, date and value.
+        """
+        columns = typed_columns(
+            observations, ["realtime_start", "realtime_end", "date", "value"]
+        )
+        return cls(
+            columns["date"],
+            columns["realtime_start"],
+            columns["realtime_end"],
+            columns["value"],
+            series_id,
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        series_id: str = None,
+    ):
+        """
+        Build a VintageCube from a DataFrame as returned by
+        get_series_df(typed=True) for a realtime period.
+        """
+        if "date" not in df.columns:
+            df = df.reset_index()
+        return cls(
+            df["date"].to_numpy(),
+            df["realtime_start"].to_numpy(),
+            df["realtime_end"].to_numpy(),
+            df["value"].to_numpy(),
+            series_id,
+        )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return "VintageCube(%s: %d dates x %d vintages, %d intervals)" % (
+            self.series_id,
+            len(self.dates),
+            len(self.vintages),
+            len(self),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the interval arrays, not counting the dense matrix.
+        """
+        arrays = (
+            self.dates,
+            self.vintages,
+            self._date_idx,
+            self._start,
+            self._end,
+            self._values,
+            self._keys,
+        )
+        return sum(a.nbytes for a in arrays)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The dense float64 matrix of values, a row per observation date and a
+        column per vintage date; NaN where a date had no value at a vintage.
+        Built on first use.
+        """
+        if self._dense is None:
+            columns = np.arange(len(self.dates))
+            self._dense = self._lookup(columns, self.vintages).T
+        return self._dense
+
+    def _lookup(
+        self,
+        columns: np.ndarray,
+        queries: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Return the values of the observation dates at indexes columns as of
+        each of queries, a row per query and a column per date; NaN where a
+        date had no value then.
+        """
+        if len(self) == 0:
+            return np.full((len(queries), len(columns)), np.nan)
+        days = queries.astype("datetime64[D]")
+        offsets = np.clip(days.astype(np.int64) - self._first_day, -1, self._span - 1)
+        keys = columns * self._span + offsets[:, np.newaxis]
+        # the last interval of each date starting on or before each query
+        found = np.searchsorted(self._keys, keys, "right") - 1
+        safe = np.maximum(found, 0)
+        known = (found >= 0) & (self._date_idx[safe] == columns)
+        # realtime_end is inclusive: a value is gone the day after
+        known &= self._end[safe].astype("datetime64[D]") >= days[:, np.newaxis]
+        return np.where(known, self._values[safe], np.nan)
+
+    def as_of(self, vintage_dates):
+        """
+        The series as it was known on vintage_dates: for a single date, a
+        pd.Series indexed by observation date; for a list of dates, a
+        pd.DataFrame with a column per vintage date. Any date may be asked
+        for, not only the dates vintages were released on. Observation
+        dates not yet published by then are NaN. Each date's value is
+        located with a binary search over the intervals.
+        """
+        single = np.ndim(vintage_dates) == 0
+        queries = np.atleast_1d(np.asarray(vintage_dates, dtype="datetime64[s]"))
+        result = self._lookup(np.arange(len(self.dates)), queries)
+        index = pd.DatetimeIndex(self.dates, name="date")
+        if single:
+            return pd.Series(result[0], index=index, name=pd.Timestamp(queries[0]))
+        return pd.DataFrame(result.T, index=index, columns=pd.DatetimeIndex(queries))
+
+    def value(
+        self,
+        date,
+        vintage_date,
+    ) -> float:
+        """
+        The value observation date had as of vintage_date, NaN if it had none.
+        """
+        date = np.datetime64(date, "s")
+        column = np.searchsorted(self.dates, date)
+        if column == len(self.dates) or self.dates[column] != date:
+            return np.nan
+        query = np.atleast_1d(np.datetime64(vintage_date, "s"))
+        return float(self._lookup(np.array([column]), query)[0, 0])
+
+    def latest(self) -> pd.Series:
+        """
+        The latest value of every observation date, as of the last vintage.
+        """
+        return self.as_of(self._end.max())
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        The dense matrix as a pd.DataFrame, indexed by observation date with
+        a column per vintage date.
+        """
+        return pd.DataFrame(
+            self.values,
+            index=pd.DatetimeIndex(self.dates, name="date"),
+            columns=pd.DatetimeIndex(self.vintages, name="vintage"),
+            copy=False,
+        )
+
+
+class AsOfEngine:
+    def __init__(
+        self,
+        fred,
+        max_workers: int = 8,
+        observation_start: str = None,
+        observation_end: str = None,
+        units: str = None,
+    ):
+        """
+        Point-in-time lookups over the real-time histories of many series.
+        Each series' full history is fetched once, concurrently, into a
+        VintageCube; after that "what did series S look like on date D" is
+        answered locally with a binary search, in microseconds, for any
+        number of (S, D) pairs. With an SQLiteCache set as fred.cache the
+        histories are also reused by later processes.
+
+        Parameters
+        ----------
+        fred: Fred
+            The Fred instance used to fetch histories.
+        max_workers: int, default 8
+            The most series fetched at once.
+        observation_start, observation_end, units:
+            Passed on to FRED for every series; see fred.get_series_df.
+
+        Examples
+        --------
+        >>> engine = AsOfEngine(fred).load(["GDPC1", "UNRATE"])
+        >>> engine.as_of("UNRATE", "2009-06-30")
+        >>> engine.value("GDPC1", "2008-07-01", "2008-10-30")
+        >>> frames = engine.query([("GDPC1", "2008-10-30"), ("UNRATE", "2009-06-30")])
+        """
+        self.fred = fred
+        self.max_workers = max_workers
+        self.fetch_args = {
+            "realtime_start": "1776-07-04",
+            "realtime_end": "9999-12-31",
+            "observation_start": observation_start,
+            "observation_end": observation_end,
+            "units": units,
+        }
+        self.cubes = dict()
+        self.errors = dict()
+        self._lock = threading.Lock()
+
+    def load(self, series_ids: list):
+        """
+        Fetch the histories of the series in series_ids not loaded yet.
+        Series that can't be retrieved are reported, series_id -> error
+        message, in errors. Return self.
+        """
+        with self._lock:
+            missing = [k for k in dict.fromkeys(series_ids) if k not in self.cubes]
+
+        def fetch_one(series_id: str) -> tuple:
+            try:
+                cube = self.fred._fetch_vintage_cube(series_id, **self.fetch_args)
+            except (RuntimeError, KeyError) as e:
+                return series_id, None, str(e)
+            return series_id, cube, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(fetch_one, missing))
+        with self._lock:
+            for series_id, cube, error_message in results:
+                if cube is None:
+                    self.errors[series_id] = error_message
+                else:
+                    self.cubes[series_id] = cube
+                    self.errors.pop(series_id, None)
+        return self
+
+    def cube(self, series_id: str) -> VintageCube:
+        """
+        Return the VintageCube of series_id, fetching it if not loaded yet.
+        """
+        if series_id not in self.cubes:
+            self.load([series_id])
+        if series_id not in self.cubes:
+            raise KeyError("%s: %s" % (series_id, self.errors[series_id]))
+        return self.cubes[series_id]
+
+    def as_of(
+        self,
+        series_id: str,
+        vintage_dates,
+    ):
+        """
+        Series series_id as known on vintage_dates; see VintageCube.as_of.
+        """
+        return self.cube(series_id).as_of(vintage_dates)
+
+    def value(
+        self,
+        series_id: str,
+        date,
+        vintage_date,
+    ) -> float:
+        """
+        The value series_id had for observation date as of vintage_date.
+        """
+        return self.cube(series_id).value(date, vintage_date)
+
+    def query(self, queries: list) -> list:
+        """
+        Answer many (series_id, vintage_date) queries at once, loading any
+        series not loaded yet in one concurrent batch. Return a pd.Series per
+        query, in order, as as_of would.
+        """
+        queries = list(queries)
+        self.load([series_id for series_id, _ in queries])
+        by_series = dict()
+        for i, (series_id, vintage_date) in enumerate(queries):
+            by_series.setdefault(series_id, list()).append((i, vintage_date))
+        results = [None] * len(queries)
+        for series_id, positions in by_series.items():
+            frame = self.as_of(series_id, [d for _, d in positions])
+            for column, (i, _) in enumerate(positions):
+                results[i] = frame.iloc[:, column]
+        return results